@@ -0,0 +1,34 @@
+"""Add updated_at indexes for incremental exports
+
+Revision ID: 2b7e4d9c1f36
+Revises: 7d5c2f8e9a14
+Create Date: 2026-10-19 15:02:44.118093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e4d9c1f36'
+down_revision: Union[str, Sequence[str], None] = '7d5c2f8e9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['users', 'volunteers', 'skills', 'projects', 'assignments', 'categories', 'role']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{table}_updated_at', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_updated_at')
@@ -0,0 +1,40 @@
+"""Add cache_invalidations table for the cross-worker invalidation bus
+
+Revision ID: 5f1c8a3e7b20
+Revises: 2b7e4d9c1f36
+Create Date: 2026-10-19 18:41:09.552310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c8a3e7b20'
+down_revision: Union[str, Sequence[str], None] = '2b7e4d9c1f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'cache_invalidations',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('origin', sa.String(length=32), nullable=False),
+        sa.Column('namespace', sa.String(length=50), nullable=False),
+        sa.Column('keys', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('cache_invalidations', schema=None) as batch_op:
+        batch_op.create_index('ix_cache_invalidations_created_at', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('cache_invalidations', schema=None) as batch_op:
+        batch_op.drop_index('ix_cache_invalidations_created_at')
+    op.drop_table('cache_invalidations')
@@ -0,0 +1,30 @@
+"""Add project deadline index
+
+Revision ID: 7d5c2f8e9a14
+Revises: e3b9a6d41c58
+Create Date: 2026-10-19 12:26:51.873402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d5c2f8e9a14'
+down_revision: Union[str, Sequence[str], None] = 'e3b9a6d41c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_status_deadline', ['deleted_at', 'status', 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_status_deadline')
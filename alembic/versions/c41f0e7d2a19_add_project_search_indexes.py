@@ -0,0 +1,32 @@
+"""Add project search indexes
+
+Revision ID: c41f0e7d2a19
+Revises: a8b257b418e6
+Create Date: 2026-10-19 09:12:40.512331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0e7d2a19'
+down_revision: Union[str, Sequence[str], None] = 'a8b257b418e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_name_description_ft', ['name', 'description'], unique=False, mysql_prefix='FULLTEXT')
+        batch_op.create_index('ix_projects_status_priority_deadline', ['deleted_at', 'status', 'priority', 'deadline'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_status_priority_deadline')
+        batch_op.drop_index('ix_projects_name_description_ft')
@@ -0,0 +1,70 @@
+"""Add unique constraint on volunteer_skills
+
+Revision ID: e3b9a6d41c58
+Revises: c41f0e7d2a19
+Create Date: 2026-10-19 11:03:17.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9a6d41c58'
+down_revision: Union[str, Sequence[str], None] = 'c41f0e7d2a19'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fusionar duplicados (volunteer_id, skill_id) en la fila de menor id antes de crear la restricción
+    # (tabla auxiliar normal: MySQL no permite abrir dos veces una tabla temporal en la misma consulta)
+    op.execute("""
+        CREATE TABLE volunteer_skill_keep AS
+        SELECT MIN(id) AS keep_id, volunteer_id, skill_id,
+               CASE WHEN SUM(deleted_at IS NULL) > 0 THEN 1 ELSE 0 END AS active
+        FROM volunteer_skills
+        GROUP BY volunteer_id, skill_id
+        HAVING COUNT(*) > 1
+    """)
+    op.execute("""
+        UPDATE volunteer_skills
+        SET deleted_at = NULL
+        WHERE id IN (SELECT keep_id FROM volunteer_skill_keep WHERE active = 1)
+    """)
+    op.execute("""
+        UPDATE assignments
+        SET volunteer_skill_id = (
+            SELECT k.keep_id FROM volunteer_skill_keep k
+            JOIN volunteer_skills vs ON vs.volunteer_id = k.volunteer_id AND vs.skill_id = k.skill_id
+            WHERE vs.id = assignments.volunteer_skill_id
+        )
+        WHERE volunteer_skill_id IN (
+            SELECT vs.id FROM volunteer_skills vs
+            JOIN volunteer_skill_keep k ON vs.volunteer_id = k.volunteer_id AND vs.skill_id = k.skill_id
+            WHERE vs.id <> k.keep_id
+        )
+    """)
+    op.execute("""
+        DELETE FROM volunteer_skills
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT vs.id FROM volunteer_skills vs
+                JOIN volunteer_skill_keep k ON vs.volunteer_id = k.volunteer_id AND vs.skill_id = k.skill_id
+                WHERE vs.id <> k.keep_id
+            ) AS duplicated
+        )
+    """)
+    op.execute("DROP TABLE volunteer_skill_keep")
+
+    with op.batch_alter_table('volunteer_skills', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_volunteer_skill', ['volunteer_id', 'skill_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('volunteer_skills', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_volunteer_skill', type_='unique')
@@ -0,0 +1,53 @@
+"""
+Carga masiva desde la línea de comandos con el mismo pipeline que POST /import/{entity}.
+Sirve también para sembrar datos de benchmarks.
+
+    python -m app.cli.import_data users partners.csv
+    python -m app.cli.import_data projects projects.jsonl --batch-size 5000
+    python -m app.cli.import_data users users.csv --url sqlite:////tmp/bench.db
+"""
+import argparse
+import json
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.controllers.import_controller import IMPORT_ENTITIES, import_file, shutdown_hash_pool
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import CSV / JSON Lines files")
+    parser.add_argument("entity", choices=sorted(IMPORT_ENTITIES))
+    parser.add_argument("path", help="archivo .csv o .jsonl")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="por defecto, según la extensión")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--url", help="URL de base de datos (default: la del .env)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+
+    if args.url:
+        engine = create_engine(args.url)
+    else:
+        from app.database.database import engine
+
+    start = time.perf_counter()
+    try:
+        with Session(engine) as db, open(args.path, "rb") as stream:
+            report = import_file(db, args.entity, stream, fmt, args.batch_size)
+    finally:
+        shutdown_hash_pool()
+
+    print(json.dumps(report.model_dump(mode="json"), indent=2, ensure_ascii=False))
+    print(f"{report.inserted:,} inserted, {report.failed:,} failed in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,17 @@ from dotenv import load_dotenv
 # Cargar variables del .env
 load_dotenv()
 
+COUNT_STRATEGY_VALUES = ("exact", "cached", "estimated")
+
+
+def _count_strategy(value: str, variable: str) -> str:
+    # Un valor mal escrito se detecta al arrancar, no con un 500 en cada listado
+    value = value.strip()
+    if value not in COUNT_STRATEGY_VALUES:
+        raise ValueError(f"{variable}: invalid count strategy {value!r} (expected one of {', '.join(COUNT_STRATEGY_VALUES)})")
+    return value
+
+
 class Settings:
     DB_USERNAME: str = os.getenv("DB_USERNAME", "default_user")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "valor_por_defecto")
@@ -13,7 +24,68 @@ class Settings:
     DB_PORT: str = os.getenv("DB_PORT", "3306")
     DB_DIALECT: str = os.getenv("DB_DIALECT", "mysql+pymysql")  ###he agregado estas dos variales para centralizarlo todo en este archivo
 
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    # Control de admisión en get_db: cola acotada por prioridad, 503 + Retry-After al llenarse
+    # y límite adaptativo (AIMD) entre ADMISSION_MIN_CONCURRENCY y pool_size + max_overflow
+    ADMISSION_MIN_CONCURRENCY: int = int(os.getenv("ADMISSION_MIN_CONCURRENCY", "2"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))                    #peticiones esperando sesión
+    ADMISSION_MAX_WAIT_SECONDS: float = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "5"))   #espera máxima en la cola
+    ADMISSION_LATENCY_TARGET_MS: float = float(os.getenv("ADMISSION_LATENCY_TARGET_MS", "250"))   #media de latencia por sentencia
+    # Prioridad por prefijo de ruta, menor = antes (ADMISSION_PRIORITIES="/auth=0,/export=2")
+    ADMISSION_PRIORITIES: dict = {
+        prefix.strip(): int(priority) for prefix, priority in (
+            item.split("=", 1) for item in os.getenv("ADMISSION_PRIORITIES", "/auth=0,/export=2,/import=2").split(",") if "=" in item
+        )
+    }
+
     API_URL: str = os.getenv("API_BASE_URL","api_base_url")
 
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "60"))   #TTL de contadores/estadísticas cacheadas
+    DASHBOARD_CACHE_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))   #KPIs de GET /dashboard/*
+
+    # Total de los listados paginados: exact | cached | estimated, global y por endpoint
+    # (COUNT_STRATEGIES="users=cached,projects=estimated")
+    COUNT_STRATEGY: str = _count_strategy(os.getenv("COUNT_STRATEGY", "exact"), "COUNT_STRATEGY")
+    COUNT_STRATEGIES: dict = {
+        endpoint.strip(): _count_strategy(strategy, "COUNT_STRATEGIES") for endpoint, strategy in (
+            item.split("=", 1) for item in os.getenv("COUNT_STRATEGIES", "").split(",") if "=" in item
+        )
+    }
+    COUNT_CACHE_TTL_SECONDS: int = int(os.getenv("COUNT_CACHE_TTL_SECONDS", "300"))
+    # Caché de lecturas por id: memory (LRU+TTL por proceso) | sqlite (compartida entre workers) | off
+    ENTITY_CACHE_BACKEND: str = os.getenv("ENTITY_CACHE_BACKEND", "memory")
+    ENTITY_CACHE_TTL_SECONDS: int = int(os.getenv("ENTITY_CACHE_TTL_SECONDS", "300"))
+    ENTITY_CACHE_MAXSIZE: int = int(os.getenv("ENTITY_CACHE_MAXSIZE", "4096"))
+    ENTITY_CACHE_PATH: str = os.getenv("ENTITY_CACHE_PATH", "spool/entity_cache.sqlite3")
+    # Bus de invalidación entre workers: db (tabla cache_invalidations sondeada) | none (un solo proceso)
+    INVALIDATION_TRANSPORT: str = os.getenv("INVALIDATION_TRANSPORT", "none")
+    INVALIDATION_MAX_STALENESS_SECONDS: float = float(os.getenv("INVALIDATION_MAX_STALENESS_SECONDS", "2"))   #cota de lectura obsoleta (sondeo cada la mitad)
+    INVALIDATION_RETENTION_SECONDS: int = int(os.getenv("INVALIDATION_RETENTION_SECONDS", "3600"))            #eventos antiguos que se borran
+    # Compartimentos de hilos para endpoints síncronos: "nombre=hilos/cola" (export, auth, matching, default)
+    BULKHEADS: dict = {
+        name.strip(): tuple(int(n) for n in limits.split("/", 1)) for name, limits in (
+            item.split("=", 1) for item in os.getenv(
+                "BULKHEADS", "default=32/64,export=2/8,auth=4/32,matching=4/16"
+            ).split(",") if "=" in item
+        )
+    }
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "10"))              #sub-peticiones por POST /batch
+    BATCH_TIMEOUT_SECONDS: float = float(os.getenv("BATCH_TIMEOUT_SECONDS", "15"))     #las que tardan más se devuelven con 504
+    # Coalescencia de lecturas caras (matching, listados, export): resultado compartido unos segundos
+    SINGLEFLIGHT_TTL_SECONDS: float = float(os.getenv("SINGLEFLIGHT_TTL_SECONDS", "0"))     #0 = solo peticiones simultáneas
+    SINGLEFLIGHT_WAIT_SECONDS: float = float(os.getenv("SINGLEFLIGHT_WAIT_SECONDS", "30"))  #espera máxima antes de calcularlo por su cuenta
+    CATALOG_MAX_AGE_SECONDS: int = int(os.getenv("CATALOG_MAX_AGE_SECONDS", "30"))   #Cache-Control de skills/categorías/roles (con ETag)
+
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))       #filas leídas por lote del cursor
+    EXPORT_CHUNK_BYTES: int = int(os.getenv("EXPORT_CHUNK_BYTES", "65536"))    #tamaño de cada trozo enviado
+    EXPORT_ARROW_WORKERS: int = int(os.getenv("EXPORT_ARROW_WORKERS", "4"))     #procesos para codificar Arrow/Parquet con parallel=true
+    EXPORT_JOB_WORKERS: int = int(os.getenv("EXPORT_JOB_WORKERS", "2"))         #exports en segundo plano a la vez (POST /export/jobs)
+    EXPORT_JOB_MAX_QUEUED: int = int(os.getenv("EXPORT_JOB_MAX_QUEUED", "16"))  #trabajos pendientes antes de responder 503
+    EXPORT_SPOOL_DIR: str = os.getenv("EXPORT_SPOOL_DIR", "spool/exports")      #carpeta de los archivos generados
+
+    IMPORT_BATCH_SIZE: int = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))        #filas validadas e insertadas por lote
+    IMPORT_HASH_WORKERS: int = int(os.getenv("IMPORT_HASH_WORKERS", "4"))       #procesos para bcrypt al importar usuarios
+
 
 settings = Settings() 
\ No newline at end of file
@@ -2,7 +2,7 @@ from app.config.logging_config import get_logger
 from sqlalchemy.orm import Session
 from app.models.users_model import User
 from app.utils.security import * 
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.database.database import get_db
 
@@ -64,6 +64,7 @@ def login_user(user_data, db: Session):
 
 # Dependencia para obtener usuario actual
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -71,6 +72,11 @@ def get_current_user(
     Extrae y valida el token JWT del header Authorization.
     Retorna el usuario autenticado.
     """
+    # Sub-peticiones de POST /batch: el usuario ya se autenticó en la petición del lote
+    principal = request.scope.get("batch_principal")
+    if principal is not None:
+        return principal
+    
     logger.info("Getting current user")
     token = credentials.credentials
     
@@ -0,0 +1,135 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import HTTPException, Request, status
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.models.users_model import User
+from app.schemas.batch_schema import BatchRequestItem
+
+logger = get_logger("Batch") #logging
+
+# Rutas que no se pueden pedir dentro de un lote: el propio lote y las descargas/cargas masivas
+FORBIDDEN_PREFIXES = ("/batch", "/export", "/import")
+# Cabeceras de la respuesta de cada sub-petición que se devuelven al cliente
+RETURNED_HEADERS = ("etag", "cache-control", "retry-after", "x-next-cursor")
+
+
+def validate_batch(items: list[BatchRequestItem]) -> list[str]:
+    '''Comprueba los límites del lote y devuelve el id de cada sub-petición'''
+    if len(items) > settings.BATCH_MAX_REQUESTS:
+        logger.warning(f"Batch with {len(items)} sub-requests rejected")
+        raise HTTPException(status_code=400, detail=f"Too many sub-requests (max {settings.BATCH_MAX_REQUESTS})")  #Bad request
+
+    for item in items:
+        # Solo rutas relativas de esta API (nada de URLs absolutas)
+        target = urlsplit(item.path)
+        if target.scheme or target.netloc or not target.path.startswith("/") or target.path.startswith(FORBIDDEN_PREFIXES):
+            raise HTTPException(status_code=400, detail=f"Sub-request not allowed: {item.path}")   #Bad request
+
+    ids = [item.id or str(position) for position, item in enumerate(items)]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Duplicated sub-request ids")  #Bad request
+    return ids
+
+
+async def _call(request: Request, item: BatchRequestItem, principal: User) -> dict:
+    '''Ejecuta una sub-petición GET contra la propia app (ASGI, sin red) y recoge la respuesta'''
+    target = urlsplit(item.path)
+    headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in item.headers.items() if name.lower() not in ("authorization", "host")
+    ]
+    headers.append((b"authorization", request.headers.get("authorization", "").encode("latin-1")))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": request.url.scheme,
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": target.path,
+        "raw_path": target.path.encode(),
+        "query_string": target.query.encode(),
+        "headers": headers,
+        # get_current_user devuelve este usuario sin volver a consultarlo
+        "batch_principal": principal,
+    }
+
+    finished = asyncio.Event()
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    response = {"status": 500, "headers": {}, "chunks": []}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = {k.decode("latin-1"): v.decode("latin-1") for k, v in message.get("headers", [])}
+        elif message["type"] == "http.response.body":
+            response["chunks"].append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware ya ha enviado el 500 y relanza la excepción: aquí solo se registra
+        logger.exception(f"Batch sub-request {item.path} failed")
+    finally:
+        finished.set()
+
+    body = b"".join(response["chunks"])
+    content_type = response["headers"].get("content-type", "")
+    return {
+        "status": response["status"],
+        "headers": {name: value for name, value in response["headers"].items() if name in RETURNED_HEADERS},
+        # El JSON de la sub-respuesta se inserta tal cual, sin volver a parsearlo
+        "body": orjson.Fragment(body) if body and "json" in content_type else (body.decode() or None),
+    }
+
+
+async def run_batch(request: Request, items: list[BatchRequestItem], principal: User) -> dict:
+    '''
+    Lanza todas las sub-peticiones a la vez (cada una con su sesión de BD y en su
+    compartimento de hilos) y espera como mucho BATCH_TIMEOUT_SECONDS: las que no
+    terminan a tiempo se devuelven con 504.
+    '''
+    ids = validate_batch(items)
+    started = time.perf_counter()
+
+    async def timed(item: BatchRequestItem) -> dict:
+        start = time.perf_counter()
+        result = await _call(request, item, principal)
+        result["duration_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    tasks = [asyncio.ensure_future(timed(item)) for item in items]
+    await asyncio.wait(tasks, timeout=settings.BATCH_TIMEOUT_SECONDS)
+
+    responses = []
+    for sub_id, task in zip(ids, tasks):
+        if task.done():
+            responses.append({"id": sub_id, **task.result()})
+        else:
+            task.cancel()
+            responses.append({
+                "id": sub_id, "status": status.HTTP_504_GATEWAY_TIMEOUT, "headers": {},
+                "body": {"detail": "Sub-request timed out"},
+                "duration_ms": round(settings.BATCH_TIMEOUT_SECONDS * 1000, 2),
+            })
+
+    duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    timings = ", ".join(f"{item.path}={r['status']}/{r['duration_ms']}ms" for item, r in zip(items, responses))
+    logger.info(f"Batch of {len(items)} in {duration_ms}ms: {timings}")
+    return {"responses": responses, "duration_ms": duration_ms}
@@ -1,13 +1,16 @@
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from sqlalchemy.exc import IntegrityError
-from fastapi_pagination.ext.sqlalchemy import paginate
-from fastapi_pagination import Page
 from datetime import datetime, timezone
 
 from app.config.logging_config import get_logger
 from app.models.category_model import Category
 from app.schemas.category_schemas import CategoryCreate, CategoryUpdate, CategoryOut
+from app.schemas.page_schema import CursorPage, CountedPage
+from app.utils.keyset import keyset_paginate
+from app.utils.counting import paginate_counted
+from app.utils.serialization import schema_select
+from app.utils.entity_cache import cached_entity
 
 logger = get_logger("Categories")
 
@@ -34,9 +37,16 @@ def create_category(db: Session, data: CategoryCreate):
         raise HTTPException(status_code=409, detail=f"Category violates a database constraint")     #Conflict
 
 
-def get_categories(db: Session) -> Page[CategoryOut]:
+def get_categories(db: Session) -> CountedPage[CategoryOut]:
     logger.info(f"Getting categories list")
-    return paginate(db.query(Category).filter(Category.deleted_at.is_(None)))
+    # Solo lectura: filas Core con las columnas de CategoryOut, sin objetos ORM
+    return paginate_counted(db, schema_select(Category, CategoryOut).where(Category.deleted_at.is_(None)), "categories")
+
+
+def get_categories_cursor(db: Session, cursor: str | None, size: int, include_total: bool = False) -> CursorPage[CategoryOut]:
+    logger.info(f"Getting categories page by cursor")
+    query = schema_select(Category, CategoryOut).where(Category.deleted_at.is_(None))
+    return keyset_paginate(db, query, Category.id, cursor, size, None, include_total, "categories")
 
 def get_category(db: Session, id: int):
     logger.info(f"Trying to get category with ID {id}")
@@ -47,6 +57,11 @@ def get_category(db: Session, id: int):
         raise HTTPException(status_code=404, detail="Category not found")   #Not found
     return category
 
+#Read-through cache, solo lectura
+@cached_entity("category", CategoryOut, key=lambda db, id: (id, ""))
+def get_category_cached(db: Session, id: int) -> CategoryOut:
+    return get_category(db, id)
+
 def update_category(db: Session, id: int, data: CategoryUpdate):
     logger.info(f"Trying to update category with ID {id}")    
     category = get_category(db, id)
@@ -0,0 +1,223 @@
+import datetime
+from sqlalchemy import select, and_, case, func
+from sqlalchemy.orm import Session
+
+from app.schemas import dashboard_schema as schema
+from app.config.logging_config import get_logger
+from app.config.config_variables import settings
+from app.database.change_tracking import on_tables_changed
+from app.models.assignment_model import Assignment
+from app.models.project_model import Project
+from app.models.project_skill_model import project_skills
+from app.models.skill_model import Skill
+from app.models.volunteer_skill_model import volunteer_skills
+from app.models.volunteers_model import Volunteer
+from app.domain.assignment_enum import AssignmentStatus
+from app.domain.projects_enums import Project_status
+from app.domain.volunteer_enum import VolunteerStatus
+from app.utils.cache import ttl_cache, invalidate
+
+logger = get_logger("Dashboard")
+
+# Tablas de las que salen los KPIs: una escritura en cualquiera vacía el espacio "dashboard"
+DASHBOARD_TABLES = {"volunteers", "volunteer_skills", "projects", "project_skills", "skills", "assignments", "users"}
+ACTIVE_PROJECT_STATUSES = (Project_status.not_assigned, Project_status.assigned)
+OPEN_ASSIGNMENT_STATUSES = (AssignmentStatus.PENDING, AssignmentStatus.ACCEPTED)
+TOP_SKILLS = 5
+RECENT_PROJECTS = 5
+RECENT_ACTIVITY = 10
+
+
+@on_tables_changed
+def _invalidate_dashboards(tables: set[str]) -> None:
+    # Sin anunciarlo: los demás workers lo hacen al recibir las tablas por el bus
+    if tables & DASHBOARD_TABLES:
+        invalidate("dashboard", broadcast=False)
+
+
+class DashboardController:
+
+    #ADMIN SUMMARY (solo agregados en la BD; memoizado unos segundos o hasta la siguiente escritura)
+    @staticmethod
+    @ttl_cache("dashboard", ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+    async def get_admin_summary(db: Session, within_days: int) -> schema.AdminDashboardOut:
+        logger.info(f"Computing admin dashboard (upcoming within {within_days} days)")
+        now = datetime.datetime.utcnow()
+
+        #1) proyectos: estado + vencidos + próximos en una sola agrupación
+        overdue = case((and_(Project.deadline < now, Project.status != Project_status.completed), 1), else_=0)
+        upcoming = case((and_(
+            Project.deadline >= now,
+            Project.deadline <= now + datetime.timedelta(days=within_days),
+            Project.status.in_(ACTIVE_PROJECT_STATUSES)
+        ), 1), else_=0)
+        project_status: dict[str, int] = {s.value: 0 for s in Project_status}
+        overdue_count = upcoming_count = 0
+        for status, count, overdue_rows, upcoming_rows in db.execute(
+            select(Project.status, func.count(Project.id), func.sum(overdue), func.sum(upcoming))
+            .where(Project.deleted_at.is_(None))
+            .group_by(Project.status)
+        ).all():
+            project_status[status.value] = count
+            overdue_count += int(overdue_rows or 0)
+            upcoming_count += int(upcoming_rows or 0)
+
+        #2) voluntarios por estado
+        volunteer_status: dict[str, int] = {s.value: 0 for s in VolunteerStatus}
+        for status, count in db.execute(
+            select(Volunteer.status, func.count(Volunteer.id))
+            .where(Volunteer.deleted_at.is_(None))
+            .group_by(Volunteer.status)
+        ).all():
+            volunteer_status[status.value] = count
+
+        #3) skills: total y las más requeridas por proyectos activos
+        skills_total = db.scalar(select(func.count(Skill.id)).where(Skill.deleted_at.is_(None)))
+        top_skills = db.execute(
+            select(Skill.id, Skill.name, func.count(project_skills.c.project_id))
+            .join(project_skills, project_skills.c.skill_id == Skill.id)
+            .join(Project, Project.id == project_skills.c.project_id)
+            .where(
+                Skill.deleted_at.is_(None),
+                project_skills.c.deleted_at.is_(None),
+                Project.deleted_at.is_(None)
+            )
+            .group_by(Skill.id, Skill.name)
+            .order_by(func.count(project_skills.c.project_id).desc(), Skill.id)
+            .limit(TOP_SKILLS)
+        ).all()
+
+        #4) asignaciones por estado
+        assignment_status: dict[str, int] = {s.value: 0 for s in AssignmentStatus}
+        for status, count in db.execute(
+            select(Assignment.status, func.count(Assignment.id))
+            .where(Assignment.deleted_at.is_(None))
+            .group_by(Assignment.status)
+        ).all():
+            assignment_status[status.value] = count
+
+        #5) últimos proyectos creados (solo las columnas que pinta el panel)
+        recent = db.execute(
+            select(Project.id, Project.name, Project.status, Project.priority, Project.deadline, Project.created_at)
+            .where(Project.deleted_at.is_(None))
+            .order_by(Project.created_at.desc(), Project.id.desc())
+            .limit(RECENT_PROJECTS)
+        ).all()
+
+        return schema.AdminDashboardOut(
+            volunteers=schema.VolunteerKpisOut(
+                total=sum(volunteer_status.values()),
+                active=volunteer_status[VolunteerStatus.active.value],
+                by_status=volunteer_status
+            ),
+            projects=schema.ProjectKpisOut(
+                total=sum(project_status.values()),
+                active=sum(project_status[s.value] for s in ACTIVE_PROJECT_STATUSES),
+                overdue=overdue_count,
+                upcoming=upcoming_count,
+                within_days=within_days,
+                by_status=project_status
+            ),
+            skills=schema.SkillKpisOut(
+                total=skills_total or 0,
+                most_used=[schema.SkillUsageOut(id=sid, name=name, projects=count) for sid, name, count in top_skills]
+            ),
+            assignments_by_status=assignment_status,
+            recent_projects=[
+                schema.RecentProjectOut(
+                    id=pid, name=name, status=status.value, priority=priority.value if priority else None,
+                    deadline=deadline, created_at=created_at
+                )
+                for pid, name, status, priority, deadline, created_at in recent
+            ],
+            generated_at=now
+        )
+
+    #VOLUNTEER SUMMARY (una agrupación + la actividad reciente; memoizado igual que el de admin)
+    @staticmethod
+    @ttl_cache("dashboard", ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+    async def get_volunteer_summary(db: Session, volunteer_id: int, volunteer_status: str) -> schema.VolunteerDashboardOut:
+        logger.info(f"Computing dashboard for volunteer {volunteer_id}")
+        now = datetime.datetime.utcnow()
+
+        #1) skills del voluntario x estado de la asignación x proyecto: las skills sin
+        #   asignaciones salen con estado NULL gracias al outer join
+        rows = db.execute(
+            select(
+                Skill.id, Skill.name, Assignment.status,
+                Project.id, Project.name, Project.status, Project.deadline,
+                func.count(Assignment.id)
+            )
+            .select_from(volunteer_skills)
+            .join(Skill, and_(Skill.id == volunteer_skills.c.skill_id, Skill.deleted_at.is_(None)))
+            .outerjoin(Assignment, and_(
+                Assignment.volunteer_skill_id == volunteer_skills.c.id,
+                Assignment.deleted_at.is_(None)
+            ))
+            .outerjoin(project_skills, project_skills.c.id == Assignment.project_skill_id)
+            .outerjoin(Project, and_(Project.id == project_skills.c.project_id, Project.deleted_at.is_(None)))
+            .where(volunteer_skills.c.volunteer_id == volunteer_id, volunteer_skills.c.deleted_at.is_(None))
+            .group_by(
+                Skill.id, Skill.name, Assignment.status,
+                Project.id, Project.name, Project.status, Project.deadline
+            )
+        ).all()
+
+        skills: dict[int, schema.MySkillOut] = {}
+        assignment_status: dict[str, int] = {s.value: 0 for s in AssignmentStatus}
+        active: dict[int, schema.ActiveProjectOut] = {}
+        for skill_id, skill_name, status, project_id, project_name, project_status, deadline, count in rows:
+            skill = skills.setdefault(skill_id, schema.MySkillOut(id=skill_id, name=skill_name, assignments=0))
+            # Sin asignación, o asignación de un proyecto borrado
+            if status is None or project_id is None:
+                continue
+            skill.assignments += count
+            assignment_status[status.value] += count
+            if status in OPEN_ASSIGNMENT_STATUSES and project_status != Project_status.completed:
+                project = active.setdefault(project_id, schema.ActiveProjectOut(
+                    id=project_id, name=project_name, status=project_status.value, deadline=deadline, assignments=0
+                ))
+                project.assignments += count
+
+        #2) últimas asignaciones tocadas
+        recent = db.execute(
+            select(
+                Assignment.id, Assignment.status, Project.id, Project.name, Skill.name,
+                Project.deadline, Assignment.created_at, Assignment.updated_at
+            )
+            .join(volunteer_skills, volunteer_skills.c.id == Assignment.volunteer_skill_id)
+            .join(Skill, Skill.id == volunteer_skills.c.skill_id)
+            .join(project_skills, project_skills.c.id == Assignment.project_skill_id)
+            .join(Project, Project.id == project_skills.c.project_id)
+            .where(
+                volunteer_skills.c.volunteer_id == volunteer_id,
+                volunteer_skills.c.deleted_at.is_(None),
+                Skill.deleted_at.is_(None),
+                Assignment.deleted_at.is_(None),
+                Project.deleted_at.is_(None)
+            )
+            .order_by(Assignment.updated_at.desc(), Assignment.id.desc())
+            .limit(RECENT_ACTIVITY)
+        ).all()
+
+        total = sum(assignment_status.values())
+        decided = total - assignment_status[AssignmentStatus.REJECTED.value]
+        completed = assignment_status[AssignmentStatus.COMPLETED.value]
+
+        return schema.VolunteerDashboardOut(
+            volunteer_id=volunteer_id,
+            status=volunteer_status,
+            skills=sorted(skills.values(), key=lambda s: (-s.assignments, s.name)),
+            total_assignments=total,
+            assignments_by_status=assignment_status,
+            completion_rate=round(completed / decided, 4) if decided else 0.0,
+            active_projects=sorted(active.values(), key=lambda p: (p.deadline, p.id)),
+            recent_activity=[
+                schema.RecentAssignmentOut(
+                    id=aid, status=status.value, project_id=pid, project_name=project_name,
+                    skill_name=skill_name, deadline=deadline, created_at=created_at, updated_at=updated_at
+                )
+                for aid, status, pid, project_name, skill_name, deadline, created_at, updated_at in recent
+            ],
+            generated_at=now
+        )
@@ -0,0 +1,307 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+from fastapi import HTTPException
+from sqlalchemy import Connection, Enum as SAEnum, Integer, Select, Table, and_, case, create_engine, func, null, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.models import *
+from app.utils.csv import iter_csv
+from app.utils.arrow import arrow_schema, record_batch, iter_arrow
+from app.controllers.export_views import EXPORT_VIEWS
+from app.utils.cursor import encode_cursor, decode_cursor
+from app.utils.signature import tables_signature
+
+logger = get_logger("Export") #logging
+
+
+# Tablas exportables: se leen con Core (tuplas), nunca como objetos ORM
+EXPORT_TABLES: dict[str, Table] = {
+    "users": User.__table__,
+    "projects": Project.__table__,
+    "skills": Skill.__table__,
+    "volunteers": Volunteer.__table__,
+    "assignments": Assignment.__table__,
+    "categories": Category.__table__,
+    "role": Role.__table__,
+}
+
+
+# formato -> (media type, extensión)
+EXPORT_FORMATS: dict[str, tuple[str, str]] = {
+    "csv": ("text/csv", "csv"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+EXPORT_TABLES_BY_NAME: dict[str, Table] = {table.name: table for table in EXPORT_TABLES.values()}
+
+_arrow_pool: ProcessPoolExecutor | None = None
+_worker_engines: dict = {}
+
+
+def get_export_table(select_name: str) -> Table:
+    table = EXPORT_TABLES.get(select_name)
+    if table is None:
+        logger.warning(f"Export {select_name} not found")
+        raise HTTPException(status_code=404, detail="Select not found")  #Not found
+    return table
+
+
+def export_statement(table: Table) -> Select:
+    return select(*table.columns)
+
+
+def get_export_source(select_name: str) -> tuple[Select, Table]:
+    '''Consulta a exportar y su tabla principal (una tabla tal cual o una vista con JOINs)'''
+    if select_name in EXPORT_VIEWS:
+        table, build = EXPORT_VIEWS[select_name]
+        return build(), table
+    table = get_export_table(select_name)
+    return export_statement(table), table
+
+
+def ensure_not_empty(db: Session, table: Table) -> None:
+    # Una sola fila basta para saber si hay algo que exportar
+    if db.execute(select(*table.primary_key.columns).limit(1)).first() is None:
+        logger.warning(f"No data to export from {table.name}")
+        raise HTTPException(status_code=404, detail="Data export not found")   #Not found
+
+
+def _value_converters(stmt: Select) -> list:
+    # Enums -> su valor ("not assigned"), no el nombre de la clase Python
+    converters = []
+    for column in stmt.selected_columns:
+        if isinstance(column.type, SAEnum) and column.type.enum_class is not None:
+            converters.append(lambda v: v.value if v is not None else None)
+        else:
+            converters.append(None)
+    return converters
+
+
+def _to_tuples(converters: list, rows) -> list[tuple]:
+    if not any(converters):
+        return [tuple(row) for row in rows]
+    return [tuple(c(v) if c else v for c, v in zip(converters, row)) for row in rows]
+
+
+def iter_batches(db: Session, stmt: Select, batch_size: int = settings.EXPORT_BATCH_SIZE) -> Iterator[list[tuple]]:
+    '''
+    Recorre el resultado en lotes de tuplas con un cursor de servidor (stream_results).
+    Usa su propia conexión: el generador se consume después de que el endpoint haya
+    devuelto la respuesta, cuando la sesión de la petición puede estar cerrada.
+    '''
+    converters = _value_converters(stmt)
+
+    bind = db.get_bind()
+    # Sesión ligada a una conexión (tests con transacción): se reutiliza tal cual
+    with (nullcontext(bind) if isinstance(bind, Connection) else bind.connect()) as conn:
+        if conn.dialect.name == "mysql":
+            # GROUP_CONCAT de las vistas se corta en 1024 caracteres por defecto
+            conn.exec_driver_sql("SET SESSION group_concat_max_len = 1048576")
+        result = conn.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        for partition in result.partitions():
+            yield _to_tuples(converters, partition)
+
+
+def encode_batches(stmt: Select, batches: Iterable[list[tuple]], fmt: str) -> Iterator[bytes]:
+    '''Codifica lotes de tuplas de stmt en CSV, Parquet o Arrow IPC'''
+    if fmt == "csv":
+        return iter_csv(
+            [column.name for column in stmt.selected_columns],
+            batches,
+            chunk_size=settings.EXPORT_CHUNK_BYTES
+        )
+    schema = arrow_schema(stmt.selected_columns)
+    return iter_arrow(schema, (record_batch(schema, rows) for rows in batches), fmt)
+
+
+def stream_csv(db: Session, select_name: str) -> Iterator[bytes]:
+    stmt, table = get_export_source(select_name)
+    ensure_not_empty(db, table)
+
+    logger.info(f"Streaming CSV export of {select_name}")
+    return encode_batches(stmt, iter_batches(db, stmt), "csv")
+
+
+def source_tables(select_name: str) -> list[Table]:
+    '''Tablas leídas por un export: la propia tabla o todas las del JOIN de la vista'''
+    stmt, table = get_export_source(select_name)
+    if select_name in EXPORT_TABLES:
+        return [table]
+    return sorted(set(find_tables(stmt)), key=lambda t: t.name)
+
+
+def table_signature(db: Session, select_name: str) -> str:
+    '''
+    Firma barata de los datos de un export (tables_signature de sus tablas): sirve
+    para saber si un export ya generado sigue vigente.
+    '''
+    return tables_signature(db, source_tables(select_name))
+
+
+def _get_arrow_pool() -> ProcessPoolExecutor:
+    global _arrow_pool
+    if _arrow_pool is None:
+        # spawn: los workers no heredan conexiones a la BD ni hilos del servidor
+        _arrow_pool = ProcessPoolExecutor(
+            max_workers=settings.EXPORT_ARROW_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _arrow_pool
+
+
+def shutdown_arrow_pool() -> None:
+    global _arrow_pool
+    if _arrow_pool is not None:
+        _arrow_pool.shutdown(cancel_futures=True)
+        _arrow_pool = None
+
+
+def _worker_engine(url: str | None):
+    # Un engine por proceso worker; sin URL se usa el de la configuración (.env)
+    if url is None:
+        from app.database.database import engine
+        return engine
+    if url not in _worker_engines:
+        _worker_engines[url] = create_engine(url)
+    return _worker_engines[url]
+
+
+def _encode_id_range(url: str | None, table_name: str, schema, low: int, high: int):
+    '''Worker: lee las filas con low <= id < high con su propia conexión y las codifica'''
+    table = EXPORT_TABLES_BY_NAME[table_name]
+    pk = table.primary_key.columns[0]
+    stmt = export_statement(table).where(pk >= low, pk < high)
+
+    with _worker_engine(url).connect() as conn:
+        rows = _to_tuples(_value_converters(stmt), conn.execute(stmt))
+    return record_batch(schema, rows) if rows else None
+
+
+def _supports_parallel(db: Session, table: Table) -> bool:
+    pk = list(table.primary_key.columns)
+    return (
+        len(pk) == 1
+        and isinstance(pk[0].type, Integer)
+        and not isinstance(db.get_bind(), Connection)
+        # SQLite en memoria no es visible desde otros procesos
+        and not (db.get_bind().url.get_backend_name() == "sqlite" and db.get_bind().url.database in (None, "", ":memory:"))
+    )
+
+
+def _parallel_record_batches(db: Session, table: Table, schema):
+    '''
+    Reparte la tabla en rangos de id y cada worker lee y codifica el suyo,
+    así se paraleliza también la lectura (no solo la conversión).
+    Cada rango se lee en su propia transacción: no es una instantánea única.
+    '''
+    pk = table.primary_key.columns[0]
+    low, high = db.execute(select(func.min(pk), func.max(pk))).one()
+    url = db.get_bind().url
+    url = url.render_as_string(hide_password=False) if url.database else None
+
+    # Como mucho 2 rangos por worker en vuelo: la memoria sigue acotada y el orden se conserva
+    pool = _get_arrow_pool()
+    step = settings.EXPORT_BATCH_SIZE
+    pending = deque()
+    for start in range(low, high + 1, step):
+        pending.append(pool.submit(_encode_id_range, url, table.name, schema, start, start + step))
+        if len(pending) >= 2 * settings.EXPORT_ARROW_WORKERS:
+            batch = pending.popleft().result()
+            if batch is not None:
+                yield batch
+    while pending:
+        batch = pending.popleft().result()
+        if batch is not None:
+            yield batch
+
+
+def stream_arrow(db: Session, select_name: str, fmt: str, parallel: bool = False) -> Iterator[bytes]:
+    stmt, table = get_export_source(select_name)
+    ensure_not_empty(db, table)
+
+    schema = arrow_schema(stmt.selected_columns)
+    # Las vistas con JOIN se leen siempre en serie
+    parallel = parallel and select_name in EXPORT_TABLES and _supports_parallel(db, table)
+    logger.info(f"Streaming {fmt} export of {select_name} (parallel={parallel})")
+
+    if parallel:
+        return iter_arrow(schema, _parallel_record_batches(db, table, schema), fmt)
+    return encode_batches(stmt, iter_batches(db, stmt), fmt)
+
+
+def stream_export(db: Session, select_name: str, fmt: str = "csv", parallel: bool = False) -> Iterator[bytes]:
+    if fmt == "csv":
+        return stream_csv(db, select_name)
+    return stream_arrow(db, select_name, fmt, parallel)
+
+
+### EXPORT INCREMENTAL (?since=) ###
+
+def _parse_since(since: str) -> tuple[datetime, int]:
+    '''Acepta una fecha ISO 8601 o el cursor opaco devuelto por el export anterior'''
+    try:
+        since_at = datetime.fromisoformat(since)
+        # Las columnas son DATETIME sin zona: una fecha con zona se pasa a UTC
+        if since_at.tzinfo is not None:
+            since_at = since_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return since_at, 0
+    except ValueError:
+        updated_at, row_id = decode_cursor(since, 2)
+    try:
+        return datetime.fromisoformat(updated_at), int(row_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")     #Bad request
+
+
+def delta_statement(table: Table, since_at: datetime, since_id: int, until: datetime) -> Select:
+    '''
+    Filas insertadas, modificadas o borradas (soft delete) con (updated_at, id) > cursor
+    y updated_at < until, en orden (updated_at, id). Usa el índice de updated_at.
+    Las borradas salen como tombstones: op="delete" y solo la clave y las marcas de tiempo.
+    '''
+    alive = table.c.deleted_at.is_(None)
+    keep = {*table.primary_key.columns.keys(), "updated_at", "deleted_at"}
+    columns = [
+        column if column.name in keep else case((alive, column), else_=null()).label(column.name)
+        for column in table.columns
+    ]
+    return (
+        select(case((alive, "upsert"), else_="delete").label("op"), *columns)
+        .where(
+            or_(
+                table.c.updated_at > since_at,
+                and_(table.c.updated_at == since_at, table.c.id > since_id)
+            ),
+            table.c.updated_at < until
+        )
+        .order_by(table.c.updated_at, table.c.id)
+    )
+
+
+def stream_delta(db: Session, select_name: str, fmt: str, since: str) -> tuple[Iterator[bytes], str]:
+    '''
+    Export incremental de una tabla. Devuelve los trozos y el cursor para la siguiente
+    llamada. El corte es el segundo actual de la BD: las filas de ese segundo todavía
+    pueden cambiar, así que se dejan para el siguiente export y no se pierde ninguna.
+    '''
+    if select_name not in EXPORT_TABLES:
+        logger.warning(f"Delta export not supported for {select_name}")
+        raise HTTPException(status_code=400, detail="since is only supported for tables")  #Bad request
+
+    table = EXPORT_TABLES[select_name]
+    since_at, since_id = _parse_since(since)
+    until = db.execute(select(func.now())).scalar().replace(microsecond=0)
+    stmt = delta_statement(table, since_at, since_id, until)
+    next_cursor = encode_cursor([until, 0])
+
+    logger.info(f"Streaming {fmt} delta export of {select_name} since {since_at.isoformat()} (id>{since_id})")
+    return encode_batches(stmt, iter_batches(db, stmt), fmt), next_cursor
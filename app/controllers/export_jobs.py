@@ -0,0 +1,255 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.controllers.export_controller import (
+    EXPORT_FORMATS, get_export_source, iter_batches, encode_batches, table_signature
+)
+from app.database.database import Session as SessionLocal
+from app.schemas.export_schema import ExportJobStatus
+
+logger = get_logger("ExportJobs") #logging
+
+# Trabajos terminados que se recuerdan en memoria (los archivos siguen en disco)
+MAX_FINISHED_JOBS = 256
+
+JOB_ID = re.compile(r"[0-9a-f]{24}")
+
+
+@dataclass
+class ExportJob:
+    id: str
+    select: str
+    format: str
+    path: Path
+    status: ExportJobStatus = ExportJobStatus.pending
+    rows: Optional[int] = 0
+    bytes: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def download_url(self) -> Optional[str]:
+        if self.status != ExportJobStatus.done:
+            return None
+        return f"/export/jobs/{self.id}/download"
+
+    @property
+    def filename(self) -> str:
+        return f"{self.select}.{EXPORT_FORMATS[self.format][1]}"
+
+
+_jobs: "OrderedDict[str, ExportJob]" = OrderedDict()
+_lock = threading.Lock()
+_pool: ThreadPoolExecutor | None = None
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=settings.EXPORT_JOB_WORKERS, thread_name_prefix="export-job")
+    return _pool
+
+
+def shutdown_job_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def spool_dir() -> Path:
+    path = Path(settings.EXPORT_SPOOL_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _job_path(select_name: str, fmt: str, job_id: str) -> Path:
+    # select.id.ext: los archivos de un mismo export se encuentran con un glob
+    return spool_dir() / f"{select_name}.{job_id}.{EXPORT_FORMATS[fmt][1]}"
+
+
+def export_version(db: Session, select_name: str, fmt: str) -> str:
+    '''Versión de un export: id del trabajo, nombre del archivo en el spool y ETag'''
+    signature = table_signature(db, select_name)
+    return hashlib.sha256(f"{select_name}:{fmt}:{signature}".encode()).hexdigest()[:24]
+
+
+def _job_from_disk(job_id: str, select_name: str, fmt: str, path: Path) -> ExportJob:
+    # Archivo generado por otro worker o antes de reiniciar: no se sabe cuántas filas tiene
+    stat = path.stat()
+    return ExportJob(
+        id=job_id, select=select_name, format=fmt, path=path,
+        status=ExportJobStatus.done, rows=None, bytes=stat.st_size,
+        created_at=datetime.utcfromtimestamp(stat.st_mtime),
+        finished_at=datetime.utcfromtimestamp(stat.st_mtime),
+    )
+
+
+def _forget_finished_jobs() -> None:
+    finished = [job_id for job_id, job in _jobs.items() if job.status not in (ExportJobStatus.pending, ExportJobStatus.running)]
+    for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        del _jobs[job_id]
+
+
+def create_export_job(db: Session, select_name: str, fmt: str) -> ExportJob:
+    '''
+    Encola un export en segundo plano. El id sale de la firma de las tablas:
+    la misma petición con los mismos datos devuelve el trabajo en curso o el
+    archivo ya generado, sin volver a leer la tabla.
+    '''
+    job_id = export_version(db, select_name, fmt)
+    path = _job_path(select_name, fmt, job_id)
+
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None and job.status in (ExportJobStatus.pending, ExportJobStatus.running):
+            logger.info(f"Export job {job_id} already queued")
+            return job
+        if path.exists():
+            if job is None or job.status != ExportJobStatus.done:
+                job = _jobs[job_id] = _job_from_disk(job_id, select_name, fmt, path)
+            logger.info(f"Export job {job_id} reused from spool")
+            return job
+
+        queued = sum(1 for j in _jobs.values() if j.status in (ExportJobStatus.pending, ExportJobStatus.running))
+        if queued >= settings.EXPORT_JOB_MAX_QUEUED:
+            logger.warning(f"Export queue is full ({queued} jobs)")
+            raise HTTPException(status_code=503, detail="Export queue is full")     #Service unavailable
+
+        job = _jobs[job_id] = ExportJob(id=job_id, select=select_name, format=fmt, path=path)
+        _jobs.move_to_end(job_id)
+        _forget_finished_jobs()
+
+    _get_pool().submit(_run_in_background, job)
+    logger.info(f"Export job {job_id} queued ({select_name}, {fmt})")
+    return job
+
+
+def _run_in_background(job: ExportJob) -> None:
+    # Sesión propia: la de la petición ya se cerró cuando el trabajo empieza
+    with SessionLocal() as db:
+        run_export_job(db, job)
+
+
+def _counted(job: ExportJob, batches: Iterator[list[tuple]]) -> Iterator[list[tuple]]:
+    for rows in batches:
+        job.rows += len(rows)
+        yield rows
+
+
+def run_export_job(db: Session, job: ExportJob) -> None:
+    '''Escribe el export en un .part y lo renombra al terminar: nunca se sirve un archivo a medias'''
+    job.status = ExportJobStatus.running
+    partial = job.path.with_name(job.path.name + ".part")
+    try:
+        stmt, _ = get_export_source(job.select)
+        with open(partial, "wb") as f:
+            for chunk in encode_batches(stmt, _counted(job, iter_batches(db, stmt)), job.format):
+                f.write(chunk)
+                job.bytes += len(chunk)
+        os.replace(partial, job.path)
+    except Exception as e:
+        logger.error(f"Export job {job.id} failed: {e}")
+        partial.unlink(missing_ok=True)
+        job.status, job.error = ExportJobStatus.failed, str(e)
+    else:
+        job.status = ExportJobStatus.done
+        logger.info(f"Export job {job.id} done: {job.rows} rows, {job.bytes} bytes")
+        _remove_stale_files(job.path, job.select, job.created_at)
+    finally:
+        job.finished_at = datetime.utcnow()
+
+
+def _remove_stale_files(path: Path, select_name: str, created_at: datetime) -> None:
+    # Versiones anteriores del mismo export: la tabla cambió, ya no se reutilizan
+    for other in path.parent.glob(f"{select_name}.*{path.suffix}"):
+        if other != path and datetime.utcfromtimestamp(other.stat().st_mtime) <= created_at:
+            other.unlink(missing_ok=True)
+            logger.info(f"Removed stale export {other.name}")
+
+
+def spool_chunks(
+    chunks: Iterator[bytes], select_name: str, fmt: str, version: str, on_done: Optional[Callable[[], None]] = None
+) -> Iterator[bytes]:
+    '''
+    Devuelve los trozos tal cual y a la vez los guarda en el spool. Solo si el
+    export se envía completo el archivo queda disponible para la siguiente descarga
+    (si el cliente corta, el generador se cierra y el .part se borra).
+    `on_done` se llama al terminar, haya archivo o no (peticiones esperando este export).
+    '''
+    path = _job_path(select_name, fmt, version)
+    partial = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+    started = datetime.utcnow()
+    try:
+        with open(partial, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+        if on_done is not None:
+            on_done()
+    logger.info(f"Cached export {path.name}")
+    _remove_stale_files(path, select_name, started)
+
+
+def open_cached_export(select_name: str, fmt: str, version: str) -> Optional[BinaryIO]:
+    '''
+    Abre el export guardado en el spool, o None si no está. Se abre antes de responder:
+    si otra petición lo borra mientras tanto (_remove_stale_files) el archivo abierto
+    se sigue leyendo entero, en lugar de fallar a mitad de respuesta.
+    '''
+    try:
+        return open(_job_path(select_name, fmt, version), "rb")
+    except FileNotFoundError:
+        return None
+
+
+def iter_file(f: BinaryIO) -> Iterator[bytes]:
+    '''Lee un archivo ya abierto en trozos de EXPORT_CHUNK_BYTES y lo cierra al terminar'''
+    with f:
+        while chunk := f.read(settings.EXPORT_CHUNK_BYTES):
+            yield chunk
+
+
+def get_export_job(job_id: str) -> ExportJob:
+    job = _jobs.get(job_id)
+    if job is None and JOB_ID.fullmatch(job_id):
+        # Puede haberlo generado otro worker: se busca en el spool
+        matches = [p for p in spool_dir().glob(f"*.{job_id}.*") if not p.name.endswith(".part")]
+        if matches:
+            select_name, _, extension = matches[0].name.split(".")
+            fmt = next(name for name, (_, ext) in EXPORT_FORMATS.items() if ext == extension)
+            with _lock:
+                job = _jobs.setdefault(job_id, _job_from_disk(job_id, select_name, fmt, matches[0]))
+    if job is None:
+        logger.warning(f"Export job {job_id} not found")
+        raise HTTPException(status_code=404, detail="Export job not found")  #Not found
+
+    if job.status == ExportJobStatus.done and not job.path.exists():
+        job.status = ExportJobStatus.expired
+    return job
+
+
+def get_export_job_file(job_id: str) -> ExportJob:
+    job = get_export_job(job_id)
+    if job.status == ExportJobStatus.expired:
+        raise HTTPException(status_code=410, detail="Export file expired, the table has changed")  #Gone
+    if job.status != ExportJobStatus.done:
+        raise HTTPException(status_code=409, detail=f"Export job is {job.status.value}")   #Conflict
+    return job
@@ -0,0 +1,112 @@
+from typing import Callable
+
+from sqlalchemy import Select, Table, and_, func, select
+
+from app.models import *
+
+# Vistas de exportación: una sola consulta con JOIN por vista, pensada para leerse
+# en streaming. Las skills se agregan en una columna de texto ("Python, SQL").
+SKILL_SEPARATOR = ", "
+
+
+def assignments_detailed() -> Select:
+    '''Una fila por asignación con el proyecto, la skill y el voluntario legibles'''
+    return (
+        select(
+            Assignment.id.label("assignment_id"),
+            Assignment.status.label("assignment_status"),
+            Project.id.label("project_id"),
+            Project.name.label("project_name"),
+            Project.status.label("project_status"),
+            Project.priority.label("project_priority"),
+            Project.deadline.label("project_deadline"),
+            Category.name.label("category"),
+            Skill.id.label("skill_id"),
+            Skill.name.label("skill"),
+            Volunteer.id.label("volunteer_id"),
+            User.name.label("volunteer_name"),
+            User.email.label("volunteer_email"),
+            Assignment.created_at,
+            Assignment.updated_at,
+        )
+        .select_from(Assignment)
+        .join(project_skills, project_skills.c.id == Assignment.project_skill_id)
+        .join(Project, Project.id == project_skills.c.project_id)
+        .join(Category, Category.id == Project.category_id)
+        .join(Skill, Skill.id == project_skills.c.skill_id)
+        .join(volunteer_skills, volunteer_skills.c.id == Assignment.volunteer_skill_id)
+        .join(Volunteer, Volunteer.id == volunteer_skills.c.volunteer_id)
+        .join(User, User.id == Volunteer.user_id)
+        .where(Assignment.deleted_at.is_(None))
+        .order_by(Assignment.id)
+    )
+
+
+def volunteers_with_skills() -> Select:
+    '''Una fila por voluntario con sus datos de usuario y sus skills activas agregadas'''
+    columns = (
+        Volunteer.id.label("volunteer_id"),
+        User.id.label("user_id"),
+        User.name.label("name"),
+        User.email.label("email"),
+        User.phone.label("phone"),
+        Volunteer.status.label("status"),
+        Volunteer.created_at,
+        Volunteer.updated_at,
+    )
+    return (
+        select(
+            *columns,
+            func.count(Skill.id).label("skill_count"),
+            func.aggregate_strings(Skill.name, SKILL_SEPARATOR).label("skills"),
+        )
+        .select_from(Volunteer)
+        .join(User, User.id == Volunteer.user_id)
+        .outerjoin(volunteer_skills, and_(
+            volunteer_skills.c.volunteer_id == Volunteer.id,
+            volunteer_skills.c.deleted_at.is_(None)
+        ))
+        .outerjoin(Skill, and_(Skill.id == volunteer_skills.c.skill_id, Skill.deleted_at.is_(None)))
+        .where(Volunteer.deleted_at.is_(None))
+        .group_by(*columns)
+        .order_by(Volunteer.id)
+    )
+
+
+def projects_with_requirements() -> Select:
+    '''Una fila por proyecto con su categoría y las skills que requiere agregadas'''
+    columns = (
+        Project.id.label("project_id"),
+        Project.name.label("name"),
+        Project.status.label("status"),
+        Project.priority.label("priority"),
+        Project.deadline.label("deadline"),
+        Category.name.label("category"),
+        Project.created_at,
+        Project.updated_at,
+    )
+    return (
+        select(
+            *columns,
+            func.count(Skill.id).label("required_skill_count"),
+            func.aggregate_strings(Skill.name, SKILL_SEPARATOR).label("required_skills"),
+        )
+        .select_from(Project)
+        .join(Category, Category.id == Project.category_id)
+        .outerjoin(project_skills, and_(
+            project_skills.c.project_id == Project.id,
+            project_skills.c.deleted_at.is_(None)
+        ))
+        .outerjoin(Skill, and_(Skill.id == project_skills.c.skill_id, Skill.deleted_at.is_(None)))
+        .where(Project.deleted_at.is_(None))
+        .group_by(*columns)
+        .order_by(Project.id)
+    )
+
+
+# nombre -> (tabla principal, constructor de la consulta)
+EXPORT_VIEWS: dict[str, tuple[Table, Callable[[], Select]]] = {
+    "assignments_detailed": (Assignment.__table__, assignments_detailed),
+    "volunteers_with_skills": (Volunteer.__table__, volunteers_with_skills),
+    "projects_with_requirements": (Project.__table__, projects_with_requirements),
+}
@@ -0,0 +1,256 @@
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator
+
+from fastapi import HTTPException
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import Column, Table, insert, select
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.models import *
+from app.schemas.users_schema import UserCreate
+from app.schemas.volunteer_schema import VolunteerCreate
+from app.schemas.project_schema import ProjectCreate
+from app.schemas.skills_schema import SkillCreate
+from app.schemas.import_schema import ImportReport, ImportRowError
+from app.utils.security import hash_password
+
+logger = get_logger("Import") #logging
+
+
+# entidad -> (tabla, esquema de validación, columna única para deduplicar)
+IMPORT_ENTITIES: dict[str, tuple[Table, type[BaseModel], str]] = {
+    "users": (User.__table__, UserCreate, "email"),
+    "volunteers": (Volunteer.__table__, VolunteerCreate, "user_id"),
+    "projects": (Project.__table__, ProjectCreate, "name"),
+    "skills": (Skill.__table__, SkillCreate, "name"),
+}
+
+# Claves ajenas que se comprueban por lote antes de insertar: campo -> (columna, mensaje)
+FOREIGN_KEYS: dict[str, dict[str, tuple[Column, str]]] = {
+    "volunteers": {"user_id": (User.__table__.c.id, "User with ID {} not found")},
+    "projects": {"category_id": (Category.__table__.c.id, "Category with ID {} not found")},
+}
+
+_hash_pool: ProcessPoolExecutor | None = None
+
+Record = tuple[int, dict]     # (línea del archivo, campos)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.IMPORT_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(cancel_futures=True)
+        _hash_pool = None
+
+
+def hash_passwords(passwords: list[str]) -> list[str]:
+    '''bcrypt es CPU puro: con muchas contraseñas se reparte entre procesos'''
+    workers = settings.IMPORT_HASH_WORKERS
+    if workers <= 1 or len(passwords) < 2 * workers:
+        return [hash_password(p) for p in passwords]
+    chunksize = max(1, len(passwords) // (4 * workers))
+    return list(_get_hash_pool().map(hash_password, passwords, chunksize=chunksize))
+
+
+### PARSE ###
+
+def iter_records(stream: BinaryIO, fmt: str, errors: list[ImportRowError]) -> Iterator[Record]:
+    '''Lee el archivo fila a fila (CSV con cabecera o JSON Lines) sin cargarlo entero'''
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            # En CSV una celda vacía es un valor ausente
+            yield reader.line_num, {k: (v if v != "" else None) for k, v in record.items() if k}
+        return
+
+    for line, raw in enumerate(text, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except json.JSONDecodeError as e:
+            errors.append(ImportRowError(line=line, error=f"Invalid JSON: {e.msg}"))
+            continue
+        if not isinstance(record, dict):
+            errors.append(ImportRowError(line=line, error="Each line must be a JSON object"))
+            continue
+        yield line, record
+
+
+def _batches(records: Iterable[Record], size: int) -> Iterator[list[Record]]:
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+### VALIDATE ###
+
+@lru_cache
+def _list_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(list[schema])
+
+
+def validate_batch(schema: type[BaseModel], batch: list[Record], errors: list[ImportRowError]) -> list[tuple[int, BaseModel]]:
+    '''
+    Valida el lote entero en una sola llamada a pydantic. Si hay errores se
+    reparten por fila (el índice va en loc[0]) y se revalidan solo las filas buenas.
+    '''
+    adapter = _list_adapter(schema)
+    try:
+        return list(zip((line for line, _ in batch), adapter.validate_python([r for _, r in batch])))
+    except ValidationError as e:
+        bad = set()
+        for error in e.errors():
+            index, *field = error["loc"]
+            bad.add(index)
+            errors.append(ImportRowError(
+                line=batch[index][0],
+                field=".".join(str(f) for f in field) or None,
+                error=error["msg"]
+            ))
+        good = [record for i, record in enumerate(batch) if i not in bad]
+        return list(zip((line for line, _ in good), adapter.validate_python([r for _, r in good]))) if good else []
+
+
+### DEDUPE ###
+
+def _normalize(value):
+    # MySQL compara texto sin distinguir mayúsculas (collation por defecto)
+    return value.lower() if isinstance(value, str) else value
+
+
+def dedupe_batch(db: Session, entity: str, valid: list[tuple[int, BaseModel]], seen: set,
+                 errors: list[ImportRowError]) -> list[tuple[int, BaseModel]]:
+    '''
+    Quita duplicados dentro del archivo (seen) y contra la BD con una consulta IN
+    por lote, y comprueba las claves ajenas de la misma forma.
+    '''
+    if not valid:
+        return []
+    table, _, key = IMPORT_ENTITIES[entity]
+    values = [getattr(model, key) for _, model in valid]
+    existing = {_normalize(v) for v in db.scalars(select(table.c[key]).where(table.c[key].in_(values)))}
+
+    missing = {}
+    for field, (column, message) in FOREIGN_KEYS.get(entity, {}).items():
+        wanted = {getattr(model, field) for _, model in valid}
+        found = set(db.scalars(select(column).where(column.in_(wanted))))
+        missing[field] = (wanted - found, message)
+
+    unique = []
+    for line, model in valid:
+        value = _normalize(getattr(model, key))
+        if value in existing:
+            errors.append(ImportRowError(line=line, field=key, error=f"{entity[:-1].capitalize()} already exists"))
+            continue
+        if value in seen:
+            errors.append(ImportRowError(line=line, field=key, error="Duplicated in file"))
+            continue
+        broken = [(field, message) for field, (ids, message) in missing.items() if getattr(model, field) in ids]
+        if broken:
+            field, message = broken[0]
+            errors.append(ImportRowError(line=line, field=field, error=message.format(getattr(model, field))))
+            continue
+        seen.add(value)
+        unique.append((line, model))
+    return unique
+
+
+### INSERT ###
+
+def _to_rows(entity: str, valid: list[tuple[int, BaseModel]]) -> list[dict]:
+    rows = [model.model_dump() for _, model in valid]
+    if entity == "users":
+        for row, hashed in zip(rows, hash_passwords([row["password"] for row in rows])):
+            row["password"] = hashed
+    return rows
+
+
+def insert_batch(db: Session, entity: str, valid: list[tuple[int, BaseModel]], errors: list[ImportRowError]) -> int:
+    '''Un executemany y un commit por lote; si falla, se repite fila a fila para aislar el error'''
+    if not valid:
+        return 0
+    table = IMPORT_ENTITIES[entity][0]
+    rows = _to_rows(entity, valid)
+    # No solo IntegrityError: un DataError (p. ej. texto más largo que la columna en MySQL
+    # estricto) también es de una fila. Si se cayó la conexión no tiene sentido seguir
+    try:
+        db.execute(insert(table), rows)
+        db.commit()
+        return len(rows)
+    except DBAPIError as e:
+        db.rollback()
+        if e.connection_invalidated:
+            raise
+
+    inserted = 0
+    for (line, _), row in zip(valid, rows):
+        try:
+            db.execute(insert(table), row)
+            db.commit()
+            inserted += 1
+        except IntegrityError as e:
+            db.rollback()
+            logger.warning(f"Import row {line} violates a database constraint: {e.orig}")
+            errors.append(ImportRowError(line=line, error="Row violates a database constraint"))
+        except DBAPIError as e:
+            db.rollback()
+            if e.connection_invalidated:
+                raise
+            logger.warning(f"Import row {line} rejected by the database: {e.orig}")
+            errors.append(ImportRowError(line=line, error="Row rejected by the database"))
+    return inserted
+
+
+def import_records(db: Session, entity: str, records: Iterable[Record], batch_size: int = settings.IMPORT_BATCH_SIZE,
+                   errors: list[ImportRowError] | None = None) -> ImportReport:
+    '''
+    Pipeline de importación por lotes: validar -> deduplicar -> hashear -> insertar.
+    Las filas con error no detienen la importación: se devuelven en el informe.
+    '''
+    if entity not in IMPORT_ENTITIES:
+        logger.warning(f"Import {entity} not supported")
+        raise HTTPException(status_code=404, detail="Import entity not found")     #Not found
+
+    schema = IMPORT_ENTITIES[entity][1]
+    errors = [] if errors is None else errors
+    seen: set = set()
+    inserted = 0
+
+    for batch in _batches(records, batch_size):
+        valid = validate_batch(schema, batch, errors)
+        valid = dedupe_batch(db, entity, valid, seen, errors)
+        inserted += insert_batch(db, entity, valid, errors)
+        logger.info(f"Imported {inserted} {entity} so far")
+
+    # Cada fila no insertada tiene al menos un error (validación, duplicado, clave ajena o BD)
+    failed = len({error.line for error in errors})
+    errors.sort(key=lambda error: error.line)
+    return ImportReport(entity=entity, total=inserted + failed, inserted=inserted, failed=failed, errors=errors)
+
+
+def import_file(db: Session, entity: str, stream: BinaryIO, fmt: str, batch_size: int = settings.IMPORT_BATCH_SIZE) -> ImportReport:
+    '''Importa un archivo CSV o JSON Lines (subido a la API o abierto desde la CLI)'''
+    logger.info(f"Importing {entity} from {fmt}")
+    errors: list[ImportRowError] = []
+    return import_records(db, entity, iter_records(stream, fmt, errors), batch_size, errors)
@@ -1,45 +1,361 @@
 import datetime
-from sqlalchemy import select, update, insert
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from sqlalchemy import select, update, insert, or_, and_, case, func
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
-from fastapi_pagination.ext.sqlalchemy import paginate
-from fastapi_pagination import Page
 
 from app.schemas import project_schema as schema
 from app.config.logging_config import get_logger
 from app.models.project_model import Project
 from app.models.project_skill_model import project_skills
 from app.models.skill_model import Skill
-from app.controllers.skill_controller import get_skill
+from app.controllers.skill_controller import get_skill_cached, ensure_skills_exist
+from app.schemas.skills_schema import SkillOut
 from app.models.volunteer_skill_model import volunteer_skills
 from app.models.volunteers_model import Volunteer
 from app.models.users_model import User
+from app.models.category_model import Category
+from app.domain.volunteer_enum import VolunteerStatus
+from app.domain.projects_enums import Project_status, Project_priority
+from app.utils.cursor import NUMBER, encode_cursor, decode_cursor
+from app.utils.keyset import keyset_paginate
+from app.utils.counting import paginate_counted
+from app.utils.fieldsets import load_fields, sparse_model
+from app.utils.entity_cache import cached_entity
+from app.schemas.page_schema import CursorPage, CountedPage
+from app.utils.search import project_search_index
+from app.utils.skill_links import sync_skill_links
+from app.utils.cache import ttl_cache, invalidate
+from app.database.change_tracking import on_tables_changed
+from app.config.config_variables import settings
 
 logger = get_logger("Project")
 
+# Tablas de las que salen los contadores y estadísticas cacheados en el espacio "projects"
+PROJECT_STATS_TABLES = {"projects", "project_skills", "volunteer_skills", "volunteers", "skills", "categories"}
+
+
+@on_tables_changed
+def _invalidate_project_stats(tables: set[str]) -> None:
+    # Cualquier commit cuenta (también el cambio de estado desde una asignación);
+    # sin anunciarlo: los demás workers lo hacen al recibir las tablas por el bus
+    if tables & PROJECT_STATS_TABLES:
+        invalidate("projects", broadcast=False)
+
 class ProjectController:
 
+    # relaciones que se pueden pedir con ?include=
+    INCLUDE_OPTIONS = {"skills", "category"}
+
+    @staticmethod
+    def parse_include(include: Optional[str]) -> frozenset:
+        requested = frozenset(part.strip() for part in (include or "").split(",") if part.strip())
+        unknown = requested - ProjectController.INCLUDE_OPTIONS
+        if unknown:
+            logger.warning(f"Unknown include options: {sorted(unknown)}")
+            raise HTTPException(status_code=400, detail=f"Invalid include: {', '.join(sorted(unknown))}")    #Bad request
+        return requested
+
+    @staticmethod
+    def _include_loaders(include: frozenset) -> list:
+        # category: JOIN en la misma consulta; skills: una única consulta IN por página
+        loaders = []
+        if "category" in include:
+            loaders.append(joinedload(Project.category))
+        if "skills" in include:
+            loaders.append(selectinload(Project.active_skills))
+        return loaders
+
+    @staticmethod
+    def resolve_fields(fields: Optional[tuple[str, ...]], include: frozenset) -> frozenset:
+        # Con ?fields= solo se cargan las relaciones que están entre los campos pedidos
+        return frozenset(fields) & ProjectController.INCLUDE_OPTIONS if fields else include
+
+    @staticmethod
+    def _query(db: Session, include: frozenset, fields: Optional[tuple[str, ...]]):
+        query = (
+            db.query(Project)
+            .options(*ProjectController._include_loaders(include))
+            .filter(Project.deleted_at.is_(None))
+        )
+        return query.options(load_fields(Project, fields)) if fields else query
+
+    @staticmethod
+    def _to_out(project: Project, include: frozenset, fields: Optional[tuple[str, ...]] = None) -> schema.ProjectWithRelationsOut:
+        if fields:
+            data = {name: getattr(project, name) for name in fields if name != "skills"}
+            if "skills" in fields:
+                data["skills"] = project.active_skills
+            return sparse_model(schema.ProjectWithRelationsOut, fields).model_validate(data, from_attributes=True)
+        out = schema.ProjectWithRelationsOut.model_validate(schema.ProjectOut.model_validate(project), from_attributes=True)
+        if "skills" in include:
+            out.skills = [SkillOut.model_validate(skill) for skill in project.active_skills]
+        return out
+
     #READ ALL PROJECTS
     @staticmethod
-    async def get_projects(db: Session) -> Page[schema.ProjectOut]:
-        logger.info(f"Trying to get all projects")
+    async def get_projects(db: Session, include: frozenset = frozenset(),
+                           fields: Optional[tuple[str, ...]] = None) -> CountedPage[schema.ProjectWithRelationsOut]:
+        logger.info(f"Trying to get all projects (include={sorted(include)}, fields={fields})")
         
-        return paginate(db.query(Project).filter(Project.deleted_at.is_(None)))
+        include = ProjectController.resolve_fields(fields, include)
+        return paginate_counted(db, ProjectController._query(db, include, fields), "projects",
+                                transformer=lambda projects: [ProjectController._to_out(p, include, fields) for p in projects])
+    
+    
+    #READ PROJECTS BY CURSOR
+    @staticmethod
+    async def get_projects_cursor(db: Session, cursor: Optional[str], size: int, include_total: bool = False,
+                                  include: frozenset = frozenset(),
+                                  fields: Optional[tuple[str, ...]] = None) -> CursorPage[schema.ProjectWithRelationsOut]:
+        logger.info(f"Trying to get projects page by cursor (include={sorted(include)}, fields={fields})")
+        
+        include = ProjectController.resolve_fields(fields, include)
+        return keyset_paginate(db, ProjectController._query(db, include, fields), Project.id, cursor, size,
+                               lambda projects: [ProjectController._to_out(p, include, fields) for p in projects],
+                               include_total, "projects")
     
     
     #READ ONE PROJECT
     @staticmethod
-    async def get_project(db: Session, project_id: int) -> schema.ProjectOut:
+    @cached_entity("project", schema.ProjectWithRelationsOut,
+                   key=lambda db, project_id, include=frozenset(), fields=None: None if fields else (project_id, ",".join(sorted(include))))
+    async def get_project(db: Session, project_id: int, include: frozenset = frozenset(),
+                          fields: Optional[tuple[str, ...]] = None) -> schema.ProjectWithRelationsOut:
         logger.info(f"Trying to get project id= {project_id}")
-        project = db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+        include = ProjectController.resolve_fields(fields, include)
+        project = ProjectController._query(db, include, fields).filter(Project.id == project_id).first()
 
         if not project:
             logger.warning(f"Project with ID {project_id} not found")
             raise HTTPException(status_code=404, detail="Project not found") #not found
-        return schema.ProjectOut.model_validate(project) if project else None
+        return ProjectController._to_out(project, include, fields)
 
     
+    #SEARCH PROJECTS (texto + filtros, paginación por cursor)
+    @staticmethod
+    async def search_projects(
+        db: Session,
+        q: Optional[str] = None,
+        status: Optional[Project_status] = None,
+        priority: Optional[Project_priority] = None,
+        category_id: Optional[int] = None,
+        deadline_from: Optional[datetime.datetime] = None,
+        deadline_to: Optional[datetime.datetime] = None,
+        cursor: Optional[str] = None,
+        size: int = 20
+    ) -> schema.ProjectSearchPage:
+        logger.info(f"Searching projects q={q!r} status={status} priority={priority} category_id={category_id}")
+
+        filters = [Project.deleted_at.is_(None)]
+        if status is not None:
+            filters.append(Project.status == status)
+        if priority is not None:
+            filters.append(Project.priority == priority)
+        if category_id is not None:
+            filters.append(Project.category_id == category_id)
+        if deadline_from is not None:
+            filters.append(Project.deadline >= deadline_from)
+        if deadline_to is not None:
+            filters.append(Project.deadline <= deadline_to)
+
+        q = (q or "").strip()
+        if not q:
+            # Sin texto: orden estable por id descendente
+            stmt = select(Project).where(*filters).order_by(Project.id.desc())
+            if cursor:
+                (last_id,) = decode_cursor(cursor, 1, (int,))
+                stmt = stmt.where(Project.id < last_id)
+            projects = db.execute(stmt.limit(size + 1)).scalars().all()
+            return ProjectController._search_page([(p, 0.0) for p in projects], size, with_score=False)
+
+        if db.get_bind().dialect.name == "mysql":
+            # MySQL: relevancia calculada por el índice FULLTEXT
+            score = match(Project.name, Project.description, against=q).in_natural_language_mode()
+            stmt = (
+                select(Project, score.label("score"))
+                .where(*filters, score > 0)
+                .order_by(score.desc(), Project.id.desc())
+            )
+            if cursor:
+                last_score, last_id = decode_cursor(cursor, 2, (NUMBER, int))
+                stmt = stmt.where(or_(score < last_score, and_(score == last_score, Project.id < last_id)))
+            rows = db.execute(stmt.limit(size + 1)).all()
+            return ProjectController._search_page([(row[0], float(row[1])) for row in rows], size)
+
+        # Otros motores (SQLite): índice invertido en memoria
+        if project_search_index.stale:
+            # La generación se toma antes de leer: si llega una escritura mientras se
+            # reconstruye, el índice sigue marcado como obsoleto
+            generation = project_search_index.generation
+            project_search_index.rebuild(
+                db.execute(select(Project.id, Project.name, Project.description).where(Project.deleted_at.is_(None))),
+                generation
+            )
+        scores = project_search_index.search(q)
+        if not scores:
+            return schema.ProjectSearchPage(items=[], size=size)
+
+        candidate_ids = db.execute(select(Project.id).where(*filters, Project.id.in_(scores.keys()))).scalars().all()
+        ranked = sorted(candidate_ids, key=lambda pid: (-scores[pid], -pid))
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, 2, (NUMBER, int))
+            ranked = [pid for pid in ranked if (-scores[pid], -pid) > (-last_score, -last_id)]
+
+        page_ids = ranked[:size + 1]
+        projects = {p.id: p for p in db.query(Project).filter(Project.id.in_(page_ids))}
+        return ProjectController._search_page([(projects[pid], scores[pid]) for pid in page_ids], size)
+
+
+    @staticmethod
+    def _search_page(results: list, size: int, with_score: bool = True) -> schema.ProjectSearchPage:
+        has_more = len(results) > size
+        results = results[:size]
+
+        items = []
+        for project, score in results:
+            item = schema.ProjectSearchResult.model_validate(project)
+            item.score = score
+            items.append(item)
+
+        next_cursor = None
+        if has_more:
+            last_project, last_score = results[-1]
+            next_cursor = encode_cursor([last_score, last_project.id] if with_score else [last_project.id])
+
+        return schema.ProjectSearchPage(items=items, size=size, next_cursor=next_cursor)
+
+    
+    #UPCOMING DEADLINES (índice deleted_at, status, deadline)
+    @staticmethod
+    def _upcoming_filter(query, within_days: int, statuses: tuple):
+        now = datetime.datetime.utcnow()
+        query = query.filter(
+            Project.deleted_at.is_(None),
+            Project.deadline >= now,
+            Project.deadline <= now + datetime.timedelta(days=within_days)
+        )
+        if statuses:
+            query = query.filter(Project.status.in_(statuses))
+        return query
+
+    @staticmethod
+    async def get_upcoming_projects(db: Session, within_days: int, statuses: tuple = ()) -> CountedPage[schema.ProjectOut]:
+        logger.info(f"Trying to get projects due within {within_days} days (status={[s.value for s in statuses]})")
+        priority_rank = case(
+            (Project.priority == Project_priority.high, 0),
+            (Project.priority == Project_priority.medium, 1),
+            else_=2
+        )
+        query = (
+            ProjectController._upcoming_filter(db.query(Project).options(joinedload(Project.category)), within_days, statuses)
+            .order_by(Project.deadline, priority_rank, Project.id)
+        )
+        return paginate_counted(db, query, "projects_upcoming")
+
+    @staticmethod
+    @ttl_cache("projects", ttl=settings.CACHE_TTL_SECONDS)
+    async def count_upcoming_projects(db: Session, within_days: int, statuses: tuple = ()) -> schema.ProjectCountOut:
+        logger.info(f"Counting projects due within {within_days} days (status={[s.value for s in statuses]})")
+        count = ProjectController._upcoming_filter(db.query(func.count(Project.id)), within_days, statuses).scalar()
+        return schema.ProjectCountOut(count=count, within_days=within_days)
+
+
+    #STATISTICS (GROUP BY en la BD; memoizado hasta la siguiente escritura de proyectos)
+    @staticmethod
+    @ttl_cache("projects", ttl=settings.CACHE_TTL_SECONDS)
+    async def get_project_stats(db: Session) -> schema.ProjectStatsOut:
+        logger.info("Computing project statistics")
+        now = datetime.datetime.utcnow()
+
+        overdue = case((and_(Project.deadline < now, Project.status != Project_status.completed), 1), else_=0)
+        by_status: dict[str, int] = {s.value: 0 for s in Project_status}
+        by_priority: dict[str, int] = {p.value: 0 for p in Project_priority}
+        total = overdue_count = 0
+
+        #1) estado x prioridad en una sola agrupación
+        rows = db.execute(
+            select(Project.status, Project.priority, func.count(Project.id), func.sum(overdue))
+            .where(Project.deleted_at.is_(None))
+            .group_by(Project.status, Project.priority)
+        ).all()
+        for status, priority, count, overdue_rows in rows:
+            by_status[status.value] += count
+            by_priority[priority.value] += count
+            total += count
+            overdue_count += int(overdue_rows or 0)
+
+        #2) por categoría
+        category_rows = db.execute(
+            select(Category.id, Category.name, func.count(Project.id))
+            .join(Project, Project.category_id == Category.id)
+            .where(Project.deleted_at.is_(None))
+            .group_by(Category.id, Category.name)
+            .order_by(func.count(Project.id).desc(), Category.id)
+        ).all()
+
+        #3) cobertura: skills requeridas que tiene al menos un voluntario activo
+        available = (
+            select(volunteer_skills.c.skill_id)
+            .join(Volunteer, Volunteer.id == volunteer_skills.c.volunteer_id)
+            .where(
+                volunteer_skills.c.deleted_at.is_(None),
+                Volunteer.deleted_at.is_(None),
+                Volunteer.status == VolunteerStatus.active
+            )
+            .distinct()
+            .subquery()
+        )
+        per_project = (
+            select(
+                project_skills.c.project_id,
+                func.count(project_skills.c.skill_id).label("required"),
+                func.count(available.c.skill_id).label("covered")
+            )
+            .join(Project, Project.id == project_skills.c.project_id)
+            .join(Skill, Skill.id == project_skills.c.skill_id)
+            .outerjoin(available, available.c.skill_id == project_skills.c.skill_id)
+            .where(
+                project_skills.c.deleted_at.is_(None),
+                Project.deleted_at.is_(None),
+                Skill.deleted_at.is_(None)
+            )
+            .group_by(project_skills.c.project_id)
+            .subquery()
+        )
+        projects_req, fully_covered, required, covered = db.execute(
+            select(
+                func.count(per_project.c.project_id),
+                func.sum(case((per_project.c.covered == per_project.c.required, 1), else_=0)),
+                func.sum(per_project.c.required),
+                func.sum(per_project.c.covered)
+            )
+        ).one()
+        projects_req, fully_covered = projects_req or 0, int(fully_covered or 0)
+        required, covered = int(required or 0), int(covered or 0)
+
+        return schema.ProjectStatsOut(
+            total=total,
+            overdue=overdue_count,
+            by_status=by_status,
+            by_priority=by_priority,
+            by_category=[
+                schema.CategoryCountOut(category_id=cid, name=name, count=count)
+                for cid, name, count in category_rows
+            ],
+            skill_coverage=schema.SkillCoverageOut(
+                projects_with_requirements=projects_req,
+                fully_covered_projects=fully_covered,
+                fully_covered_ratio=round(fully_covered / projects_req, 4) if projects_req else 0.0,
+                required_skills=required,
+                covered_skills=covered,
+                covered_skills_ratio=round(covered / required, 4) if required else 0.0
+            )
+        )
+
+
     #CREATE PROJECT
     @staticmethod
     async def create_project(db: Session, project: schema.ProjectCreate)-> schema.ProjectOut:
@@ -121,7 +437,7 @@ class ProjectController:
             logger.warning(f"Project {project_id} already deleted at {project.deleted_at}")
             raise HTTPException(status_code=400, detail="Project already deleted")      #Bad request
         
-        project.deleted_at = datetime.utcnow()
+        project.deleted_at = datetime.datetime.utcnow()
         db.commit()
         logger.info(f"Soft-deleted for project with ID {project.id}")
         
@@ -138,7 +454,7 @@ class ProjectController:
             logger.warning(f"Project with ID {project_id} not found")
             raise HTTPException(status_code=404, detail="Project not found")    #Not found
 
-        skill = get_skill(db, skill_id)
+        skill = get_skill_cached(db, skill_id)
 
         existing_relation = db.execute(
             select(project_skills)
@@ -181,6 +497,36 @@ class ProjectController:
         return schema.ProjectSkillsOut.model_validate(project)
 
 
+    #replace the whole skill set
+    @staticmethod
+    async def set_project_skills(db: Session, project_id: int, skill_ids: List[int]) -> schema.ProjectWithRelationsOut:
+        logger.info(f"Setting {len(set(skill_ids))} skills for project {project_id}")
+        project = db.query(Project).filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+        if not project:
+            logger.warning(f"Project with ID {project_id} not found")
+            raise HTTPException(status_code=404, detail="Project not found")    #Not found
+
+        ensure_skills_exist(db, skill_ids)
+
+        try:
+            sync_skill_links(db, project_skills, "project_id", project_id, skill_ids)
+            db.commit()
+            logger.info(f"Skill set updated for project {project_id}")
+
+        except IntegrityError as e:
+            db.rollback()
+            logger.error(f"Error setting skills for project {project_id}: {e}")
+            raise HTTPException(status_code=409, detail="Project skills violate a database constraint")    #Conflict
+
+        except Exception as e:
+            db.rollback()
+            logger.exception(f"Error setting skills for project {project_id}: {e}")
+            raise HTTPException(status_code=500, detail="Error updating project skills")   #Internal server error
+
+        db.expire(project)
+        return await ProjectController.get_project(db, project_id, include=frozenset({"skills"}))
+
+
     #read project+skill
     @staticmethod
     async def get_project_with_skills(db: Session, project_id: int):
@@ -208,7 +554,7 @@ class ProjectController:
             raise HTTPException(status_code=404, detail="Project not found")    #Not found
             
         #verificar que el skill existe
-        get_skill(db, skill_id)
+        get_skill_cached(db, skill_id)
         
         #verificar que existe la relacion activa
         existing = db.execute(
@@ -232,7 +578,7 @@ class ProjectController:
                         project_skills.c.skill_id == skill_id,
                         project_skills.c.deleted_at.is_(None)
                 )
-                .values(deleted_at=datetime.utcnow())
+                .values(deleted_at=datetime.datetime.utcnow())
             )
 
             db.execute(upd)
@@ -264,7 +610,7 @@ class ProjectController:
             update_stmt = update(project_skills).where(
                                 project_skills.c.project_id == project_id,
                                 project_skills.c.deleted_at.is_(None)
-                                    ).values(deleted_at=datetime.utcnow())
+                                    ).values(deleted_at=datetime.datetime.utcnow())
         
             db.execute(update_stmt)
             db.commit()
@@ -5,6 +5,7 @@ from fastapi import HTTPException
 from app.config.logging_config import get_logger
 from app.models.role_model import Role
 from app.schemas import role_schema as schema
+from app.utils.entity_cache import cached_entity
 
 logger = get_logger("Roles")
 
@@ -19,6 +20,7 @@ class RoleController:
     
     @staticmethod
     #GET ROLE BY ID
+    @cached_entity("role", schema.RoleOut, key=lambda db, role_id: (role_id, ""))
     def get_one_role(db: Session, role_id: int):
         logger.info(f"Getting role with ID {role_id}")
         role = db.query(Role).filter(Role.id == role_id).first()
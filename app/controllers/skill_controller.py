@@ -1,20 +1,31 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi_pagination.ext.sqlalchemy import paginate
-from fastapi_pagination import Page
 from fastapi import HTTPException
 from datetime import datetime
 
 from app.config.logging_config import get_logger
 from app.models.skill_model import Skill
 from app.schemas.skills_schema import SkillCreate, SkillUpdate, SkillOut
+from app.schemas.page_schema import CursorPage, CountedPage
+from app.utils.keyset import keyset_paginate
+from app.utils.counting import paginate_counted
+from app.utils.serialization import schema_select
+from app.utils.entity_cache import cached_entity
 
 logger = get_logger("Skills")
 
 #Get all skills
-def get_skills(db: Session)-> Page[SkillOut]:
+def get_skills(db: Session)-> CountedPage[SkillOut]:
     logger.info(f"Getting skills list")
-    return paginate(db.query(Skill).filter(Skill.deleted_at.is_(None)))
+    # Solo lectura: filas Core con las columnas de SkillOut, sin objetos ORM
+    return paginate_counted(db, schema_select(Skill, SkillOut).where(Skill.deleted_at.is_(None)), "skills")
+
+#Get skills by cursor
+def get_skills_cursor(db: Session, cursor: str | None, size: int, include_total: bool = False) -> CursorPage[SkillOut]:
+    logger.info(f"Getting skills page by cursor")
+    query = schema_select(Skill, SkillOut).where(Skill.deleted_at.is_(None))
+    return keyset_paginate(db, query, Skill.id, cursor, size, None, include_total, "skills")
 
 #Get skill by ID
 def get_skill(db: Session, id: int):
@@ -26,6 +37,26 @@ def get_skill(db: Session, id: int):
         raise HTTPException(status_code=404, detail="Skill not found")  #Not found
     return skill
 
+#Get skill by ID (read-through cache, solo lectura)
+@cached_entity("skill", SkillOut, key=lambda db, id: (id, ""))
+def get_skill_cached(db: Session, id: int) -> SkillOut:
+    return get_skill(db, id)
+
+#Check that every skill in a set exists (one query)
+def ensure_skills_exist(db: Session, skill_ids: list[int]):
+    requested = set(skill_ids)
+    if not requested:
+        return
+    
+    found = set(db.execute(
+        select(Skill.id).where(Skill.id.in_(requested), Skill.deleted_at.is_(None))
+    ).scalars())
+    
+    missing = sorted(requested - found)
+    if missing:
+        logger.warning(f"Skills not found: {missing}")
+        raise HTTPException(status_code=404, detail=f"Skills not found: {missing}")  #Not found
+
 #Create Skill
 def create_skill(db: Session, data: SkillCreate):
     logger.info(f"Trying to create Skill: {data.name}")
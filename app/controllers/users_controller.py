@@ -1,12 +1,17 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from fastapi_pagination.ext.sqlalchemy import paginate
-from fastapi_pagination import Page
 from fastapi import HTTPException
 from datetime import datetime
+from typing import Optional
 
 from app.models.users_model import User
 from app.schemas import users_schema
+from app.schemas.page_schema import CursorPage, CountedPage
+from app.utils.keyset import keyset_paginate
+from app.utils.counting import paginate_counted
+from app.utils.fieldsets import load_fields, sparse_model
+from app.utils.serialization import schema_select
+from app.utils.entity_cache import cached_entity
 from app.utils.security import hash_password
 from app.config.logging_config import get_logger
 
@@ -16,31 +21,62 @@ logger = get_logger("Users")
 
 class UserController:
 
+    @staticmethod
+    def _to_out(fields: Optional[tuple[str, ...]]):
+        # Esquema completo o recortado a ?fields= (un modelo por combinación de campos)
+        schema = sparse_model(users_schema.UserOut, fields) if fields else users_schema.UserOut
+        return schema.model_validate
+
+
+    @staticmethod
+    def _query(db: Session, fields: Optional[tuple[str, ...]]):
+        query = db.query(User).filter(User.deleted_at.is_(None))
+        return query.options(load_fields(User, fields)) if fields else query
+
+
+    @staticmethod
+    def _list_source(db: Session, fields: Optional[tuple[str, ...]]):
+        # Listado completo: filas Core con las columnas de UserOut (solo lectura, sin ORM);
+        # con ?fields=: objetos con solo esas columnas y el modelo recortado
+        if not fields:
+            return schema_select(User, users_schema.UserOut).where(User.deleted_at.is_(None)), None
+        to_out = UserController._to_out(fields)
+        return UserController._query(db, fields), lambda users: [to_out(u) for u in users]
+
+
     @staticmethod
     #GET ALL USERS
-    def get_users(db: Session) -> Page[users_schema.UserOut]:
+    def get_users(db: Session, fields: Optional[tuple[str, ...]] = None) -> CountedPage[users_schema.UserOut]:
         logger.info("Getting users list")
         
-        return paginate (db.query(User).filter(User.deleted_at.is_(None)))
+        query, transformer = UserController._list_source(db, fields)
+        return paginate_counted(db, query, "users", transformer=transformer)
+    
+    
+    @staticmethod
+    #GET USERS BY CURSOR
+    def get_users_cursor(db: Session, cursor: str | None, size: int, include_total: bool = False,
+                         fields: Optional[tuple[str, ...]] = None) -> CursorPage[users_schema.UserOut]:
+        logger.info("Getting users page by cursor")
+        
+        query, transformer = UserController._list_source(db, fields)
+        return keyset_paginate(db, query, User.id, cursor, size, transformer, include_total, "users")
         
         
 
     @staticmethod
     #GET USER BY ID
-    def get_one_user(db: Session, user_id: int):
+    @cached_entity("user", users_schema.UserPublicOut, key=lambda db, user_id, fields=None: None if fields else (user_id, ""))
+    def get_one_user(db: Session, user_id: int, fields: Optional[tuple[str, ...]] = None):
         logger.info(f"Getting user with ID {user_id}")
         
-        user =  (
-            db.query(User)
-            .filter(User.id == user_id, User.deleted_at.is_(None))
-            .first()
-        )
+        user = UserController._query(db, fields).filter(User.id == user_id).first()
         
         if not user:
             logger.warning(f"User with ID {user_id} not found")
             raise HTTPException(status_code=404, detail="User not found")   #Not found
         
-        return users_schema.UserOut.model_validate(user)
+        return UserController._to_out(fields)(user)
     
 
     @staticmethod
@@ -2,17 +2,24 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from datetime import datetime
+from typing import Optional
 from app.config.logging_config import get_logger
 from sqlalchemy import select, update, join, and_
-from fastapi_pagination.ext.sqlalchemy import paginate
-from fastapi_pagination import Page
 
 from app.models.volunteers_model import Volunteer
 from app.models.users_model import User
 from app.models.skill_model import Skill
 from app.models.volunteer_skill_model import volunteer_skills
 from app.schemas.volunteer_schema import VolunteerCreate, VolunteerUpdate, VolunteerOut
+from app.schemas.page_schema import CursorPage, CountedPage
+from app.utils.keyset import keyset_paginate
+from app.utils.counting import paginate_counted
+from app.utils.fieldsets import load_fields, sparse_model
+from app.utils.serialization import schema_select
+from app.utils.entity_cache import cached_entity
 from app.domain.volunteer_enum import VolunteerStatus
+from app.controllers.skill_controller import ensure_skills_exist
+from app.utils.skill_links import sync_skill_links
 
 
 logger = get_logger("Volunteers") #logging
@@ -46,11 +53,28 @@ def create_volunteer(db: Session, data: VolunteerCreate):
         logger.exception("Unexpected error creating volunteer")
         raise HTTPException(status_code=500, detail="Internal server error")    #Internal server Error
 
+def _volunteers_source(db: Session, fields: Optional[tuple[str, ...]]):
+    # Listado completo: filas Core con las columnas de VolunteerOut (solo lectura, sin ORM);
+    # con ?fields=: objetos con solo esas columnas y el modelo recortado
+    if not fields:
+        return schema_select(Volunteer, VolunteerOut).where(Volunteer.deleted_at.is_(None)), None
+    to_out = sparse_model(VolunteerOut, fields).model_validate
+    query = db.query(Volunteer).filter(Volunteer.deleted_at.is_(None)).options(load_fields(Volunteer, fields))
+    return query, lambda volunteers: [to_out(v) for v in volunteers]
+
 #Get all Volunteers
-def get_volunteers(db: Session) -> Page[VolunteerOut]:
+def get_volunteers(db: Session, fields: Optional[tuple[str, ...]] = None) -> CountedPage[VolunteerOut]:
     logger.info(f"Getting volunteers list")
     
-    return paginate(db.query(Volunteer).filter(Volunteer.deleted_at.is_(None)))
+    query, transformer = _volunteers_source(db, fields)
+    return paginate_counted(db, query, "volunteers", transformer=transformer)
+
+#Get Volunteers by cursor
+def get_volunteers_cursor(db: Session, cursor: str | None, size: int, include_total: bool = False,
+                          fields: Optional[tuple[str, ...]] = None) -> CursorPage[VolunteerOut]:
+    logger.info(f"Getting volunteers page by cursor")
+    query, transformer = _volunteers_source(db, fields)
+    return keyset_paginate(db, query, Volunteer.id, cursor, size, transformer, include_total, "volunteers")
 
 #Get Volunteer by ID
 def get_volunteer(db: Session, id: int):
@@ -63,6 +87,20 @@ def get_volunteer(db: Session, id: int):
         raise HTTPException(status_code=404, detail="Volunteer not found")  #Not found
     return volunteer
 
+#Get Volunteer by user id (read-through cache, solo lectura)
+@cached_entity("volunteer", VolunteerOut, key=lambda db, id: (id, ""))
+def get_volunteer_cached(db: Session, id: int) -> VolunteerOut:
+    return get_volunteer(db, id)
+
+#Get Volunteer by volunteer id
+def get_volunteer_by_id(db: Session, volunteer_id: int):
+    volunteer = db.query(Volunteer).filter(Volunteer.id == volunteer_id, Volunteer.deleted_at.is_(None)).first()
+
+    if not volunteer:
+        logger.warning(f"Volunteer with ID {volunteer_id} not found")
+        raise HTTPException(status_code=404, detail="Volunteer not found")  #Not found
+    return volunteer
+
 #Update Volunteer
 def update_volunteer(db: Session, id: int, data: VolunteerUpdate):
     logger.info(f"Changing the volunteer's status")
@@ -151,6 +189,30 @@ def add_skill_to_volunteer(db: Session, volunteer_id: int, skill_id: int):
     logger.info(f"Skill successfully added to the volunteer")
     return volunteer
 
+#Replace the whole skill set of a Volunteer
+def set_volunteer_skills(db: Session, volunteer_id: int, skill_ids: list[int]):
+    logger.info(f"Setting {len(set(skill_ids))} skills for volunteer {volunteer_id}")
+
+    get_volunteer_by_id(db, volunteer_id)
+    ensure_skills_exist(db, skill_ids)
+
+    try:
+        sync_skill_links(db, volunteer_skills, "volunteer_id", volunteer_id, skill_ids)
+        db.commit()
+        logger.info(f"Skill set updated for volunteer {volunteer_id}")
+    
+    except IntegrityError as e:
+        db.rollback()
+        logger.error(f"Error setting skills for volunteer {volunteer_id}: {e}")
+        raise HTTPException(status_code=409, detail="Volunteer skills violate a database constraint")     #Conflict
+    
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"Error setting skills for volunteer {volunteer_id}: {e}")
+        raise HTTPException(status_code=500, detail="Error updating volunteer skills")     #Internal Server Error
+
+    return get_volunteer_with_skills(db, volunteer_id)
+
 #Remove Skill from Volunteer
 
 def remove_skill_from_volunteer(db: Session, volunteer_id: int, skill_id: int):
@@ -0,0 +1,139 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from sqlalchemy import event
+
+# Control de admisión delante del pool de conexiones: como mucho `limit` peticiones
+# tienen sesión a la vez; las demás esperan en una cola acotada por prioridad y, si
+# la cola está llena o la espera pasa de max_wait, se rechazan al momento (503) en
+# lugar de acumularse en el checkout del pool hasta el timeout.
+# El límite se adapta (AIMD) a la latencia observada de las sentencias: +1/limit por
+# sentencia rápida, x0.75 como mucho una vez por segundo si la media pasa del objetivo.
+
+_BACKOFF = 0.75
+_DECREASE_COOLDOWN = 1.0    # segundos entre dos reducciones seguidas
+_ALPHA = 0.2                # peso de la última medida en las medias móviles
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__(f"Database busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("event", "granted", "cancelled")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = self.cancelled = False
+
+
+class AdmissionController:
+    def __init__(self, min_limit: int, initial_limit: int, max_limit: int, max_queue: int,
+                 max_wait: float, latency_target: float):
+        self.min_limit, self.max_limit = min_limit, max_limit
+        self.limit = float(initial_limit)
+        self.max_queue, self.max_wait, self.latency_target = max_queue, max_wait, latency_target
+        self.in_use = self.queued = 0
+        self.admitted = self.rejected = self.timed_out = 0
+        self.latency_ewma = self.hold_ewma = 0.0
+        self._heap: list[tuple[int, int, _Waiter]] = []
+        self._seq = itertools.count()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def _grant(self) -> None:
+        # Con el lock tomado: da plaza a los primeros de la cola (menor prioridad, luego orden de llegada)
+        while self._heap and self.in_use < int(self.limit):
+            _, _, waiter = heapq.heappop(self._heap)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self.queued -= 1
+            self.in_use += 1
+            self.admitted += 1
+            waiter.event.set()
+
+    def _retry_after(self) -> int:
+        # Tiempo estimado para vaciar la cola actual
+        return max(1, math.ceil((self.queued + 1) * self.hold_ewma / max(int(self.limit), 1)))
+
+    def acquire(self, priority: int = 1) -> None:
+        with self._lock:
+            if self.in_use < int(self.limit) and not self.queued:
+                self.in_use += 1
+                self.admitted += 1
+                return
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded(self._retry_after())
+            waiter = _Waiter()
+            heapq.heappush(self._heap, (priority, next(self._seq), waiter))
+            self.queued += 1
+
+        if waiter.event.wait(self.max_wait):
+            return
+        with self._lock:
+            if waiter.granted:      # se le dio plaza justo al vencer la espera
+                return
+            waiter.cancelled = True
+            self.queued -= 1
+            self.timed_out += 1
+            raise Overloaded(self._retry_after())
+
+    def release(self, held: float) -> None:
+        with self._lock:
+            self.in_use -= 1
+            self.hold_ewma = held if not self.hold_ewma else _ALPHA * held + (1 - _ALPHA) * self.hold_ewma
+            self._grant()
+
+    def observe(self, seconds: float) -> None:
+        '''Latencia de una sentencia: ajusta el límite (AIMD)'''
+        with self._lock:
+            self.latency_ewma = seconds if not self.latency_ewma else _ALPHA * seconds + (1 - _ALPHA) * self.latency_ewma
+            now = time.monotonic()
+            if self.latency_ewma > self.latency_target:
+                if now - self._last_decrease >= _DECREASE_COOLDOWN:
+                    self.limit = max(float(self.min_limit), self.limit * _BACKOFF)
+                    self._last_decrease = now
+            else:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+                self._grant()
+
+    def install(self, engine) -> None:
+        '''Mide la duración de cada sentencia del engine y la pasa a observe()'''
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("admission_start", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _end(conn, cursor, statement, parameters, context, executemany):
+            self.observe(time.perf_counter() - conn.info["admission_start"].pop())
+
+        @event.listens_for(engine, "handle_error")
+        def _error(context):
+            if context.connection is not None and context.connection.info.get("admission_start"):
+                context.connection.info["admission_start"].pop()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "limit": int(self.limit),
+                "max_limit": self.max_limit,
+                "in_use": self.in_use,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "latency_ewma_ms": round(self.latency_ewma * 1000, 2),
+                "hold_ewma_ms": round(self.hold_ewma * 1000, 2),
+            }
+
+
+def route_priority(path: str, priorities: dict[str, int], default: int = 1) -> int:
+    '''Prioridad por prefijo de ruta (el más largo que coincida); menor número = antes'''
+    matches = [prefix for prefix in priorities if path.startswith(prefix)]
+    return priorities[max(matches, key=len)] if matches else default
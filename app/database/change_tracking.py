@@ -0,0 +1,56 @@
+from typing import Callable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+# Tablas modificadas en la transacción en curso de cada sesión; al hacer commit
+# se avisa a los listeners (cachés de conteos, versiones de tabla...)
+_listeners: list[Callable[[set[str]], None]] = []
+
+
+def on_tables_changed(listener: Callable[[set[str]], None]) -> Callable[[set[str]], None]:
+    '''Registra una función que recibe los nombres de las tablas escritas tras cada commit'''
+    _listeners.append(listener)
+    return listener
+
+
+def notify_tables_changed(tables: set[str]) -> None:
+    '''Avisa a los listeners (también lo usa el bus de invalidación con escrituras de otros workers)'''
+    for listener in _listeners:
+        listener(tables)
+
+
+def _changed(session: Session) -> set[str]:
+    return session.info.setdefault("changed_tables", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session: Session, flush_context) -> None:
+    changed = _changed(session)
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        changed.update(table.name for table in state.mapper.tables)
+        # Relaciones many-to-many: la escritura va a la tabla intermedia
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is not None and not relationship.viewonly \
+                    and state.attrs[relationship.key].history.has_changes():
+                changed.add(relationship.secondary.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state: ORMExecuteState) -> None:
+    # insert()/update()/delete() ejecutados con session.execute (Core o ORM)
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _changed(orm_execute_state.session).add(orm_execute_state.statement.table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify(session: Session) -> None:
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        notify_tables_changed(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop("changed_tables", None)
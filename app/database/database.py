@@ -1,8 +1,11 @@
+from fastapi import HTTPException, Request, status
 from sqlalchemy import create_engine, DateTime, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, DeclarativeBase, Mapped,  mapped_column
 from app.config.config_variables import settings
+from app.database.admission import AdmissionController, Overloaded, route_priority
 from datetime import datetime
+import time
 
 # Variables de entorno para no exponer información sensible
 DB_USER = settings.DB_USERNAME
@@ -27,15 +30,28 @@ engine = create_engine(
         "password": DB_PASSWORD,
         "database": DB_DEV_NAME,
         "port": int(3306)
-    }
+    },
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW
 )
 
+# Sesiones simultáneas de las peticiones: nunca más que conexiones tiene el pool
+admission = AdmissionController(
+    min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+    initial_limit=settings.DB_POOL_SIZE,
+    max_limit=settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    max_wait=settings.ADMISSION_MAX_WAIT_SECONDS,
+    latency_target=settings.ADMISSION_LATENCY_TARGET_MS / 1000,
+)
+admission.install(engine)
+
 class Base(DeclarativeBase):
     created_at: Mapped[datetime] = mapped_column(
         DateTime, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False, index=True     # índice para exports incrementales (?since=)
     )
     deleted_at: Mapped[datetime] = mapped_column(
         DateTime, nullable=True, default=None
@@ -48,10 +64,29 @@ Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 #Base = declarative_base()
 
 # función para obtener la sesión de la base de datos
-def get_db():
+def get_db(request: Request):
+    # Espera turno en el control de admisión; con la cola llena responde 503 al momento
+    try:
+        admission.acquire(route_priority(request.url.path, settings.ADMISSION_PRIORITIES))
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )   #Service unavailable
+    start = time.monotonic()
     db = Session()  # Crea una nueva sesión
+    db.info["admission_release"] = lambda: admission.release(time.monotonic() - start)
     try:
         yield db  # Usa la sesión
     finally:
-        db.close()  # Cierra la sesión al terminar
+        release_db(db)  # Cierra la sesión al terminar
+
+
+def release_db(db):
+    '''Cierra la sesión y devuelve su plaza del control de admisión (solo la primera vez)'''
+    db.close()
+    release = db.info.pop("admission_release", None)
+    if release is not None:
+        release()
 
@@ -1,10 +1,16 @@
 import app.models
 import textwrap
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi_pagination import add_pagination
 from app.database.database import Base, engine
-from app.routes import volunteer_routes, users_routes, project_routes, category_routes, role_routes, skill_routes, assignment_routes, export, auth_routes
+from app.routes import volunteer_routes, users_routes, project_routes, category_routes, role_routes, skill_routes, assignment_routes, export, auth_routes, import_routes, metrics_routes, batch_routes, dashboard_routes
 from app.config.logging_config import get_logger
+from app.controllers.export_controller import shutdown_arrow_pool
+from app.controllers.export_jobs import shutdown_job_pool
+from app.controllers.import_controller import shutdown_hash_pool
+from app.utils.invalidation import start_bus, stop_bus
 
 
 logger = get_logger("app")
@@ -17,8 +23,20 @@ description = """
     * Autenticación y seguridad
     """
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_bus()
+    yield
+    stop_bus()
+    # Recursos creados bajo demanda por los routers
+    shutdown_arrow_pool()
+    shutdown_job_pool()
+    shutdown_hash_pool()
+
+
 #print("MODELOS REGISTRADOS:", Base.metadata.tables.keys())
 app = FastAPI(
+    lifespan=lifespan,
     title="🚀 Volunteers system CRUD API",
     description= textwrap.dedent(description),
     version="1.0",
@@ -28,6 +46,7 @@ app = FastAPI(
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc
     openapi_url="/openapi.json",  # OpenAPI spec
+    default_response_class=ORJSONResponse,  # orjson en lugar del json de la librería estándar
     
     
 )
@@ -46,6 +65,10 @@ app.include_router(skill_routes.skill_router)
 app.include_router(assignment_routes.assignment_router)
 app.include_router(auth_routes.auth_router)
 app.include_router(export.router)
+app.include_router(import_routes.import_router)
+app.include_router(metrics_routes.metrics_router)
+app.include_router(batch_routes.batch_router)
+app.include_router(dashboard_routes.dashboard_router)
 
 
 logger.info("Start App")
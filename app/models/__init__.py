@@ -7,3 +7,4 @@ from app.models.assignment_model import Assignment
 from app.models.category_model import Category
 from app.models.project_skill_model import project_skills
 from app.models.role_model import Role
+from app.models.cache_invalidation_model import cache_invalidations
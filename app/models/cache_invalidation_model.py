@@ -0,0 +1,19 @@
+from sqlalchemy import Table, Column, BigInteger, Integer, String, Text, DateTime, Index
+from app.database.database import Base
+
+
+# Bus de invalidación entre workers: cada escritura publica una fila y los demás
+# procesos la leen por sondeo (id > último visto). Se escribe con Core, fuera de las
+# sesiones ORM, para que change_tracking no la cuente como tabla modificada.
+cache_invalidations = Table(
+    "cache_invalidations",
+    Base.metadata,
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("origin", String(32), nullable=False),        # proceso que publica (no se aplica a sí mismo)
+    Column("namespace", String(50), nullable=False),     # tables | cache | entity
+    Column("keys", Text, nullable=False),                # lista JSON; vacía = todo el espacio
+    Column("created_at", DateTime, nullable=False),
+
+    # Limpieza de eventos antiguos
+    Index("ix_cache_invalidations_created_at", "created_at"),
+)
@@ -1,6 +1,6 @@
 import enum
 from datetime import datetime
-from sqlalchemy import  Integer, String, DateTime, Text, ForeignKey, Enum
+from sqlalchemy import  Integer, String, DateTime, Text, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 
@@ -11,6 +11,14 @@ from app.models.project_skill_model import project_skills
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Búsqueda de texto (solo MySQL crea el índice FULLTEXT)
+        Index("ix_projects_name_description_ft", "name", "description", mysql_prefix="FULLTEXT"),
+        # Filtros del buscador: estado, prioridad y rango de deadline
+        Index("ix_projects_status_priority_deadline", "deleted_at", "status", "priority", "deadline"),
+        # Próximos vencimientos: estado + rango de deadline ya ordenado
+        Index("ix_projects_status_deadline", "deleted_at", "status", "deadline"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
@@ -25,3 +33,11 @@ class Project(Base):
 
     skills = relationship("Skill", secondary=project_skills, back_populates="projects")
 
+    # Solo lectura: skills activas (relación y skill sin soft-delete), para carga anticipada
+    active_skills = relationship(
+        "Skill",
+        secondary=project_skills,
+        primaryjoin="and_(Project.id == project_skills.c.project_id, project_skills.c.deleted_at.is_(None))",
+        secondaryjoin="and_(Skill.id == project_skills.c.skill_id, Skill.deleted_at.is_(None))",
+        viewonly=True,
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Table, Column, Integer, ForeignKey, DateTime
+from sqlalchemy import Table, Column, Integer, ForeignKey, DateTime, UniqueConstraint
 from app.database.database import Base
 
 
@@ -10,4 +10,6 @@ volunteer_skills = Table(
     Column("skill_id", ForeignKey("skills.id"), nullable=False),
     Column("deleted_at", DateTime, nullable=True),
 
+    # Restricción única para evitar duplicados (y permitir upsert)
+    UniqueConstraint('volunteer_id', 'skill_id', name='uq_volunteer_skill'),
 )
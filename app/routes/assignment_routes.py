@@ -9,11 +9,13 @@ from app.domain.assignment_enum import AssignmentStatus
 from app.database.database import get_db
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.utils.bulkheads import bulkhead_route
 
 
 assignment_router = APIRouter(
     prefix="/assignments",
-    tags=["Assignments"]
+    tags=["Assignments"],
+    route_class=bulkhead_route("default")
 )
 
 # Constantes para roles
@@ -6,10 +6,12 @@ from app.controllers import auth_controller
 from app.controllers.auth_controller import get_current_user
 from app.schemas import auth_schema, users_schema
 from app.models.users_model import User
+from app.utils.bulkheads import bulkhead_route
 
 auth_router = APIRouter(
     prefix="/auth",
-    tags=["Authentication"]
+    tags=["Authentication"],
+    route_class=bulkhead_route("auth")
 )
 
 
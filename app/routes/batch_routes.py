@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+
+from app.database.database import get_db, release_db
+from app.controllers.auth_controller import get_current_user
+from app.controllers.batch_controller import run_batch
+from app.models.users_model import User
+from app.schemas.batch_schema import BatchRequest, BatchResponse
+
+batch_router = APIRouter(
+    prefix="/batch",
+    tags=["Batch"]
+)
+
+
+# BATCH - Usuarios autenticados, con los permisos de cada endpoint
+@batch_router.post("", response_model=BatchResponse)
+async def batch(
+    batch_data: BatchRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Ejecuta varias lecturas (GET) en una sola petición y devuelve todas las respuestas
+    juntas. Pensado para las páginas que cargan varios listados a la vez.
+    
+    ## Permisos
+    - ✅ Admin y voluntario: cada sub-petición aplica los permisos de su endpoint
+      (un voluntario recibe 403 en las rutas de admin)
+    
+    ## Parámetros
+    - **requests**: lista de sub-peticiones (máximo `BATCH_MAX_REQUESTS`), cada una con:
+        - **id** (opcional): identificador de la respuesta (por defecto, su posición)
+        - **path**: ruta con query string (`/skills/?size=100`)
+        - **headers** (opcional): cabeceras extra, p. ej. `If-None-Match`
+    
+    No se admiten `/batch`, `/export` ni `/import`.
+    
+    El usuario se autentica una vez para todo el lote. Las sub-peticiones se ejecutan
+    a la vez dentro del proceso (sin red), cada una con su sesión de BD; las que tardan
+    más de `BATCH_TIMEOUT_SECONDS` se devuelven con estado 504.
+    
+    ## Respuesta
+    Objeto BatchResponse con `responses` (`id`, `status`, `headers` de caché, `body`
+    y `duration_ms` de cada sub-petición, en el mismo orden) y `duration_ms` del lote.
+    
+    ## 📝 Ejemplo de uso
+    `POST /batch`
+    ```json
+    {"requests": [
+        {"id": "skills", "path": "/skills/?size=100"},
+        {"id": "stats", "path": "/projects/stats"}
+    ]}
+    ```
+    """
+    # La sesión solo hacía falta para autenticar: su conexión y su plaza de admisión
+    # quedan libres para las sub-peticiones
+    release_db(db)
+    return ORJSONResponse(await run_batch(request, batch_data.requests, current_user))
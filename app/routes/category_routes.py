@@ -1,19 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from sqlalchemy.orm import Session
-from fastapi_pagination import Page
 from app.database.database import get_db
 from app.schemas.category_schemas import (
     CategoryCreate,
     CategoryOut
 )
+from app.schemas.page_schema import CursorPage, CountedPage
 from app.controllers.category_controller import *
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.utils.serialization import rows_page_response
+from app.utils.versions import versioned
+from app.utils.bulkheads import bulkhead_route
 
 
 router = APIRouter(
     prefix="/categories",
-    tags=["Categories"]
+    tags=["Categories"],
+    route_class=bulkhead_route("default")
 )
 
 # Constantes para roles
@@ -54,8 +59,9 @@ def create(
     return create_category(db, category)
 
 
-@router.get("/", response_model=Page[CategoryOut])
+@router.get("/", response_model=CountedPage[CategoryOut])
 def list_all(
+    cache_headers: dict = Depends(versioned("categories")),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -70,10 +76,55 @@ def list_all(
     ## Respuesta
     Lista paginada de objetos CategoryOut con información de cada categoría.
     
+    ## Caché HTTP
+    Respuesta con `ETag` y `Cache-Control: private`. Con `If-None-Match` igual al ETag
+    devuelve `304 Not Modified` sin cargar los datos ni el usuario; el ETag cambia al escribir
+    en la tabla desde cualquier worker (sin bus de invalidación es débil: dos ediciones en el
+    mismo segundo pueden compartirlo).
+    
     ## 📝 Ejemplo de uso
     `GET /categories/?page=1&size=10`
     """
-    return get_categories(db)
+    return rows_page_response(get_categories(db), CategoryOut, headers=cache_headers)
+
+
+@router.get("/cursor", response_model=CursorPage[CategoryOut])
+def list_all_cursor(
+    cache_headers: dict = Depends(versioned("categories")),
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=100),
+    include_total: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Variante de la lista paginada por cursor (keyset) en orden de ID.
+    No usa OFFSET ni cuenta la tabla en cada página: la página 10.000 cuesta lo
+    mismo que la primera. El listado con `page`/`size` sigue disponible en `/categories/`.
+    
+    ## Permisos
+    - ✅ Admin: puede ver todas las categorías
+    - ✅ Voluntario: puede ver todas las categorías
+    
+    ## Parámetros
+    - **cursor**: Valor `next_cursor` de la página anterior (vacío para la primera)
+    - **size**: Tamaño de página (1-100, default: 50)
+    - **include_total**: Añade el total de registros (`COUNT`); desactivado por defecto
+    
+    ## Respuesta
+    Objeto CursorPage con `items` (CategoryOut), `size`, `next_cursor` (`null` en la
+    última página) y `total` (solo con `include_total=true`).
+    
+    ## Caché HTTP
+    Respuesta con `ETag` y `Cache-Control: private`. Con `If-None-Match` igual al ETag
+    devuelve `304 Not Modified` sin cargar los datos ni el usuario; el ETag cambia al escribir
+    en la tabla desde cualquier worker (sin bus de invalidación es débil: dos ediciones en el
+    mismo segundo pueden compartirlo).
+    
+    ## 📝 Ejemplo de uso
+    `GET /categories/cursor?size=50&cursor=WzUwXQ`
+    """
+    return rows_page_response(get_categories_cursor(db, cursor, size, include_total), CategoryOut, headers=cache_headers)
 
 
 @router.get("/{id}", response_model=CategoryOut)
@@ -98,7 +149,7 @@ def get_one(
     ## 📝 Ejemplo de uso
     `GET /categories/5`
     """
-    return get_category(db, id)
+    return get_category_cached(db, id)
 
 
 @router.put("/{id}", response_model=CategoryOut)
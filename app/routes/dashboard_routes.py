@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.controllers.dashboard_controller import DashboardController
+from app.schemas import dashboard_schema
+from app.database.database import get_db
+from app.controllers.auth_controller import get_current_user, require_admin
+from app.controllers.volunteer_controller import get_volunteer_cached
+from app.models.users_model import User
+
+dashboard_router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"]
+)
+
+
+# ADMIN DASHBOARD - Solo admin
+@dashboard_router.get("/admin", response_model=dashboard_schema.AdminDashboardOut)
+async def admin_dashboard(
+    within_days: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    KPIs del panel de administración calculados con unas pocas agregaciones en la
+    base de datos, sin descargar los listados. El resultado se cachea unos segundos
+    (DASHBOARD_CACHE_TTL_SECONDS) y se invalida con cualquier escritura en las tablas
+    de las que sale. **Requiere permisos de administrador.**
+
+    ## Permisos
+    - ✅ Admin: puede ver el panel
+    - ❌ Voluntario: no tiene acceso
+
+    ## Parámetros
+    - **within_days**: Ventana en días para los próximos vencimientos (1-365, default: 7)
+
+    ## Respuesta
+    Objeto AdminDashboardOut con:
+    - **volunteers**: total, activos y conteo por estado
+    - **projects**: total, activos, vencidos, próximos vencimientos y conteo por estado
+    - **skills**: total y las skills más requeridas por los proyectos
+    - **assignments_by_status**: asignaciones por estado
+    - **recent_projects**: los últimos proyectos creados (solo datos de resumen)
+
+    ## 📝 Ejemplo de uso
+    `GET /dashboard/admin?within_days=14`
+    """
+    return await DashboardController.get_admin_summary(db, within_days)
+
+
+# MY DASHBOARD - Voluntario autenticado
+@dashboard_router.get("/me", response_model=dashboard_schema.VolunteerDashboardOut)
+async def my_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Resumen del voluntario asociado al usuario del token: sus skills, conteo de
+    asignaciones por estado, tasa de finalización, proyectos activos y actividad
+    reciente, en una sola llamada. Se cachea igual que el panel de administración.
+
+    ## Permisos
+    - ✅ Voluntario: ve su propio resumen
+    - ✅ Admin: solo si tiene perfil de voluntario
+
+    ## Respuesta
+    Objeto VolunteerDashboardOut con:
+    - **skills**: skills del voluntario y cuántas asignaciones tiene con cada una
+    - **assignments_by_status** y **total_assignments**
+    - **completion_rate**: completadas / (total - rechazadas)
+    - **active_projects**: proyectos no completados con asignaciones pendientes o aceptadas
+    - **recent_activity**: las últimas asignaciones modificadas
+
+    ## ⚠️ Errores posibles
+    - **404**: Not Found - El usuario no tiene perfil de voluntario
+
+    ## 📝 Ejemplo de uso
+    `GET /dashboard/me`
+    """
+    volunteer = get_volunteer_cached(db, current_user.id)
+    return await DashboardController.get_volunteer_summary(db, volunteer.id, volunteer.status.value)
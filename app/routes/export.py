@@ -1,31 +1,108 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import Response
+import os
+from fastapi import APIRouter, Depends, Query, Header, Response
+from typing import Optional
+from fastapi.responses import StreamingResponse, FileResponse
 from sqlalchemy.orm import Session
-from app.database.database import get_db
-from enum import Enum
-from app.models import *
+from app.database.database import get_db, release_db
 
-from app.utils.csv import generate_csv
+from app.controllers.export_controller import stream_export, stream_delta, EXPORT_FORMATS
+from app.controllers.export_jobs import (
+    create_export_job, get_export_job, get_export_job_file, export_version, open_cached_export, iter_file, spool_chunks
+)
+from app.utils.etag import make_etag, etag_matches
+from app.utils.singleflight import flight_group, retry_later
+from app.config.config_variables import settings
+from app.schemas.export_schema import SelectEnum, FormatEnum, ExportJobCreate, ExportJobOut
+from app.utils.bulkheads import bulkhead_route, get_bulkhead
 
 router = APIRouter(
     prefix="/export",
-    tags=["Export"]
+    tags=["Export"],
+    route_class=bulkhead_route("export")
 )
 
-class SelectEnum(str, Enum):
-    users = "users"
-    projects = "projects"
-    skills = "skills"
-    volunteers = "volunteers"
-    assignments = "assignments"
-    categories = "categories"
-    role = "role"
+# Exports iguales simultáneos: uno lee la tabla y los demás esperan su archivo del spool
+export_flights = flight_group("export", ttl=0)
+
+
+def _cached_response(f, media_type: str, headers: dict) -> StreamingResponse:
+    # Desde el archivo ya abierto: si se borra del spool mientras tanto, se envía igual
+    size = os.fstat(f.fileno()).st_size
+    return StreamingResponse(iter_file(f), media_type=media_type, headers={**headers, "Content-Length": str(size)})
+
+
+@router.post("/jobs", response_model=ExportJobOut, status_code=202)
+def create_job(job_data: ExportJobCreate, db: Session = Depends(get_db)):
+    """
+    ## Export en segundo plano
+
+    Encola el export en un pool de workers acotado y lo guarda en disco. La petición
+    responde al momento y no mantiene la conexión a la BD ni depende del cliente.
+
+    ### Parámetros (body)
+    - `select` (str): mismos valores que `/export/{select}`
+    - `format` (str): `csv` (por defecto), `parquet` o `arrow`
+
+    ### Respuesta
+    - **202** con el trabajo: `id`, `status` (`pending`, `running`, `done`, `failed`,
+      `expired`), `rows` y `bytes` escritos y `download_url` cuando termina.
+    - La misma petición sobre los mismos datos devuelve el mismo trabajo: si está en
+      curso no se lanza otro, y si ya terminó se reutiliza el archivo hasta que la
+      tabla cambie (altas, bajas o modificaciones).
+    - **503** si la cola de exports está llena.
+
+    ### 📝 Ejemplo de uso
+    ```bash
+    curl -X POST http://localhost:8000/export/jobs -H "Content-Type: application/json" \\
+         -d '{"select": "users", "format": "parquet"}'
+    ```
+    """
+    return create_export_job(db, job_data.select.value, job_data.format.value)
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobOut)
+def get_job(job_id: str):
+    """
+    ## Progreso de un export en segundo plano
+
+    Devuelve el estado, las filas y los bytes escritos hasta el momento.
+    **404** si el trabajo no existe.
+    """
+    return get_export_job(job_id)
+
+
+@router.get("/jobs/{job_id}/download")
+def download_job(job_id: str):
+    """
+    ## Descarga de un export terminado
+
+    Sirve el archivo generado con soporte de `Range`, así una descarga grande
+    puede reanudarse donde se cortó (`curl -C -`).
+
+    - **409** si el trabajo todavía no ha terminado o falló.
+    - **410** si el archivo se borró porque la tabla cambió: hay que lanzar otro export.
+
+    ### 📝 Ejemplo de uso
+    ```bash
+    curl -C - -o users.parquet http://localhost:8000/export/jobs/{job_id}/download
+    ```
+    """
+    job = get_export_job_file(job_id)
+    media_type, _ = EXPORT_FORMATS[job.format]
+    return FileResponse(job.path, media_type=media_type, filename=job.filename)
 
 
 @router.get("/{select}")
-def export_csv(select: SelectEnum, db: Session = Depends(get_db)):
+def export_csv(
+    select: SelectEnum,
+    format: FormatEnum = FormatEnum.csv,
+    parallel: bool = Query(False, description="Codificar Arrow/Parquet en un pool de procesos"),
+    since: Optional[str] = Query(None, description="Fecha ISO 8601 o cursor X-Next-Cursor de un export anterior"),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """
-    ## Exportación de datos a CSV por selección.
+    ## Exportación de datos a CSV, Parquet o Arrow por selección.
 
     Este endpoint permite descargar datos de diferentes entidades de la aplicación
     en formato CSV, listos para abrir en Excel o cualquier editor de hojas de cálculo.
@@ -43,56 +120,97 @@ def export_csv(select: SelectEnum, db: Session = Depends(get_db)):
     - `assignments` → Asignaciones
     - `categories` → Categorías
     - `role` → Roles de usuario
+    - `assignments_detailed` → Asignaciones con proyecto, categoría, skill y voluntario
+    - `volunteers_with_skills` → Voluntarios con sus datos de usuario y sus skills
+    - `projects_with_requirements` → Proyectos con categoría y skills requeridas
+
+    Las vistas (`*_detailed`, `*_with_*`) se resuelven en una sola consulta con JOIN
+    y agregan las skills en una columna de texto separada por comas.
+
+    **Parámetros de consulta:**
+    - `format` (str): `csv` (por defecto), `parquet` o `arrow` (Arrow IPC stream).
+      Parquet y Arrow conservan los tipos de cada columna (enteros, fechas, NULL)
+      y guardan los enums como columnas diccionario.
+    - `parallel` (bool): para tablas grandes, construye los lotes Arrow en un pool
+      de procesos (solo `parquet`/`arrow`).
+    - `since` (str): export incremental (solo tablas, no vistas). Acepta una fecha
+      ISO 8601 o el cursor opaco de la cabecera `X-Next-Cursor` del export anterior.
+      Devuelve solo las filas creadas, modificadas o borradas desde entonces, en orden
+      `(updated_at, id)`, con una columna extra `op`: `upsert` o `delete`. Las filas
+      borradas (soft delete) llegan como tombstones: solo `id` y marcas de tiempo.
 
     ### Ejemplo de llamada
     ```bash
     curl -X GET http://localhost:8000/export/users -o users.csv
+    curl -X GET "http://localhost:8000/export/projects?format=parquet" -o projects.parquet
+    curl -D - "http://localhost:8000/export/users?since=2026-01-01T00:00:00" -o users_delta.csv
+    curl -H 'If-None-Match: "<etag>"' -o users.csv -w "%{http_code}" http://localhost:8000/export/users
     ```
 
     ### Respuesta
     - Archivo CSV con encabezados automáticos
     - Cada fila corresponde a un registro de la tabla seleccionada
-    - Codificación UTF-8 con BOM para compatibilidad con Excel
-    - Nombre del archivo: `{select}.csv` (por ejemplo `users.csv`)
+    - CSV: codificación UTF-8 con BOM para compatibilidad con Excel
+    - Nombre del archivo: `{select}.{extensión}` (por ejemplo `users.csv`, `users.parquet`, `users.arrows`)
+    - Se envía por trozos a medida que se lee la tabla: la memoria usada no crece
+      con la tabla (un lote de `EXPORT_BATCH_SIZE` filas más un trozo) y el primer
+      byte llega sin esperar a recorrer toda la tabla
+    - Cabecera `ETag` débil (`W/"..."`) calculada con una firma barata de las tablas
+      (número de filas, id máximo, `updated_at` máximo y borradas). Con `If-None-Match`
+      y los datos sin cambios responde **304 Not Modified** sin cuerpo. `updated_at`
+      tiene resolución de segundos: dos ediciones en el mismo segundo que no cambian
+      el número de filas se ven a partir de la siguiente modificación.
+    - El último export de cada tabla y formato se guarda en disco: mientras la tabla
+      no cambie, se sirve el archivo sin volver a leerla (una sola consulta agregada).
+    - Si llega el mismo export mientras otro se está generando, espera a que termine
+      y recibe el archivo guardado en lugar de leer otra vez la tabla. Si no termina
+      en `SINGLEFLIGHT_WAIT_SECONDS` (o no llega a guardarse), **503** con `Retry-After`.
 
     ### Notas
     - Si la categoría no existe, devuelve un **404 Not Found**.
-    - Si no hay registros, devuelve un **404 Data export not found**.
+    - Si no hay registros, devuelve un **404 Data export not found** (con `since`,
+      un export vacío con encabezados y el cursor siguiente).
     """
     
-    selects = {
-        "users": User,
-        "projects": Project,
-        "skills": Skill,
-        "volunteers": Volunteer,
-        "assignments": Assignment,
-        "categories": Category,
-        "role": Role
-    }
-    
-    if select not in selects:
-        return Response(status_code=404, detail="Select not found")
+    media_type, extension = EXPORT_FORMATS[format.value]
+    headers = {"Content-Disposition": f"attachment; filename={select.value}.{extension}"}
     
-    model = selects[select]
-    
-    results = db.query(model).all()
-    print("RESULTADOS:", results)
-    print("TOTAL:", len(results))
-
+    if since is not None:
+        chunks, next_cursor = stream_delta(db, select.value, format.value, since)
+        headers["X-Next-Cursor"] = next_cursor
+        return StreamingResponse(get_bulkhead("export").iterate(chunks), media_type=media_type, headers=headers)
     
-    if not results:
-        return Response(status_code=404, detail="Data export not found")
+    # ETag débil: la firma de las tablas tiene resolución de un segundo y, con parallel,
+    # los lotes Arrow se parten distinto (mismas filas y orden, no los mismos bytes).
+    # Por eso parallel tampoco entra en la versión: cualquiera de los dos archivos vale
+    version = export_version(db, select.value, format.value)
+    headers["ETag"] = make_etag(version, weak=True)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers={"ETag": headers["ETag"]})
     
-    rows =[
-        {col.name: getattr(obj, col.name) for col in model.__table__.columns}
-        for obj in results
-    ]
+    cached = open_cached_export(select.value, format.value, version)
+    if cached is not None:
+        return _cached_response(cached, media_type, headers)
     
-    csv_data = generate_csv(rows)
+    key = (select.value, format.value, version)
+    flight, leader = export_flights.begin(key)
+    if not leader:
+        release_db(db)  # la conexión y la plaza de admisión se liberan mientras espera
+        try:
+            flight.wait(settings.SINGLEFLIGHT_WAIT_SECONDS)
+        except TimeoutError:
+            export_flights.abandon(key, flight)
+        cached = open_cached_export(select.value, format.value, version)
+        if cached is not None:
+            return _cached_response(cached, media_type, headers)
+        # Tarda demasiado o el primero no completó el archivo (cliente cortado). Sin sesión
+        # ni plaza de admisión no se genera aquí: al reintentar será el primero
+        raise retry_later()
     
-    return Response(content="\ufeff" + csv_data,
-                    media_type="text/csv",
-                    headers={
-                        "Content-Disposition": f"attachment; filename={select}.csv"
-                        }
-                    )
\ No newline at end of file
+    chunks = stream_export(db, select.value, format.value, parallel)
+    on_done = lambda: export_flights.finish(key, flight)
+    return StreamingResponse(
+        # Los lotes se leen y codifican en los hilos de "export", no en el threadpool compartido
+        get_bulkhead("export").iterate(spool_chunks(chunks, select.value, format.value, version, on_done)),
+        media_type=media_type, headers=headers
+    )
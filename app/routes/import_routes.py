@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database.database import get_db
+from app.config.config_variables import settings
+from app.controllers.auth_controller import require_admin
+from app.controllers.import_controller import import_file
+from app.schemas.import_schema import ImportEntity, ImportFormat, ImportReport
+from app.models.users_model import User
+from app.utils.bulkheads import bulkhead_route
+
+# Cargas masivas: mismo compartimento que los exports, fuera del tráfico interactivo
+import_router = APIRouter(prefix="/import", tags=["Import"], route_class=bulkhead_route("export"))
+
+
+# IMPORT - Solo admin puede hacer cargas masivas
+@import_router.post("/{entity}", response_model=ImportReport)
+def import_entity(
+    entity: ImportEntity,
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(None, description="csv o jsonl (por defecto, según la extensión del archivo)"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=50_000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Carga masiva de usuarios, voluntarios, proyectos o skills desde un archivo CSV
+    (con cabecera) o JSON Lines (un objeto por línea).
+    **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede importar
+    - ❌ Voluntario: sin acceso
+    
+    ## Parámetros
+    - **entity**: `users`, `volunteers`, `projects` o `skills`
+    - **file**: archivo `.csv` o `.jsonl`; los campos son los mismos que en el POST de cada entidad
+    - **format** (opcional): fuerza `csv` o `jsonl`
+    - **batch_size** (opcional): filas por lote (por defecto `IMPORT_BATCH_SIZE`)
+    
+    El archivo se procesa por lotes: validación con pydantic de todo el lote,
+    duplicados detectados con una consulta por lote (y dentro del propio archivo),
+    contraseñas hasheadas en paralelo e inserción con un solo `executemany` por lote.
+    
+    ## Respuesta
+    Informe con `total`, `inserted`, `failed` y la lista de errores por fila
+    (`line`, `field`, `error`). Las filas con error no detienen la importación.
+    
+    ## 📝 Ejemplo de uso
+    ```bash
+    curl -X POST "http://localhost:8000/import/users" \\
+         -H "Authorization: Bearer <token>" \\
+         -F "file=@partners.csv"
+    ```
+    ```json
+    {"entity": "users", "total": 3, "inserted": 2, "failed": 1,
+     "errors": [{"line": 3, "field": "email", "error": "User already exists"}]}
+    ```
+    """
+    fmt = format.value if format else ("jsonl" if (file.filename or "").endswith((".jsonl", ".ndjson")) else "csv")
+    return import_file(db, entity.value, file.file, fmt, batch_size)
@@ -0,0 +1,117 @@
+from fastapi import APIRouter, Depends
+
+from app.controllers.auth_controller import require_admin
+from app.models.users_model import User
+from app.database.database import admission
+from app.schemas.metrics_schema import AdmissionStatsOut, BulkheadStatsOut, CacheStatsOut, SingleFlightStatsOut
+from app.utils.bulkheads import bulkheads
+from app.utils.entity_cache import get_entity_cache
+from app.utils.singleflight import flight_groups
+from app.utils.bulkheads import bulkhead_route
+
+metrics_router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"],
+    route_class=bulkhead_route("default")
+)
+
+
+# CACHE STATS - Solo admin
+@metrics_router.get("/cache", response_model=CacheStatsOut)
+def cache_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Estado de la caché de lecturas por id (skills, categorías, roles, usuarios,
+    proyectos y voluntarios) del worker que atiende la petición.
+    **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede ver las métricas
+    - ❌ Voluntario: no tiene acceso
+    
+    ## Respuesta
+    Objeto CacheStatsOut con backend, aciertos, fallos, ratio de aciertos, desalojos,
+    invalidaciones, entradas y bytes ocupados. Con `ENTITY_CACHE_BACKEND=sqlite` las
+    entradas y bytes son los del almacén compartido; los contadores son de este worker.
+    
+    ## 📝 Ejemplo de uso
+    `GET /metrics/cache`
+    """
+    cache = get_entity_cache()
+    if cache is None:
+        return CacheStatsOut(enabled=False)
+    return CacheStatsOut(enabled=True, entity_cache=cache.stats())
+
+
+# COALESCING STATS - Solo admin
+@metrics_router.get("/coalescing", response_model=list[SingleFlightStatsOut])
+def coalescing_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Coalescencia de peticiones idénticas simultáneas por endpoint (matching, listados
+    de usuarios y voluntarios, export) en el worker que atiende la petición.
+    **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede ver las métricas
+    - ❌ Voluntario: no tiene acceso
+    
+    ## Respuesta
+    Lista de SingleFlightStatsOut: peticiones, consultas ejecutadas, peticiones que
+    esperaron a otra igual, servidas desde el resultado guardado, en curso y
+    `coalescing_ratio` (fracción de peticiones que no lanzaron su propia consulta).
+    
+    ## 📝 Ejemplo de uso
+    `GET /metrics/coalescing`
+    """
+    return [group.stats() for group in flight_groups()]
+
+
+# ADMISSION STATS - Solo admin
+@metrics_router.get("/admission", response_model=AdmissionStatsOut)
+def admission_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Estado del control de admisión de sesiones de BD del worker que atiende la petición.
+    **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede ver las métricas
+    - ❌ Voluntario: no tiene acceso
+    
+    ## Respuesta
+    Objeto AdmissionStatsOut con el límite adaptativo actual y el máximo (tamaño del pool),
+    sesiones en uso, peticiones en cola, admitidas, rechazadas con 503 (cola llena o espera
+    agotada) y medias móviles de la latencia por sentencia y del tiempo de sesión.
+    
+    ## 📝 Ejemplo de uso
+    `GET /metrics/admission`
+    """
+    return admission.stats()
+
+
+# BULKHEAD STATS - Solo admin
+@metrics_router.get("/bulkheads", response_model=list[BulkheadStatsOut])
+def bulkhead_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Uso de los compartimentos de hilos (export, auth, matching, default) del worker
+    que atiende la petición. **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede ver las métricas
+    - ❌ Voluntario: no tiene acceso
+    
+    ## Respuesta
+    Lista de BulkheadStatsOut: cupo de hilos y de cola, hilos ocupados, peticiones en
+    cola, completadas, rechazadas con 503, tiempo medio y máximo en cola, utilización
+    actual y fracción del tiempo ocupada desde el arranque.
+    
+    ## 📝 Ejemplo de uso
+    `GET /metrics/bulkheads`
+    """
+    return [compartment.stats() for compartment in bulkheads()]
@@ -1,23 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_pagination import Page
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 from app.controllers.project_controller import ProjectController
 from app.schemas import project_schema
+from app.schemas.skills_schema import SkillSetUpdate
+from app.schemas.page_schema import CursorPage, CountedPage
 from app.database.database import get_db
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.domain.projects_enums import Project_status, Project_priority
+from app.utils.fieldsets import parse_fields, sparse_response
+from app.utils.singleflight import coalesced, flight_group
+from app.utils.bulkheads import bulkhead, bulkhead_route
 
 project_router = APIRouter(
     prefix="/projects",
-    tags=["Projects"]
+    tags=["Projects"],
+    route_class=bulkhead_route("default")
 )
 
 # Constantes para roles
 ROLE_ADMIN = 1
 ROLE_VOLUNTEER = 2
 
+# Varios admins abriendo el matching del mismo proyecto comparten una consulta
+matching_flights = flight_group("matching")
+
+
+def _normalize_status(status: Optional[List[Project_status]]) -> tuple:
+    # Mismo conjunto de estados -> misma clave de caché, sin importar orden o repeticiones
+    return tuple(sorted(set(status or ()), key=lambda s: s.value))
+
 
 # CREATE PROJECT - Solo admin puede crear proyectos
 @project_router.post("/", response_model=project_schema.ProjectOut)
@@ -55,8 +70,10 @@ async def new_project(
 
 
 # READ ALL PROJECTS - Todos pueden ver la lista de proyectos
-@project_router.get("/", response_model=Page[project_schema.ProjectOut])
+@project_router.get("/", response_model=CountedPage[project_schema.ProjectWithRelationsOut])
 async def read_all_projects(
+    include: Optional[str] = Query(None, description="Relaciones a incluir: skills,category"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -68,19 +85,201 @@ async def read_all_projects(
     - ✅ Admin: puede ver todos los proyectos
     - ✅ Voluntario: puede ver todos los proyectos disponibles
     
+    ## Parámetros
+    - **include**: Relaciones a cargar de forma anticipada, separadas por comas (`skills`, `category`).
+      Con `include` el coste es fijo (máximo 3 consultas por página) sin importar el tamaño de página.
+    - **fields**: Campos a devolver separados por comas (`id,name,status,deadline`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos.
+      Las relaciones (`category`, `skills`) se cargan si están entre los campos pedidos
+    
+    ## Respuesta
+    Lista paginada de objetos ProjectWithRelationsOut con información detallada de cada proyecto.
+    El campo `skills` solo se rellena con `include=skills`.
+
+    ## 📝 Ejemplo de uso
+    `GET /projects/?page=1&size=10&include=skills,category`
+    `GET /projects/?page=1&size=50&fields=id,name,status,deadline`
+    """
+    fields = parse_fields(fields, project_schema.ProjectWithRelationsOut)
+    page = await ProjectController.get_projects(db, include=ProjectController.parse_include(include), fields=fields)
+    return sparse_response(page) if fields else page
+
+
+# READ PROJECTS BY CURSOR - Todos pueden ver la lista de proyectos
+@project_router.get("/cursor", response_model=CursorPage[project_schema.ProjectWithRelationsOut])
+async def read_projects_cursor(
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=100),
+    include_total: bool = False,
+    include: Optional[str] = Query(None, description="Relaciones a incluir: skills,category"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Variante de la lista paginada por cursor (keyset) en orden de ID.
+    No usa OFFSET ni cuenta la tabla en cada página: la página 10.000 cuesta lo
+    mismo que la primera. El listado con `page`/`size` sigue disponible en `/projects/`.
+    
+    ## Permisos
+    - ✅ Admin: puede ver todos los proyectos
+    - ✅ Voluntario: puede ver todos los proyectos disponibles
+    
+    ## Parámetros
+    - **cursor**: Valor `next_cursor` de la página anterior (vacío para la primera)
+    - **size**: Tamaño de página (1-100, default: 50)
+    - **include_total**: Añade el total de registros (`COUNT`); desactivado por defecto
+    - **include**: Relaciones a cargar de forma anticipada (`skills`, `category`)
+    - **fields**: Campos a devolver separados por comas (`id,name,status,deadline`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos.
+      Las relaciones (`category`, `skills`) se cargan si están entre los campos pedidos
+    
+    ## Respuesta
+    Objeto CursorPage con `items` (ProjectWithRelationsOut), `size`, `next_cursor` (`null` en la
+    última página) y `total` (solo con `include_total=true`).
+    
+    ## 📝 Ejemplo de uso
+    `GET /projects/cursor?size=50&cursor=WzUwXQ`
+    """
+    fields = parse_fields(fields, project_schema.ProjectWithRelationsOut)
+    page = await ProjectController.get_projects_cursor(
+        db, cursor, size, include_total, include=ProjectController.parse_include(include), fields=fields
+    )
+    return sparse_response(page) if fields else page
+
+
+# SEARCH PROJECTS - Todos pueden buscar proyectos
+@project_router.get("/search", response_model=project_schema.ProjectSearchPage)
+async def search_projects(
+    q: Optional[str] = Query(None, max_length=200),
+    status: Optional[Project_status] = None,
+    priority: Optional[Project_priority] = None,
+    category_id: Optional[int] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Busca proyectos por texto en nombre y descripción, combinando filtros indexados.
+    Los resultados se ordenan por relevancia y se paginan por cursor.
+    
+    ## Permisos
+    - ✅ Admin: puede buscar en todos los proyectos
+    - ✅ Voluntario: puede buscar en todos los proyectos
+    
+    ## Parámetros
+    - **q**: Texto a buscar (opcional; sin texto se ordena por ID descendente)
+    - **status**, **priority**, **category_id**: Filtros exactos (opcionales)
+    - **deadline_from**, **deadline_to**: Rango de fecha límite (opcionales)
+    - **cursor**: Valor `next_cursor` de la página anterior
+    - **size**: Tamaño de página (1-100, default: 20)
+    
+    ## Respuesta
+    Objeto ProjectSearchPage con los proyectos, su puntuación y el cursor de la siguiente página.
+    
+    ## 📝 Ejemplo de uso
+    `GET /projects/search?q=website&status=not assigned&size=10`
+    """
+    return await ProjectController.search_projects(
+        db, q=q, status=status, priority=priority, category_id=category_id,
+        deadline_from=deadline_from, deadline_to=deadline_to, cursor=cursor, size=size
+    )
+
+
+# UPCOMING PROJECTS - Todos pueden ver los próximos vencimientos
+@project_router.get("/upcoming", response_model=CountedPage[project_schema.ProjectOut])
+async def upcoming_projects(
+    within_days: int = Query(7, ge=1, le=365),
+    status: Optional[List[Project_status]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Lista los proyectos cuya fecha límite vence en los próximos días.
+    Ordenados por fecha límite y, a igual fecha, por prioridad (alta primero).
+    
+    ## Permisos
+    - ✅ Admin: puede ver todos los proyectos
+    - ✅ Voluntario: puede ver todos los proyectos
+    
+    ## Parámetros
+    - **within_days**: Ventana en días a partir de ahora (1-365, default: 7)
+    - **status**: Estados a incluir; se puede repetir (opcional, default: todos)
+    
     ## Respuesta
-    Lista paginada de objetos ProjectOut con información detallada de cada proyecto.
+    Lista paginada de objetos ProjectOut.
+    
+    ## 📝 Ejemplo de uso
+    `GET /projects/upcoming?within_days=14&status=assigned&status=not assigned`
+    """
+    return await ProjectController.get_upcoming_projects(db, within_days, _normalize_status(status))
+
 
+# UPCOMING PROJECTS COUNT - Contador cacheado para tarjetas KPI
+@project_router.get("/upcoming/count", response_model=project_schema.ProjectCountOut)
+async def upcoming_projects_count(
+    within_days: int = Query(7, ge=1, le=365),
+    status: Optional[List[Project_status]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Cuenta los proyectos que vencen en los próximos días sin transferir la lista.
+    El resultado se cachea unos segundos y se invalida al crear, editar o borrar proyectos.
+    
+    ## Permisos
+    - ✅ Admin: puede consultar el contador
+    - ✅ Voluntario: puede consultar el contador
+    
+    ## Parámetros
+    - **within_days**: Ventana en días a partir de ahora (1-365, default: 7)
+    - **status**: Estados a incluir; se puede repetir (opcional, default: todos)
+    
+    ## Respuesta
+    Objeto ProjectCountOut con el número de proyectos y la ventana usada.
+    
     ## 📝 Ejemplo de uso
-    `GET /projects/?page=1&size=10`
+    `GET /projects/upcoming/count?within_days=7&status=assigned`
     """
-    return await ProjectController.get_projects(db)
+    return await ProjectController.count_upcoming_projects(db, within_days, _normalize_status(status))
+
+
+# PROJECT STATS - Todos pueden ver las estadísticas agregadas
+@project_router.get("/stats", response_model=project_schema.ProjectStatsOut)
+async def project_stats(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Estadísticas agregadas de los proyectos calculadas en la base de datos.
+    El resultado se cachea unos segundos y se invalida con cada escritura de proyectos.
+    
+    ## Permisos
+    - ✅ Admin: puede ver las estadísticas
+    - ✅ Voluntario: puede ver las estadísticas
+    
+    ## Respuesta
+    Objeto ProjectStatsOut con:
+    - **total** y **overdue** (fecha límite pasada y sin completar)
+    - **by_status**, **by_priority**: conteos por estado y prioridad
+    - **by_category**: conteo por categoría, de mayor a menor
+    - **skill_coverage**: proporción de skills requeridas que tiene algún voluntario activo
+    
+    ## 📝 Ejemplo de uso
+    `GET /projects/stats`
+    """
+    return await ProjectController.get_project_stats(db)
 
 
 # READ PROJECT - Todos pueden ver un proyecto específico
-@project_router.get("/{project_id}", response_model=project_schema.ProjectOut)
+@project_router.get("/{project_id}", response_model=project_schema.ProjectWithRelationsOut)
 async def read_project(
     project_id: int,
+    include: Optional[str] = Query(None, description="Relaciones a incluir: skills,category"),
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -94,14 +293,22 @@ async def read_project(
     
     ## Parámetros
     - **project_id**: Identificador único del proyecto (requerido)
+    - **include**: Relaciones a cargar de forma anticipada (`skills`, `category`)
+    - **fields**: Campos a devolver separados por comas (`name,description,category`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos.
+      Las relaciones (`category`, `skills`) se cargan si están entre los campos pedidos
     
     ## Respuesta
-    Objeto ProjectOut con información completa del proyecto.
+    Objeto ProjectWithRelationsOut con información completa del proyecto.
     
     ## 📝 Ejemplo de uso
-    `GET /projects/42`
+    `GET /projects/42?include=skills`
     """
-    return await ProjectController.get_project(db, project_id=project_id)
+    fields = parse_fields(fields, project_schema.ProjectWithRelationsOut)
+    project = await ProjectController.get_project(
+        db, project_id=project_id, include=ProjectController.parse_include(include), fields=fields
+    )
+    return sparse_response(project) if fields else project
 
 
 # UPDATE PROJECT - Solo admin puede actualizar proyectos
@@ -197,6 +404,37 @@ async def get_skills(
     return await ProjectController.get_project_with_skills(db, id)
 
 
+# REPLACE PROJECT SKILLS - Solo admin puede redefinir los requisitos
+@project_router.put("/{id}/skills", response_model=project_schema.ProjectWithRelationsOut)
+async def replace_skills(
+    id: int,
+    data: SkillSetUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Reemplaza el conjunto completo de habilidades requeridas por el proyecto.
+    Las nuevas se insertan, las eliminadas previamente se reactivan y
+    las que no aparecen en la lista se eliminan, en una sola transacción.
+    **Requiere permisos de administrador.**
+    
+    ## Permisos
+    - ✅ Admin: puede redefinir habilidades de proyectos
+    - ❌ Voluntario: no puede modificar habilidades de proyectos
+    
+    ## Parámetros
+    - **id**: ID del proyecto a modificar
+    - **skill_ids**: Lista completa de IDs de habilidades requeridas (puede estar vacía)
+    
+    ## Respuesta
+    Objeto ProjectWithRelationsOut con las habilidades resultantes.
+    
+    ## 📝 Ejemplo de uso
+    `PUT /projects/42/skills` con `{"skill_ids": [1, 7, 9]}`
+    """
+    return await ProjectController.set_project_skills(db, id, data.skill_ids)
+
+
 # ADD SKILL TO PROJECT - Solo admin puede agregar habilidades
 @project_router.post("/{id}/skills/{skill_id}", response_model=project_schema.ProjectSkillsOut)
 async def add_skill(
@@ -286,10 +524,12 @@ async def remove_all_skills(
 
 # MATCHING VOLUNTEERS - Todos pueden ver matching
 @project_router.get("/{project_id}/matching-volunteers", status_code=200)
+@bulkhead("matching")
 def get_matching_volunteers(
     project_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    flight = Depends(coalesced(matching_flights))
 ):
     """
     Devuelve los voluntarios que tienen match con las skills del proyecto.
@@ -310,7 +550,10 @@ def get_matching_volunteers(
         - **id**: ID de la Skill
         - **name**: Nombre de la Skill
     
+    Las peticiones iguales que llegan mientras otra está en curso esperan a esa
+    y reciben el mismo resultado (una sola consulta).
+    
     ## 📝 Ejemplo de uso
     `GET /projects/1/matching-volunteers`
     """
-    return ProjectController.get_matching_volunteers(db, project_id)
\ No newline at end of file
+    return flight(lambda: ProjectController.get_matching_volunteers(db, project_id))
\ No newline at end of file
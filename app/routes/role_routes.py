@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from fastapi import status
 from sqlalchemy.orm import Session
 
@@ -7,15 +7,20 @@ from app.controllers.role_controller import RoleController
 from app.schemas import role_schema
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.utils.versions import versioned
+from app.utils.bulkheads import bulkhead_route
 
 role_router = APIRouter(
     prefix="/roles",
-    tags=["Roles"]
+    tags=["Roles"],
+    route_class=bulkhead_route("default")
 )
 
 # GET ALL - Solo administradores pueden ver roles
 @role_router.get("/", response_model=list[role_schema.RoleOut])
 def read_roles(
+    response: Response,
+    cache_headers: dict = Depends(versioned("role", admin_only=True)),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin)
 ):
@@ -29,6 +34,12 @@ def read_roles(
     ## Respuesta
     Lista de objetos RoleOut con información de cada rol.
     
+    ## Caché HTTP
+    Respuesta con `ETag` y `Cache-Control: private`. Con `If-None-Match` igual al ETag
+    devuelve `304 Not Modified` sin cargar los datos ni el usuario; el ETag cambia al escribir
+    en la tabla desde cualquier worker (sin bus de invalidación es débil: dos ediciones en el
+    mismo segundo pueden compartirlo).
+    
     ## 📝 Ejemplo de uso
     ```bash
     GET /roles/
@@ -39,6 +50,7 @@ def read_roles(
     - **401 Unauthorized**: Token inválido o expirado
     - **403 Forbidden**: Usuario no es administrador
     """
+    response.headers.update(cache_headers)
     return RoleController.get_roles(db)
 
 
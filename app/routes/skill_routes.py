@@ -1,18 +1,23 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
 from sqlalchemy.orm import Session
-from fastapi_pagination import Page
 
 from app.database.database import get_db
-from app.controllers.skill_controller import get_skills, get_skill, create_skill, update_skill, delete_skill
+from app.controllers.skill_controller import get_skills, get_skills_cursor, get_skill_cached, create_skill, update_skill, delete_skill
 from app.schemas.skills_schema import SkillCreate, SkillUpdate, SkillOut
+from app.schemas.page_schema import CursorPage, CountedPage
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.utils.serialization import rows_page_response
+from app.utils.versions import versioned
+from app.utils.bulkheads import bulkhead_route
 
-skill_router = APIRouter(prefix="/skills", tags=["Skills"])
+skill_router = APIRouter(prefix="/skills", tags=["Skills"], route_class=bulkhead_route("default"))
 
 # GET ALL - Usuarios autenticados pueden ver habilidades
-@skill_router.get("/", response_model=Page[SkillOut])
+@skill_router.get("/", response_model=CountedPage[SkillOut])
 def read_skills(
+    cache_headers: dict = Depends(versioned("skills")),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -26,6 +31,12 @@ def read_skills(
     ## Respuesta
     Lista de objetos SkillOut con información de cada habilidad.
     
+    ## Caché HTTP
+    Respuesta con `ETag` y `Cache-Control: private`. Con `If-None-Match` igual al ETag
+    devuelve `304 Not Modified` sin cargar los datos ni el usuario; el ETag cambia al escribir
+    en la tabla desde cualquier worker (sin bus de invalidación es débil: dos ediciones en el
+    mismo segundo pueden compartirlo).
+    
     ## 📝 Ejemplo de uso
     ```bash
     GET /skills/?page=1&size=10
@@ -35,7 +46,46 @@ def read_skills(
     ## ⚠️ Errores posibles
     - **401 Unauthorized**: Token inválido o expirado
     """
-    return get_skills(db)
+    return rows_page_response(get_skills(db), SkillOut, headers=cache_headers)
+
+
+# GET ALL BY CURSOR - Usuarios autenticados, paginación por cursor
+@skill_router.get("/cursor", response_model=CursorPage[SkillOut])
+def read_skills_cursor(
+    cache_headers: dict = Depends(versioned("skills")),
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=100),
+    include_total: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Variante de la lista paginada por cursor (keyset) en orden de ID.
+    No usa OFFSET ni cuenta la tabla en cada página: la página 10.000 cuesta lo
+    mismo que la primera. El listado con `page`/`size` sigue disponible en `/skills/`.
+    
+    ## Permisos
+    - ✅ Usuario autenticado (cualquier rol)
+    
+    ## Parámetros
+    - **cursor**: Valor `next_cursor` de la página anterior (vacío para la primera)
+    - **size**: Tamaño de página (1-100, default: 50)
+    - **include_total**: Añade el total de registros (`COUNT`); desactivado por defecto
+    
+    ## Respuesta
+    Objeto CursorPage con `items` (SkillOut), `size`, `next_cursor` (`null` en la
+    última página) y `total` (solo con `include_total=true`).
+    
+    ## Caché HTTP
+    Respuesta con `ETag` y `Cache-Control: private`. Con `If-None-Match` igual al ETag
+    devuelve `304 Not Modified` sin cargar los datos ni el usuario; el ETag cambia al escribir
+    en la tabla desde cualquier worker (sin bus de invalidación es débil: dos ediciones en el
+    mismo segundo pueden compartirlo).
+    
+    ## 📝 Ejemplo de uso
+    `GET /skills/cursor?size=50&cursor=WzUwXQ`
+    """
+    return rows_page_response(get_skills_cursor(db, cursor, size, include_total), SkillOut, headers=cache_headers)
 
 
 # GET BY ID - Usuarios autenticados pueden ver detalle de habilidades
@@ -71,7 +121,7 @@ def read_skill(
     Authorization: Bearer <token>
     ```
     """
-    return get_skill(db, id)
+    return get_skill_cached(db, id)
 
 
 # POST - Solo administradores pueden crear habilidades
@@ -1,28 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from sqlalchemy.orm import Session
-from fastapi_pagination import Page
 
 from app.database.database import get_db
 from app.controllers.users_controller import UserController
 from app.controllers.auth_controller import get_current_user, require_admin, require_owner_or_admin
 from app.schemas import users_schema
+from app.schemas.page_schema import CursorPage, CountedPage
 from app.models.users_model import User
+from app.utils.fieldsets import parse_fields, sparse_response
+from app.utils.serialization import rows_page_response
+from app.utils.singleflight import coalesced, flight_group
+from app.utils.bulkheads import bulkhead_route
 
 user_router = APIRouter(
     prefix="/users",
-    tags=["Users"]
+    tags=["Users"],
+    route_class=bulkhead_route("default")
 )
 
 # Constantes para roles
 ROLE_ADMIN = 1
 ROLE_VOLUNTEER = 2
 
+# Listados idénticos simultáneos (misma página y campos) comparten una consulta
+list_flights = flight_group("users")
+
+
+def _users_response(page, fields):
+    return sparse_response(page) if fields else rows_page_response(page, users_schema.UserOut)
+
 
 # GET ALL USERS - Solo admin puede ver todos los usuarios
-@user_router.get("/", response_model=Page[users_schema.UserOut])
+@user_router.get("/", response_model=CountedPage[users_schema.UserOut])
 def read_users(
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: User = Depends(require_admin),
+    flight = Depends(coalesced(list_flights))
 ):
     """
     Recupera una lista paginada de todos los usuarios activos del sistema.
@@ -35,20 +50,62 @@ def read_users(
     ## Parámetros
     - **page**: Número de página (default: 1)
     - **size**: Tamaño de página (default: 50)
+    - **fields**: Campos a devolver separados por comas (`id,name,email`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos
     
     ## Respuesta
     Lista paginada de objetos UserOut con información completa de usuarios.
     
     ## 📝 Ejemplo de uso
-    `GET /users/?page=1&size=10`
+    `GET /users/?page=1&size=10&fields=id,name,email`
+    """
+    fields = parse_fields(fields, users_schema.UserOut)
+    return flight(lambda: _users_response(UserController.get_users(db, fields), fields))
+
+
+# GET USERS BY CURSOR - Solo admin, paginación por cursor
+@user_router.get("/cursor", response_model=CursorPage[users_schema.UserOut])
+def read_users_cursor(
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=100),
+    include_total: bool = False,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+    flight = Depends(coalesced(list_flights))
+):
+    """
+    Variante de la lista paginada por cursor (keyset) en orden de ID.
+    No usa OFFSET ni cuenta la tabla en cada página: la página 10.000 cuesta lo
+    mismo que la primera. El listado con `page`/`size` sigue disponible en `/users/`.
+    
+    ## Permisos
+    - ✅ Admin: puede ver todos los usuarios
+    - ❌ Voluntario: no tiene acceso
+    
+    ## Parámetros
+    - **cursor**: Valor `next_cursor` de la página anterior (vacío para la primera)
+    - **size**: Tamaño de página (1-100, default: 50)
+    - **include_total**: Añade el total de registros (`COUNT`); desactivado por defecto
+    - **fields**: Campos a devolver separados por comas (`id,name,email`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos
+    
+    ## Respuesta
+    Objeto CursorPage con `items` (UserOut), `size`, `next_cursor` (`null` en la
+    última página) y `total` (solo con `include_total=true`).
+    
+    ## 📝 Ejemplo de uso
+    `GET /users/cursor?size=50&cursor=WzUwXQ`
     """
-    return UserController.get_users(db)
+    fields = parse_fields(fields, users_schema.UserOut)
+    return flight(lambda: _users_response(UserController.get_users_cursor(db, cursor, size, include_total, fields), fields))
 
 
 # GET USER BY ID - Usuario puede ver su propio perfil, admin puede ver cualquiera
-@user_router.get("/{user_id}", response_model=users_schema.UserOut)
+@user_router.get("/{user_id}", response_model=users_schema.UserPublicOut)
 def read_user(
     user_id: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -61,9 +118,11 @@ def read_user(
     
     ## Parámetros
     - **user_id**: Identificador único del usuario (requerido)
+    - **fields**: Campos a devolver separados por comas (`name,email,phone`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos
     
     ## Respuesta
-    Objeto UserOut con información completa del usuario solicitado.
+    Objeto UserPublicOut con la información del usuario solicitado (sin la contraseña).
     
     ## 📝 Ejemplo de uso
     `GET /users/42`
@@ -75,7 +134,9 @@ def read_user(
             detail="Access Denied: You can only view your own profile"
         )
     
-    return UserController.get_one_user(db, user_id=user_id)
+    fields = parse_fields(fields, users_schema.UserOut)
+    user = UserController.get_one_user(db, user_id=user_id, fields=fields)
+    return sparse_response(user) if fields else user
 
 
 # CREATE USER - Solo admin puede crear usuarios directamente
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from sqlalchemy.orm import Session
-from fastapi_pagination import Page
 from app.database.database import get_db
 from app.schemas.volunteer_schema import (
     VolunteerCreate,
@@ -8,19 +8,33 @@ from app.schemas.volunteer_schema import (
     VolunteerOut,
     VolunteerWithSkills
 )
+from app.schemas.skills_schema import SkillSetUpdate
+from app.schemas.page_schema import CursorPage, CountedPage
 from app.controllers.volunteer_controller import *
 from app.controllers.auth_controller import get_current_user, require_admin
 from app.models.users_model import User
+from app.utils.fieldsets import parse_fields, sparse_response
+from app.utils.serialization import rows_page_response
+from app.utils.singleflight import coalesced, flight_group
+from app.utils.bulkheads import bulkhead_route
 
 router = APIRouter(
     prefix="/volunteers",
-    tags=["Volunteers"]
+    tags=["Volunteers"],
+    route_class=bulkhead_route("default")
 )
 
 # Constantes para roles
 ROLE_ADMIN = 1
 ROLE_VOLUNTEER = 2
 
+# Listados idénticos simultáneos (misma página y campos) comparten una consulta
+list_flights = flight_group("volunteers")
+
+
+def _volunteers_response(page, fields):
+    return sparse_response(page) if fields else rows_page_response(page, VolunteerOut)
+
 
 @router.post("/", response_model=VolunteerOut)
 def create(
@@ -59,10 +73,12 @@ def create(
     return create_volunteer(db, volunteer)
 
 
-@router.get("/", response_model=Page[VolunteerOut])
+@router.get("/", response_model=CountedPage[VolunteerOut])
 def list_all(
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: User = Depends(require_admin),
+    flight = Depends(coalesced(list_flights))
 ):
     """
     Recupera información completa de todos los voluntarios activos del sistema.
@@ -73,13 +89,55 @@ def list_all(
     - ✅ Admin: puede ver todos los voluntarios
     - ❌ Voluntario: no tiene acceso a listado completo
     
+    ## Parámetros
+    - **fields**: Campos a devolver separados por comas (`id,user_id,status`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos
+    
     ## Respuesta
     Lista paginada de objetos VolunteerOut con información detallada de cada voluntario.
     
     ## 📝 Ejemplo de uso
-    `GET /volunteers/?page=1&size=10`
+    `GET /volunteers/?page=1&size=10&fields=id,user_id,status`
     """
-    return get_volunteers(db)
+    fields = parse_fields(fields, VolunteerOut)
+    return flight(lambda: _volunteers_response(get_volunteers(db, fields), fields))
+
+
+@router.get("/cursor", response_model=CursorPage[VolunteerOut])
+def list_all_cursor(
+    cursor: Optional[str] = None,
+    size: int = Query(50, ge=1, le=100),
+    include_total: bool = False,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin),
+    flight = Depends(coalesced(list_flights))
+):
+    """
+    Variante de la lista paginada por cursor (keyset) en orden de ID.
+    No usa OFFSET ni cuenta la tabla en cada página: la página 10.000 cuesta lo
+    mismo que la primera. El listado con `page`/`size` sigue disponible en `/volunteers/`.
+    
+    ## Permisos
+    - ✅ Admin: puede ver todos los voluntarios
+    - ❌ Voluntario: no tiene acceso a listado completo
+    
+    ## Parámetros
+    - **cursor**: Valor `next_cursor` de la página anterior (vacío para la primera)
+    - **size**: Tamaño de página (1-100, default: 50)
+    - **include_total**: Añade el total de registros (`COUNT`); desactivado por defecto
+    - **fields**: Campos a devolver separados por comas (`id,user_id,status`). Solo se leen esas
+      columnas de la BD y la respuesta solo incluye esos campos; sin `fields`, todos
+    
+    ## Respuesta
+    Objeto CursorPage con `items` (VolunteerOut), `size`, `next_cursor` (`null` en la
+    última página) y `total` (solo con `include_total=true`).
+    
+    ## 📝 Ejemplo de uso
+    `GET /volunteers/cursor?size=50&cursor=WzUwXQ`
+    """
+    fields = parse_fields(fields, VolunteerOut)
+    return flight(lambda: _volunteers_response(get_volunteers_cursor(db, cursor, size, include_total, fields), fields))
 
 
 @router.get("/{id}", response_model=VolunteerOut)
@@ -105,7 +163,7 @@ def get_one(
     `GET /volunteers/42`
     """
     # Primero obtener el voluntario para verificar permisos
-    volunteer = get_volunteer(db, id)
+    volunteer = get_volunteer_cached(db, id)
     
     # Verificar que el usuario pueda ver este perfil
     if current_user.role_id != ROLE_ADMIN and volunteer.user_id != current_user.id:
@@ -225,6 +283,44 @@ def get_volunteer_skills(
     return volunteer
 
 
+@router.put("/{id}/skills", response_model=VolunteerWithSkills)
+def replace_skills(
+    id: int,
+    data: SkillSetUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Reemplaza el conjunto completo de habilidades del voluntario.
+    Las nuevas se insertan, las eliminadas previamente se reactivan y
+    las que no aparecen en la lista se eliminan, en una sola transacción.
+    
+    ## Permisos
+    - ✅ Admin: puede modificar habilidades de cualquier voluntario
+    - ✅ Voluntario: solo puede modificar su propio perfil
+    
+    ## Parámetros
+    - **id**: ID del voluntario a modificar
+    - **skill_ids**: Lista completa de IDs de habilidades deseadas (puede estar vacía)
+    
+    ## Respuesta
+    Objeto VolunteerWithSkills con el conjunto de habilidades resultante.
+    
+    ## 📝 Ejemplo de uso
+    `PUT /volunteers/42/skills` con `{"skill_ids": [1, 7, 9]}`
+    """
+    volunteer = get_volunteer_by_id(db, id)
+    
+    # Verificar que el usuario pueda modificar este perfil
+    if current_user.role_id != ROLE_ADMIN and volunteer.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access Denied: You can only modify your own skills"
+        )
+    
+    return set_volunteer_skills(db, id, data.skill_ids)
+
+
 @router.post("/{volunteer_id}/skills/{skill_id}", response_model=VolunteerWithSkills)
 def add_skill(
     volunteer_id: int,
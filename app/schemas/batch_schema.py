@@ -0,0 +1,26 @@
+from typing import Any, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+# sub-petición de POST /batch (solo lecturas)
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None                                # para identificar la respuesta (por defecto, su posición)
+    method: Literal["GET"] = "GET"
+    path: str = Field(..., description="Ruta con query string, p. ej. /skills/?size=100")
+    headers: dict[str, str] = {}                           # p. ej. If-None-Match
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(..., min_length=1)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    headers: dict[str, str]                                # ETag, Cache-Control, Retry-After...
+    body: Any = None                                       # JSON de la respuesta (texto si no es JSON)
+    duration_ms: float
+
+class BatchResponse(BaseModel):
+    responses: list[BatchResponseItem]
+    duration_ms: float
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+
+# KPIs del panel de administración (GET /dashboard/admin)
+class VolunteerKpisOut(BaseModel):
+    total: int
+    active: int
+    by_status: Dict[str, int]
+
+class ProjectKpisOut(BaseModel):
+    total: int
+    active: int                         # sin asignar + asignados
+    overdue: int                        # deadline pasado y no completado
+    upcoming: int                       # activos que vencen dentro de la ventana
+    within_days: int
+    by_status: Dict[str, int]
+
+class SkillUsageOut(BaseModel):
+    id: int
+    name: str
+    projects: int                       # proyectos que la requieren
+
+class SkillKpisOut(BaseModel):
+    total: int
+    most_used: List[SkillUsageOut]      # las más requeridas, de mayor a menor
+
+class RecentProjectOut(BaseModel):
+    id: int
+    name: str
+    status: str
+    priority: Optional[str] = None
+    deadline: datetime
+    created_at: datetime
+
+class AdminDashboardOut(BaseModel):
+    volunteers: VolunteerKpisOut
+    projects: ProjectKpisOut
+    skills: SkillKpisOut
+    assignments_by_status: Dict[str, int]
+    recent_projects: List[RecentProjectOut]
+    generated_at: datetime
+
+# panel del voluntario que llama (GET /dashboard/me)
+class MySkillOut(BaseModel):
+    id: int
+    name: str
+    assignments: int                    # asignaciones en las que se ha usado
+
+class ActiveProjectOut(BaseModel):
+    id: int
+    name: str
+    status: str
+    deadline: datetime
+    assignments: int                    # pendientes o aceptadas en el proyecto
+
+class RecentAssignmentOut(BaseModel):
+    id: int
+    status: str
+    project_id: int
+    project_name: str
+    skill_name: str
+    deadline: datetime
+    created_at: datetime
+    updated_at: datetime
+
+class VolunteerDashboardOut(BaseModel):
+    volunteer_id: int
+    status: str
+    skills: List[MySkillOut]
+    total_assignments: int
+    assignments_by_status: Dict[str, int]
+    completion_rate: float              # completadas / (total - rechazadas)
+    active_projects: List[ActiveProjectOut]
+    recent_activity: List[RecentAssignmentOut]
+    generated_at: datetime
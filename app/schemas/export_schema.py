@@ -0,0 +1,53 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SelectEnum(str, Enum):
+    users = "users"
+    projects = "projects"
+    skills = "skills"
+    volunteers = "volunteers"
+    assignments = "assignments"
+    categories = "categories"
+    role = "role"
+    # vistas con JOIN
+    assignments_detailed = "assignments_detailed"
+    volunteers_with_skills = "volunteers_with_skills"
+    projects_with_requirements = "projects_with_requirements"
+
+
+class FormatEnum(str, Enum):
+    csv = "csv"
+    parquet = "parquet"
+    arrow = "arrow"
+
+
+class ExportJobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    done = "done"
+    failed = "failed"
+    expired = "expired"     # el archivo se borró porque la tabla cambió
+
+
+class ExportJobCreate(BaseModel):
+    select: SelectEnum
+    format: FormatEnum = FormatEnum.csv
+
+
+class ExportJobOut(BaseModel):
+    id: str
+    select: SelectEnum
+    format: FormatEnum
+    status: ExportJobStatus
+    rows: Optional[int] = None
+    bytes: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,30 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ImportEntity(str, Enum):
+    users = "users"
+    volunteers = "volunteers"
+    projects = "projects"
+    skills = "skills"
+
+
+class ImportFormat(str, Enum):
+    csv = "csv"
+    jsonl = "jsonl"
+
+
+class ImportRowError(BaseModel):
+    line: int                       # línea del archivo (en CSV la 1 es la cabecera)
+    field: Optional[str] = None
+    error: str
+
+
+class ImportReport(BaseModel):
+    entity: ImportEntity
+    total: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError] = []
@@ -0,0 +1,53 @@
+from pydantic import BaseModel
+
+
+# métricas de la caché de lecturas por id (GET /metrics/cache)
+class EntityCacheStatsOut(BaseModel):
+    backend: str                # memory | sqlite
+    hits: int
+    misses: int
+    hit_ratio: float
+    evictions: int              # desalojadas por tamaño (LRU)
+    invalidations: int
+    entries: int
+    bytes: int                  # tamaño de los valores guardados (JSON)
+
+class CacheStatsOut(BaseModel):
+    enabled: bool
+    entity_cache: EntityCacheStatsOut | None = None
+
+# coalescencia de peticiones idénticas por endpoint (GET /metrics/coalescing)
+class SingleFlightStatsOut(BaseModel):
+    name: str
+    requests: int
+    executions: int             # consultas realmente lanzadas
+    coalesced: int              # esperaron a una petición igual en curso
+    cached: int                 # servidas desde el resultado guardado (SINGLEFLIGHT_TTL_SECONDS)
+    in_flight: int
+    coalescing_ratio: float     # (coalesced + cached) / requests
+
+# control de admisión delante del pool de conexiones (GET /metrics/admission)
+class AdmissionStatsOut(BaseModel):
+    limit: int                  # sesiones simultáneas permitidas ahora (AIMD)
+    max_limit: int              # pool_size + max_overflow
+    in_use: int
+    queued: int
+    admitted: int
+    rejected: int               # 503 por cola llena
+    timed_out: int              # 503 por esperar más de ADMISSION_MAX_WAIT_SECONDS
+    latency_ewma_ms: float      # media móvil de la latencia por sentencia
+    hold_ewma_ms: float         # media móvil del tiempo que una petición retiene la sesión
+
+# compartimentos de hilos por grupo de endpoints (GET /metrics/bulkheads)
+class BulkheadStatsOut(BaseModel):
+    name: str                   # export | auth | matching | default
+    max_concurrent: int
+    max_queue: int
+    active: int                 # hilos ocupados ahora
+    queued: int                 # esperando hilo
+    completed: int
+    rejected: int               # 503 por cola llena
+    queue_time_avg_ms: float
+    queue_time_max_ms: float
+    utilization: float          # active / max_concurrent
+    busy_ratio: float           # fracción del tiempo de hilos ocupada desde el arranque
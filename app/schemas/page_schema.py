@@ -0,0 +1,27 @@
+from enum import Enum
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi_pagination import Page
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CountStrategy(str, Enum):
+    exact = "exact"             # COUNT(*) en cada petición
+    cached = "cached"           # COUNT(*) guardado COUNT_CACHE_TTL_SECONDS, se invalida al escribir en la tabla
+    estimated = "estimated"     # estimación del optimizador (solo MySQL; en otros motores, exact)
+
+
+class CountedPage(Page[T], Generic[T]):
+    '''Page de fastapi_pagination que indica cómo se calculó `total`'''
+    count_strategy: Optional[CountStrategy] = None
+
+
+class CursorPage(BaseModel, Generic[T]):
+    '''Página por cursor (keyset): sin OFFSET y sin COUNT(*) salvo que se pida el total'''
+    items: List[T]
+    size: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    count_strategy: Optional[CountStrategy] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel, ConfigDict
 from app.domain.projects_enums import Project_status, Project_priority
 from app.schemas.category_schemas import CategoryOut
@@ -45,3 +45,46 @@ class ProjectSkillsOperation(BaseModel):
 class ProjectSkillsOut(ProjectOut):
     
     skills: List[SkillOut]  # Lista objetos Skill
+
+# proyecto con relaciones opcionales (?include=skills,category)
+class ProjectWithRelationsOut(ProjectOut):
+    skills: Optional[List[SkillOut]] = None  # Solo con include=skills
+
+
+# búsqueda de proyectos con paginación por cursor
+class ProjectSearchResult(ProjectOut):
+    score: float = 0.0
+
+class ProjectSearchPage(BaseModel):
+    items: List[ProjectSearchResult]
+    size: int
+    next_cursor: Optional[str] = None
+
+
+# contador cacheado para tarjetas KPI (proyectos que vencen en la ventana)
+class ProjectCountOut(BaseModel):
+    count: int
+    within_days: int
+
+
+# estadísticas agregadas (GET /projects/stats)
+class CategoryCountOut(BaseModel):
+    category_id: int
+    name: str
+    count: int
+
+class SkillCoverageOut(BaseModel):
+    projects_with_requirements: int     # proyectos activos con alguna skill requerida
+    fully_covered_projects: int         # todas sus skills las tiene algún voluntario activo
+    fully_covered_ratio: float
+    required_skills: int                # pares proyecto-skill requeridos
+    covered_skills: int
+    covered_skills_ratio: float
+
+class ProjectStatsOut(BaseModel):
+    total: int
+    overdue: int                        # deadline pasado y no completado
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]
+    by_category: List[CategoryCountOut]
+    skill_coverage: SkillCoverageOut
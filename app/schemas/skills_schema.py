@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class SkillBase(BaseModel):
@@ -11,6 +11,10 @@ class SkillCreate(SkillBase):
 class SkillUpdate(SkillBase):
     pass
 
+class SkillSetUpdate(BaseModel):
+    """Conjunto completo de skills deseado; las que no aparezcan se eliminan"""
+    skill_ids: List[int]
+
 class SkillOut(SkillBase):
     id: int
     created_at: datetime
@@ -21,6 +21,20 @@ class UserOut(UserBase):
     
     model_config = ConfigDict(from_attributes=True)
 
+# Igual que UserOut pero sin el hash de la contraseña: es lo que guarda la caché de
+# entidades (con ENTITY_CACHE_BACKEND=sqlite acaba en disco) y lo que devuelve GET /users/{id}
+class UserPublicOut(BaseModel):
+    id: int
+    name: str
+    email: EmailStr
+    phone: str | None = None
+    birth_date: date | None = None
+    role_id: int
+    created_at: datetime
+    updated_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
 class UserUpdate(UserBase):
     name: Optional[str] = None
     email: Optional[EmailStr] = None
@@ -0,0 +1,50 @@
+"""
+Benchmark del export Parquet/Arrow sobre la tabla users, en serie y con pool de procesos.
+
+El pool solo compensa con varios núcleos: cada worker lee y codifica su rango de ids.
+Usa un fichero SQLite (no en memoria) o --url para que los workers puedan conectarse.
+
+    python -m app.tests.benchmarks.bench_export_arrow
+    python -m app.tests.benchmarks.bench_export_arrow --rows 1000000 --url mysql+pymysql://user:pw@localhost/volunteer_crud_test
+"""
+import time
+
+from sqlalchemy.orm import Session
+
+from app.controllers.export_controller import stream_export, shutdown_arrow_pool
+from app.tests.benchmarks.common import make_engine, parse_args, rss_mb, seed_users
+
+
+def run(engine, rows: int, fmt: str, parallel: bool) -> None:
+    with Session(engine) as db:
+        base_rss = peak_rss = rss_mb()
+        total_bytes = 0
+        start = time.perf_counter()
+
+        for chunk in stream_export(db, "users", fmt, parallel):
+            total_bytes += len(chunk)
+            peak_rss = max(peak_rss, rss_mb())
+
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{rows:>10,} rows | {fmt:<7} parallel={parallel!s:<5} | total {elapsed:6.2f} s | "
+        f"{total_bytes / 2**20:7.1f} MB | rss +{peak_rss - base_rss:5.1f} MB"
+    )
+
+
+def main():
+    args = parse_args("Parquet/Arrow export benchmark", [1_000_000])
+    engine = make_engine(args.url)
+    try:
+        for rows in sorted(args.rows):
+            seed_users(engine, rows)
+            for fmt in ("parquet", "arrow"):
+                for parallel in (False, True):
+                    run(engine, rows, fmt, parallel)
+    finally:
+        shutdown_arrow_pool()
+
+
+if __name__ == "__main__":
+    main()
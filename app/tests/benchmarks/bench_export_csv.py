@@ -0,0 +1,54 @@
+"""
+Benchmark del export CSV en streaming sobre la tabla users.
+
+Mide, para cada tamaño de tabla, el tiempo hasta el primer trozo (TTFB),
+el tiempo total y el crecimiento de memoria residente durante el export.
+Con streaming el TTFB y la memoria deben mantenerse constantes al pasar
+de 10k a 1M filas; solo el tiempo total crece con la tabla.
+
+    python -m app.tests.benchmarks.bench_export_csv
+    python -m app.tests.benchmarks.bench_export_csv --url mysql+pymysql://user:pw@localhost/volunteer_crud_test
+"""
+import time
+
+from sqlalchemy.orm import Session
+
+from app.controllers.export_controller import stream_csv
+from app.tests.benchmarks.common import make_engine, parse_args, rss_mb, seed_users
+
+
+def run(engine, rows: int) -> None:
+    seed_users(engine, rows)
+
+    with Session(engine) as db:
+        base_rss = peak_rss = rss_mb()
+        total_bytes = chunks = 0
+        start = time.perf_counter()
+        ttfb = None
+
+        for chunk in stream_csv(db, "users"):
+            if ttfb is None:
+                ttfb = time.perf_counter() - start
+            chunks += 1
+            total_bytes += len(chunk)
+            if chunks % 64 == 0:
+                peak_rss = max(peak_rss, rss_mb())
+
+        elapsed = time.perf_counter() - start
+        peak_rss = max(peak_rss, rss_mb())
+
+    print(
+        f"{rows:>10,} rows | ttfb {ttfb * 1000:7.1f} ms | total {elapsed:6.2f} s | "
+        f"{total_bytes / 2**20:7.1f} MB in {chunks:,} chunks | rss +{peak_rss - base_rss:5.1f} MB"
+    )
+
+
+def main():
+    args = parse_args("Streaming CSV export benchmark", [10_000, 100_000, 1_000_000])
+    engine = make_engine(args.url)
+    for rows in sorted(args.rows):
+        run(engine, rows)
+
+
+if __name__ == "__main__":
+    main()
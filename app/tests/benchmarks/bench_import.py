@@ -0,0 +1,105 @@
+"""
+Benchmark de la importación masiva (POST /import/{entity} y app.cli.import_data).
+
+Compara el pipeline por lotes (validación de lote, deduplicación con IN,
+executemany) con el camino de la API fila a fila (comprobar duplicado,
+insertar y hacer commit por cada fila) importando proyectos, y mide el
+hash de contraseñas de usuarios en serie y en el pool de procesos.
+
+    python -m app.tests.benchmarks.bench_import
+    python -m app.tests.benchmarks.bench_import --rows 10000 100000 --users 400
+"""
+import argparse
+import io
+import json
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.controllers.import_controller import import_file, hash_passwords, shutdown_hash_pool
+from app.database.database import Base
+from app.models import *
+from app.tests.benchmarks.common import make_engine
+
+
+def projects_jsonl(rows: int, category_id: int) -> bytes:
+    return "".join(
+        json.dumps({"name": f"Project {i}", "deadline": "2030-01-01T00:00:00", "category_id": category_id}) + "\n"
+        for i in range(rows)
+    ).encode()
+
+
+def row_by_row(db: Session, data: bytes) -> None:
+    '''Lo que hacía un cliente con un POST /projects/ por fila'''
+    for line in io.BytesIO(data):
+        record = json.loads(line)
+        if db.scalar(select(Project.id).where(Project.name == record["name"])) is None:
+            record["deadline"] = datetime.fromisoformat(record["deadline"])
+            db.add(Project(**record))
+            db.commit()
+
+
+def run_projects(engine, rows: int, baseline_rows: int) -> None:
+    with Session(engine) as db:
+        category = db.scalar(select(Category).limit(1)) or Category(name="Bench")
+        db.add(category)
+        db.commit()
+
+        db.execute(delete(Project.__table__))
+        db.commit()
+        start = time.perf_counter()
+        report = import_file(db, "projects", io.BytesIO(projects_jsonl(rows, category.id)), "jsonl")
+        batched = time.perf_counter() - start
+
+        sample = min(rows, baseline_rows)
+        db.execute(delete(Project.__table__))
+        db.commit()
+        start = time.perf_counter()
+        row_by_row(db, projects_jsonl(sample, category.id))
+        single = (time.perf_counter() - start) / sample * rows
+
+    print(
+        f"{rows:>10,} projects | batched {batched:6.2f} s ({report.inserted / batched:9,.0f} rows/s) | "
+        f"row by row ~{single:7.2f} s (extrapolated from {sample:,}) | x{single / batched:5.1f}"
+    )
+
+
+def run_hashing(users: int) -> None:
+    passwords = [f"password-{i}" for i in range(users)]
+
+    workers = settings.IMPORT_HASH_WORKERS
+    settings.IMPORT_HASH_WORKERS = 1
+    start = time.perf_counter()
+    hash_passwords(passwords)
+    serial = time.perf_counter() - start
+
+    settings.IMPORT_HASH_WORKERS = workers
+    hash_passwords(passwords[:2 * workers])     # arranque del pool fuera de la medida
+    start = time.perf_counter()
+    hash_passwords(passwords)
+    pooled = time.perf_counter() - start
+    shutdown_hash_pool()
+
+    print(f"{users:>10,} bcrypt   | serial {serial:6.2f} s | pool x{workers} {pooled:6.2f} s | x{serial / pooled:5.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import benchmark")
+    parser.add_argument("--url", help="URL de base de datos (default: SQLite temporal)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--baseline-rows", type=int, default=2_000)
+    parser.add_argument("--users", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine(args.url)
+    Base.metadata.create_all(engine)
+    for rows in sorted(args.rows):
+        run_projects(engine, rows, args.baseline_rows)
+    run_hashing(args.users)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark de paginación: offset (Page, LIMIT/OFFSET + COUNT) frente a cursor
+(CursorPage, rango sobre el id) en la página 1 y en la página 10.000 de /users/.
+
+Con OFFSET la página profunda tiene que recorrer y descartar todas las filas
+anteriores; con cursor cada página es un rango del índice y cuesta lo mismo.
+
+    python -m app.tests.benchmarks.bench_pagination
+    python -m app.tests.benchmarks.bench_pagination --url mysql+pymysql://user:pw@localhost/volunteer_crud_test
+"""
+import statistics
+import time
+
+from fastapi_pagination import Params
+from fastapi_pagination.api import set_params
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.controllers.users_controller import UserController
+from app.models import *
+from app.tests.benchmarks.common import make_engine, parse_args, seed_users
+from app.utils.cursor import encode_cursor
+
+SIZE = 50
+PAGES = [1, 10_000]
+REPEAT = 5
+
+
+def timed(fn) -> float:
+    '''Mediana en ms de REPEAT ejecuciones'''
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(engine, rows: int) -> None:
+    seed_users(engine, rows)
+
+    with Session(engine) as db:
+        for page in PAGES:
+            offset = (page - 1) * SIZE
+            if offset >= rows:
+                continue
+            # Cursor que tendría un cliente que ha llegado hasta esa página
+            last_id = db.scalar(select(User.id).order_by(User.id).offset(offset - 1).limit(1)) if offset else None
+            cursor = encode_cursor([last_id]) if last_id is not None else None
+
+            set_params(Params(page=page, size=SIZE))
+            offset_ms = timed(lambda: UserController.get_users(db))
+            cursor_ms = timed(lambda: UserController.get_users_cursor(db, cursor, SIZE))
+            total_ms = timed(lambda: UserController.get_users_cursor(db, cursor, SIZE, include_total=True))
+
+            print(
+                f"{rows:>10,} rows | page {page:>6,} | offset+count {offset_ms:8.1f} ms | "
+                f"cursor {cursor_ms:6.1f} ms | cursor+total {total_ms:8.1f} ms"
+            )
+
+
+def main():
+    args = parse_args("Offset vs cursor pagination benchmark", [500_000])
+    engine = make_engine(args.url)
+    for rows in sorted(args.rows):
+        run(engine, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark de serialización de listados (1k, 10k y 100k usuarios), de la consulta
+a los bytes de la respuesta:
+
+- orm+stdlib: objetos ORM -> UserOut.model_validate -> revalidación de response_model
+  -> json de la librería estándar (camino anterior de FastAPI)
+- orm+orjson: igual pero con ORJSONResponse (default_response_class de la app)
+- core+adapter: filas Core -> TypeAdapter de TypedDict -> bytes (rows_page_response)
+
+    python -m app.tests.benchmarks.bench_serialization
+    python -m app.tests.benchmarks.bench_serialization --rows 1000 10000 100000 --url mysql+pymysql://...
+"""
+import json
+import statistics
+import time
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.models import *
+from app.schemas.users_schema import UserOut
+from app.tests.benchmarks.common import make_engine, parse_args, seed_users
+from app.utils.serialization import dump_rows, schema_select
+
+REPEAT = 5
+
+response_adapter = TypeAdapter(list[UserOut])
+
+
+def timed(fn) -> tuple[float, int]:
+    '''Mediana en ms de REPEAT ejecuciones y tamaño de la salida'''
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        body = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(body)
+
+
+def orm_payload(db: Session, rows: int):
+    # Lo que hacía el endpoint: ORM -> modelo por fila -> validar de nuevo -> dict JSON
+    users = db.query(User).order_by(User.id).limit(rows).all()
+    items = [UserOut.model_validate(u) for u in users]
+    return response_adapter.dump_python(response_adapter.validate_python(items), mode="json")
+
+
+def orm_stdlib(db: Session, rows: int) -> bytes:
+    db.expunge_all()
+    return json.dumps(orm_payload(db, rows), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def orm_orjson(db: Session, rows: int) -> bytes:
+    db.expunge_all()
+    return orjson.dumps(orm_payload(db, rows))
+
+
+def core_adapter(db: Session, rows: int) -> bytes:
+    stmt = schema_select(User, UserOut).order_by(User.id).limit(rows)
+    return dump_rows(UserOut, db.execute(stmt).all())
+
+
+def run(engine, rows: int) -> None:
+    seed_users(engine, rows)
+
+    with Session(engine) as db:
+        results = {name: timed(lambda: fn(db, rows)) for name, fn in (
+            ("orm+stdlib", orm_stdlib), ("orm+orjson", orm_orjson), ("core+adapter", core_adapter)
+        )}
+    baseline = results["orm+stdlib"][0]
+    line = " | ".join(f"{name} {ms:8.1f} ms ({baseline / ms:4.1f}x)" for name, (ms, _) in results.items())
+    print(f"{rows:>8,} rows | {line} | {results['core+adapter'][1] / 2**20:6.1f} MB")
+
+
+def main():
+    args = parse_args("List serialization benchmark", [1_000, 10_000, 100_000])
+    engine = make_engine(args.url)
+    for rows in sorted(args.rows):
+        run(engine, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Utilidades compartidas por los benchmarks (no son tests: pytest no los recoge).
+Por defecto usan un fichero SQLite temporal; con --url se puede apuntar a MySQL.
+"""
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, func, select
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+from app.models import *
+
+FAKE_HASH = "$2b$12$" + "x" * 53   # no hace falta bcrypt real para medir lecturas
+
+
+def rss_mb() -> float:
+    '''Memoria residente actual del proceso en MB (Linux: /proc; resto: pico)'''
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def parse_args(description: str, default_rows: list[int]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--url", help="URL de base de datos (default: SQLite temporal)")
+    parser.add_argument("--rows", type=int, nargs="+", default=default_rows)
+    return parser.parse_args()
+
+
+def make_engine(url: str | None):
+    if url:
+        return create_engine(url)
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    return create_engine(f"sqlite:///{path}")
+
+
+def seed_users(engine, rows: int, batch: int = 50_000) -> None:
+    '''Deja la tabla users con exactamente `rows` filas (reutiliza las existentes)'''
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        if db.get(Role, 1) is None:
+            db.add_all([Role(id=1, name="admin"), Role(id=2, name="volunteer")])
+            db.commit()
+        current = db.scalar(select(func.count(User.id)))
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(current, rows, batch):
+            conn.execute(insert(User.__table__), [
+                {"name": f"User {i}", "email": f"user{i}@bench.org", "password": FAKE_HASH, "role_id": 2}
+                for i in range(offset, min(offset + batch, rows))
+            ])
+    if rows > current:
+        print(f"  seeded {rows - current:,} users in {time.perf_counter() - start:.1f}s")
@@ -62,6 +62,18 @@ def db_session(setup_test_database) -> Generator[Session, None, None]:
     connection.close()
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Las cachés TTL son globales al proceso: cada test empieza sin valores de otro"""
+    from app.utils.cache import clear_all
+    from app.utils.entity_cache import reset_entity_cache
+    clear_all()
+    reset_entity_cache()
+    yield
+    clear_all()
+    reset_entity_cache()
+
+
 
 
 @pytest.fixture
@@ -0,0 +1,48 @@
+import pytest
+
+
+def test_admission_rejects_when_queue_is_full_and_serves_by_priority():
+    """Test con todas las plazas ocupadas se encola por prioridad y con la cola llena se rechaza"""
+    import threading
+    import time
+    from app.database.admission import AdmissionController, Overloaded
+    
+    admission = AdmissionController(min_limit=1, initial_limit=1, max_limit=1, max_queue=2, max_wait=5, latency_target=1)
+    admission.acquire()
+    order = []
+    def wait_turn(priority):
+        admission.acquire(priority)
+        order.append(priority)
+        admission.release(0.01)
+    
+    threads = [threading.Thread(target=wait_turn, args=(priority,)) for priority in (2, 0)]
+    for thread in threads:
+        thread.start()
+        while admission.queued < threads.index(thread) + 1:
+            time.sleep(0.01)
+    
+    with pytest.raises(Overloaded) as exc:
+        admission.acquire()
+    admission.release(0.01)
+    for thread in threads:
+        thread.join(5)
+    
+    assert exc.value.retry_after >= 1
+    assert order == [0, 2]
+    assert admission.stats()["rejected"] == 1
+    assert admission.in_use == 0
+
+
+def test_admission_limit_adapts_to_db_latency():
+    """Test el límite baja de forma multiplicativa con la BD lenta y sube de uno en uno con la BD rápida"""
+    from app.database.admission import AdmissionController
+    
+    admission = AdmissionController(min_limit=2, initial_limit=8, max_limit=10, max_queue=4, max_wait=1, latency_target=0.1)
+    admission.observe(0.5)
+    admission.observe(0.5)
+    assert admission.stats()["limit"] == 6
+    
+    admission.latency_ewma = 0.01
+    for _ in range(40):
+        admission.observe(0.01)
+    assert admission.stats()["limit"] == 10
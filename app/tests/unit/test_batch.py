@@ -0,0 +1,16 @@
+from fastapi import HTTPException
+import pytest
+
+
+def test_validate_batch_enforces_limits():
+    """Test POST /batch: máximo de sub-peticiones, rutas prohibidas e ids por posición"""
+    from app.config.config_variables import settings
+    from app.controllers.batch_controller import validate_batch
+    from app.schemas.batch_schema import BatchRequestItem
+    
+    assert validate_batch([BatchRequestItem(path="/skills/"), BatchRequestItem(id="me", path="/auth/me")]) == ["0", "me"]
+    
+    for paths in (["/skills/"] * (settings.BATCH_MAX_REQUESTS + 1), ["/export/users"], ["/batch"], ["http://evil/"]):
+        with pytest.raises(HTTPException) as exc:
+            validate_batch([BatchRequestItem(path=path) for path in paths])
+        assert exc.value.status_code == 400
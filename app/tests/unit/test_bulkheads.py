@@ -0,0 +1,62 @@
+from fastapi import HTTPException
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_caps_concurrency_and_rejects_when_queue_is_full():
+    """Test un compartimento lleno (hilos y cola) responde 503 sin tocar a los demás"""
+    import asyncio
+    import threading
+    from app.utils.bulkheads import Bulkhead
+    
+    export, default = Bulkhead("export-test", max_concurrent=1, max_queue=1), Bulkhead("default-test", 4, 4)
+    release = threading.Event()
+    running = asyncio.ensure_future(export.run(release.wait, 5))
+    queued = asyncio.ensure_future(export.run(lambda: "queued"))
+    while export.stats()["active"] < 1 or export.stats()["queued"] < 1:
+        await asyncio.sleep(0.01)
+    
+    with pytest.raises(HTTPException) as exc:
+        await export.run(lambda: "rejected")
+    assert await default.run(lambda: "interactive") == "interactive"
+    
+    release.set()
+    assert await queued == "queued"
+    await running
+    
+    stats = export.stats()
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+    assert (stats["completed"], stats["rejected"], stats["queued"]) == (2, 1, 0)
+    assert stats["queue_time_max_ms"] > 0
+
+
+def test_bulkhead_route_covers_sync_endpoint_body_only():
+    """Test qué corre en el compartimento: el cuerpo síncrono sí; las dependencias y los endpoints async no"""
+    from fastapi import APIRouter, Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from app.utils.bulkheads import bulkhead_route, get_bulkhead
+    
+    bulkhead = get_bulkhead("route-test")
+    router = APIRouter(route_class=bulkhead_route("route-test"))
+    seen = {}
+    
+    def dependency():
+        seen["dependency"] = bulkhead.limiter.borrowed_tokens
+    
+    @router.get("/sync")
+    def sync_endpoint(_: None = Depends(dependency)):
+        seen["sync"] = bulkhead.limiter.borrowed_tokens
+    
+    @router.get("/async")
+    async def async_endpoint():
+        seen["async"] = bulkhead.limiter.borrowed_tokens
+    
+    app = FastAPI()
+    app.include_router(router)
+    with TestClient(app) as client:
+        assert client.get("/sync").status_code == 200
+        assert client.get("/async").status_code == 200
+    
+    assert seen == {"dependency": 0, "sync": 1, "async": 0}
+    assert bulkhead.stats()["completed"] == 1
@@ -224,4 +224,21 @@ def test_delete_category_and_verify_not_in_list(db_session):
 
     result = get_categories(db_session)
     assert len(result.items) == 1
-    assert result.items[0].id == cat2.id
\ No newline at end of file
+    assert result.items[0].id == cat2.id
+
+def test_get_categories_rows_serialize_like_schema(db_session):
+    """Test las filas Core del listado se serializan igual que CategoryOut"""
+    import json
+    from app.schemas.category_schemas import CategoryOut
+    from app.utils.serialization import rows_page_response
+    
+    categories = CategoryFactory.create_batch(3, description=None)
+    
+    result = get_categories(db_session)
+    response = rows_page_response(result, CategoryOut)
+    body = json.loads(response.body)
+    
+    expected = [json.loads(CategoryOut.model_validate(c).model_dump_json()) for c in categories]
+    assert body["items"] == expected
+    assert body["total"] == 3
+    assert body["count_strategy"] == "exact"
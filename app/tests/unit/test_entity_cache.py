@@ -0,0 +1,70 @@
+from app.controllers.category_controller import update_category
+from app.schemas.category_schemas import CategoryUpdate
+from app.tests.factories.category_factory import CategoryFactory
+from fastapi import HTTPException
+import pytest
+
+
+def test_get_category_cached_hit_and_invalidated_on_update(db_session):
+    """Test la segunda lectura sale de la caché y la actualización la invalida"""
+    from app.controllers.category_controller import get_category_cached
+    from app.utils.entity_cache import get_entity_cache
+    
+    category = CategoryFactory.create(name="Original")
+    cache = get_entity_cache()
+    
+    first = get_category_cached(db_session, category.id)
+    second = get_category_cached(db_session, category.id)
+    update_category(db_session, category.id, CategoryUpdate(name="Renombrada"))
+    third = get_category_cached(db_session, category.id)
+    
+    assert first.name == second.name == "Original"
+    assert third.name == "Renombrada"
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_get_category_cached_not_found_is_not_cached(db_session):
+    """Test los 404 no se guardan en la caché"""
+    from app.controllers.category_controller import get_category_cached
+    from app.utils.entity_cache import get_entity_cache
+    
+    with pytest.raises(HTTPException):
+        get_category_cached(db_session, 999)
+    
+    assert get_entity_cache().stats()["entries"] == 0
+
+
+def test_sqlite_entity_cache_backend_evicts_least_recently_used(tmp_path):
+    """Test el almacén compartido (SQLite) respeta TTL y desaloja por LRU"""
+    from app.utils.entity_cache import SqliteBackend
+    
+    backend = SqliteBackend(str(tmp_path / "cache.sqlite3"), maxsize=2, ttl=60)
+    backend.set("category:1:", b"a")
+    backend.set("category:2:", b"b")
+    backend.get("category:1:")
+    evicted = backend.set("category:3:", b"c")
+    backend.delete_prefix("category:3:")
+    
+    assert evicted == 1
+    assert backend.get("category:1:") == b"a"
+    assert backend.get("category:2:") is None
+    assert backend.size() == (1, 1)
+
+
+def test_entity_cache_store_racing_invalidation_leaves_no_entry():
+    """Test una invalidación que llega mientras se guarda un valor no deja la entrada obsoleta"""
+    from app.utils.entity_cache import EntityCache, MemoryBackend
+    
+    class RacingBackend(MemoryBackend):
+        def set(self, key, value):
+            #La invalidación llega justo después de comprobar la generación
+            cache.invalidate("category")
+            return super().set(key, value)
+    
+    cache = EntityCache(RacingBackend(maxsize=10, ttl=60))
+    value, generation = cache.lookup("category", "category:1:")
+    cache.store("category", "category:1:", b"viejo", generation)
+    
+    assert value is None
+    assert cache.backend.get("category:1:") is None
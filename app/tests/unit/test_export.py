@@ -0,0 +1,260 @@
+from app.controllers.export_controller import stream_csv, stream_export, stream_delta, iter_batches, export_statement, table_signature, EXPORT_TABLES
+from app.controllers.export_jobs import ExportJob, run_export_job, get_export_job_file, spool_chunks, open_cached_export, iter_file, _jobs
+from app.utils.etag import make_etag, etag_matches
+from app.schemas.export_schema import ExportJobStatus
+from app.config.config_variables import settings
+from app.utils.csv import iter_csv
+from app.utils.arrow import arrow_schema
+from app.tests.factories.project_factory import ProjectFactory
+from app.tests.factories.skill_factory import SkillFactory
+from app.tests.factories.volunteer_factory import VolunteerFactory
+from app.tests.factories.role_factory import RoleFactory
+from app.models.project_skill_model import project_skills
+from app.models.volunteer_skill_model import volunteer_skills
+from app.utils.cursor import encode_cursor
+from sqlalchemy import insert
+from app.domain.projects_enums import Project_status
+from fastapi import HTTPException
+import csv
+import io
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+import pytest
+
+
+def _parse(chunks) -> list[list[str]]:
+    text = b"".join(chunks).decode("utf-8")
+    assert text.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+def test_iter_csv_fixed_size_chunks():
+    """Test el CSV se emite en trozos de tamaño fijo y sin perder filas"""
+    
+    batches = [[(i, 'texto, con "comillas"') for i in range(n * 100, (n + 1) * 100)] for n in range(20)]
+    
+    chunks = list(iter_csv(["id", "text"], batches, chunk_size=1024))
+    rows = _parse(chunks)
+    
+    assert all(len(chunk.decode("utf-8")) == 1024 for chunk in chunks[:-1])
+    assert rows[0] == ["id", "text"]
+    assert len(rows) == 2001
+    assert rows[-1] == ["1999", 'texto, con "comillas"']
+
+
+def test_stream_csv_projects(db_session):
+    """Test export en streaming: cabecera de columnas, tuplas y enums por su valor"""
+    
+    project = ProjectFactory.create(status=Project_status.not_assigned)
+    
+    rows = _parse(stream_csv(db_session, "projects"))
+    header, data = rows[0], rows[1:]
+    
+    assert header == [c.name for c in EXPORT_TABLES["projects"].columns]
+    exported = next(r for r in data if r[header.index("id")] == str(project.id))
+    assert exported[header.index("status")] == "not assigned"
+
+
+def test_iter_batches_returns_tuples(db_session):
+    """Test el export lee filas Core (tuplas) en lotes, no objetos ORM"""
+    
+    ProjectFactory.create_batch(3)
+    
+    batches = list(iter_batches(db_session, export_statement(EXPORT_TABLES["projects"]), batch_size=2))
+    
+    assert all(len(batch) <= 2 for batch in batches)
+    assert all(isinstance(row, tuple) for batch in batches for row in batch)
+    assert sum(len(batch) for batch in batches) >= 3
+
+
+def test_stream_csv_unknown_select(db_session):
+    """Test export de una tabla no exportable"""
+    
+    with pytest.raises(HTTPException) as exc_info:
+        stream_csv(db_session, "passwords")
+    
+    assert exc_info.value.status_code == 404
+
+
+def test_arrow_schema_from_table_columns():
+    """Test esquema Arrow tipado a partir de __table__.columns"""
+    
+    schema = arrow_schema(EXPORT_TABLES["projects"].columns)
+    
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("deadline").type == pa.timestamp("us")
+    assert pa.types.is_dictionary(schema.field("status").type)
+    assert schema.field("description").nullable
+    assert not schema.field("name").nullable
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_stream_export_typed_formats(db_session, fmt):
+    """Test export Parquet/Arrow: conserva tipos, NULLs y enums como diccionario"""
+    
+    project = ProjectFactory.create(description=None, status=Project_status.assigned)
+    
+    data = b"".join(stream_export(db_session, "projects", fmt))
+    if fmt == "parquet":
+        table = pq.read_table(pa.BufferReader(data))
+    else:
+        table = pa.ipc.open_stream(data).read_all()
+    
+    row = table.filter(pc.equal(table["id"], project.id)).to_pylist()[0]
+    assert row["status"] == "assigned"
+    assert row["description"] is None
+    assert pa.types.is_dictionary(table.schema.field("status").type)
+    assert table.schema.field("deadline").type == pa.timestamp("us")
+
+
+def test_stream_csv_views_aggregate_skills(db_session):
+    """Test vistas de export: una fila por entidad con las skills activas agregadas"""
+    
+    role = RoleFactory.default()
+    project = ProjectFactory.create()
+    volunteer = VolunteerFactory.create()
+    python, sql, old = SkillFactory.create(name="Python"), SkillFactory.create(name="SQL"), SkillFactory.create(name="Cobol")
+    db_session.execute(insert(project_skills), [
+        {"project_id": project.id, "skill_id": python.id, "deleted_at": None},
+        {"project_id": project.id, "skill_id": sql.id, "deleted_at": None},
+        {"project_id": project.id, "skill_id": old.id, "deleted_at": datetime.now()},
+    ])
+    db_session.execute(insert(volunteer_skills).values(volunteer_id=volunteer.id, skill_id=sql.id))
+    db_session.flush()
+    
+    projects = _parse(stream_csv(db_session, "projects_with_requirements"))
+    volunteers = _parse(stream_csv(db_session, "volunteers_with_skills"))
+    
+    project_row = dict(zip(projects[0], next(r for r in projects[1:] if r[0] == str(project.id))))
+    volunteer_row = dict(zip(volunteers[0], next(r for r in volunteers[1:] if r[0] == str(volunteer.id))))
+    assert project_row["required_skill_count"] == "2"
+    assert sorted(project_row["required_skills"].split(", ")) == ["Python", "SQL"]
+    assert volunteer_row["skills"] == "SQL"
+
+
+def test_stream_delta_since_with_tombstones(db_session):
+    """Test export incremental: solo filas cambiadas desde el cursor, borradas como tombstones"""
+    
+    before, changed = datetime(2001, 1, 1), datetime(2001, 6, 1)
+    old, updated, deleted = ProjectFactory.create_batch(3)
+    old.updated_at = before
+    updated.updated_at = changed
+    deleted.updated_at = deleted.deleted_at = changed
+    db_session.flush()
+    ids = {str(p.id) for p in (old, updated, deleted)}
+    
+    chunks, next_cursor = stream_delta(db_session, "projects", "csv", "2001-03-01T00:00:00")
+    rows = _parse(chunks)
+    header, data = rows[0], [dict(zip(rows[0], r)) for r in rows[1:] if r[1] in ids]
+    
+    assert header[0] == "op"
+    assert [(r["id"], r["op"]) for r in data] == [(str(updated.id), "upsert"), (str(deleted.id), "delete")]
+    assert data[0]["name"] == updated.name
+    assert data[1]["name"] == "" and data[1]["deleted_at"] != ""
+    assert next_cursor
+    
+    # Mismo updated_at: el cursor (updated_at, id) sigue justo después de la última fila leída
+    chunks, _ = stream_delta(db_session, "projects", "csv", encode_cursor([changed, updated.id]))
+    assert [r[1] for r in _parse(chunks)[1:] if r[1] in ids] == [str(deleted.id)]
+
+
+@pytest.mark.parametrize("select_name, since", [
+    ("assignments_detailed", "2001-01-01"),
+    ("projects", "no-es-un-cursor"),
+])
+def test_stream_delta_bad_request(db_session, select_name, since):
+    """Test export incremental de una vista o con un cursor inválido"""
+    
+    with pytest.raises(HTTPException) as exc_info:
+        stream_delta(db_session, select_name, "csv", since)
+    
+    assert exc_info.value.status_code == 400
+
+
+def test_table_signature_changes_with_data(db_session):
+    """Test la firma de un export cambia al insertar en cualquiera de sus tablas"""
+    
+    ProjectFactory.create()
+    before = table_signature(db_session, "projects_with_requirements")
+    
+    assert table_signature(db_session, "projects_with_requirements") == before
+    db_session.execute(insert(project_skills).values(project_id=ProjectFactory.create().id, skill_id=SkillFactory.create().id))
+    db_session.flush()
+    assert table_signature(db_session, "projects_with_requirements") != before
+
+
+def test_run_export_job_spools_file(db_session, tmp_path, monkeypatch):
+    """Test export en segundo plano: escribe el archivo completo y cuenta filas y bytes"""
+    
+    monkeypatch.setattr(settings, "EXPORT_SPOOL_DIR", str(tmp_path))
+    ProjectFactory.create_batch(3)
+    job = ExportJob(id="a" * 24, select="projects", format="csv", path=tmp_path / "projects.job.csv")
+    
+    run_export_job(db_session, job)
+    
+    rows = _parse([job.path.read_bytes()])
+    assert job.status == ExportJobStatus.done
+    assert job.rows == len(rows) - 1 >= 3
+    assert job.bytes == job.path.stat().st_size
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_export_job_download_not_ready(monkeypatch, tmp_path):
+    """Test descargar un export que todavía no ha terminado"""
+    
+    job = ExportJob(id="b" * 24, select="users", format="csv", path=tmp_path / "users.job.csv")
+    monkeypatch.setitem(_jobs, job.id, job)
+    
+    with pytest.raises(HTTPException) as exc_info:
+        get_export_job_file(job.id)
+    
+    assert exc_info.value.status_code == 409
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, False),
+    ('"v1"', True),
+    ('W/"v1"', True),
+    ('"v0", "v1"', True),
+    ("*", True),
+    ('"v2"', False),
+])
+def test_etag_matches_if_none_match(header, expected):
+    """Test comparación de If-None-Match con el ETag del export"""
+    
+    assert etag_matches(header, make_etag("v1")) is expected
+
+
+def test_spool_chunks_caches_only_complete_exports(tmp_path, monkeypatch):
+    """Test el último export se guarda en disco solo si se envió completo"""
+    
+    monkeypatch.setattr(settings, "EXPORT_SPOOL_DIR", str(tmp_path))
+    
+    aborted = spool_chunks(iter([b"a", b"b"]), "users", "csv", "v1")
+    next(aborted)
+    aborted.close()
+    assert open_cached_export("users", "csv", "v1") is None
+    
+    assert b"".join(spool_chunks(iter([b"a", b"b"]), "users", "csv", "v1")) == b"ab"
+    assert b"".join(iter_file(open_cached_export("users", "csv", "v1"))) == b"ab"
+    assert not list(tmp_path.glob("*.part"))
+
+
+def test_cached_export_survives_removal_after_open(tmp_path, monkeypatch):
+    """Test un export abierto del spool se lee entero aunque otra petición lo borre"""
+    
+    monkeypatch.setattr(settings, "EXPORT_SPOOL_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_BYTES", 2)
+    b"".join(spool_chunks(iter([b"ab", b"cd"]), "users", "csv", "v1"))
+    
+    f = open_cached_export("users", "csv", "v1")
+    chunks = iter_file(f)
+    first = next(chunks)
+    #Una versión nueva borra la anterior a mitad de la descarga
+    b"".join(spool_chunks(iter([b"xy"]), "users", "csv", "v2"))
+    
+    assert open_cached_export("users", "csv", "v1") is None
+    assert first + b"".join(chunks) == b"abcd"
+    assert f.closed
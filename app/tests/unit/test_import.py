@@ -0,0 +1,118 @@
+from app.controllers.import_controller import import_file, import_records, hash_passwords
+from app.models.users_model import User
+from app.models.volunteers_model import Volunteer
+from app.tests.factories.user_factory import UserFactory
+from app.tests.factories.role_factory import RoleFactory
+from app.tests.factories.skill_factory import SkillFactory
+from app.utils.security import verify_password
+from fastapi import HTTPException
+import io
+import json
+import pytest
+
+
+def test_import_users_csv(db_session):
+    """Test importar usuarios desde CSV: contraseñas hasheadas y errores por línea"""
+    
+    RoleFactory.default()
+    existing = UserFactory.create()
+    data = (
+        "name,email,password,phone\n"
+        "Ana,ana.import@test.com,secreta1,\n"
+        "Sin email,no-es-un-email,secreta2,\n"
+        f"Repetido,{existing.email},secreta3,\n"
+        "Ana bis,ana.import@test.com,secreta4,600123456\n"
+    )
+    
+    report = import_file(db_session, "users", io.BytesIO(data.encode()), "csv")
+    
+    assert (report.total, report.inserted, report.failed) == (4, 1, 3)
+    assert [(e.line, e.field) for e in report.errors] == [(3, "email"), (4, "email"), (5, "email")]
+    assert report.errors[1].error == "User already exists"
+    assert report.errors[2].error == "Duplicated in file"
+    
+    user = db_session.query(User).filter(User.email == "ana.import@test.com").one()
+    assert user.phone is None
+    assert verify_password("secreta1", user.password)
+
+
+def test_import_volunteers_jsonl(db_session):
+    """Test importar voluntarios desde JSON Lines: JSON inválido y usuario inexistente"""
+    
+    RoleFactory.default()
+    user = UserFactory.create()
+    lines = [json.dumps({"user_id": user.id}), "{roto", json.dumps({"user_id": 999999}), ""]
+    
+    report = import_file(db_session, "volunteers", io.BytesIO("\n".join(lines).encode()), "jsonl")
+    
+    assert (report.total, report.inserted, report.failed) == (3, 1, 2)
+    assert report.errors[0].line == 2 and report.errors[0].error.startswith("Invalid JSON")
+    assert report.errors[1].error == "User with ID 999999 not found"
+    assert db_session.query(Volunteer).filter(Volunteer.user_id == user.id).count() == 1
+
+
+def test_import_skills_dedupes_across_batches(db_session):
+    """Test duplicados dentro del archivo, contra la BD y contra lotes ya insertados"""
+    
+    SkillFactory.create(name="Importada")
+    names = ["Nueva", "Nueva", "Importada", "Otra", "Nueva"]
+    records = [(n, {"name": name}) for n, name in enumerate(names, start=1)]
+    
+    report = import_records(db_session, "skills", records, batch_size=2)
+    
+    assert report.inserted == 2
+    assert [(e.line, e.error) for e in report.errors] == [
+        (2, "Duplicated in file"), (3, "Skill already exists"), (5, "Skill already exists")
+    ]
+
+
+def test_import_unknown_entity(db_session):
+    """Test importar una entidad no soportada"""
+    
+    with pytest.raises(HTTPException) as exc_info:
+        import_records(db_session, "passwords", [])
+    
+    assert exc_info.value.status_code == 404
+
+
+def test_hash_passwords_keeps_order():
+    """Test el hash por lotes devuelve un hash por contraseña y en el mismo orden"""
+    
+    hashes = hash_passwords(["uno", "dos"])
+    
+    assert verify_password("uno", hashes[0]) and verify_password("dos", hashes[1])
+
+
+def test_import_row_rejected_by_database_is_reported(db_session):
+    """Test un error de datos de la BD (no de restricción) se informa por fila y no corta la importación"""
+    import sqlite3
+    from sqlalchemy import event
+    from app.models.skill_model import Skill
+    
+    def reject_long_name(cursor, statement, parameters, context):
+        #Como MySQL estricto con un valor más largo que String(100); dentro del driver, así
+        #SQLAlchemy lo envuelve en DBAPIError igual que un error real
+        rows = parameters if context.executemany else [parameters]
+        if statement.startswith("INSERT INTO skills") and any("Demasiado larga" in str(row) for row in rows):
+            raise sqlite3.DataError("Data too long for column 'name'")
+    
+    names = ["Primera", "Demasiado larga", "Tercera"]
+    records = [(n, {"name": name}) for n, name in enumerate(names, start=1)]
+    engine = db_session.get_bind().engine
+    event.listen(engine, "do_execute", reject_long_name)
+    event.listen(engine, "do_executemany", reject_long_name)
+    try:
+        report = import_records(db_session, "skills", records, batch_size=10)
+    finally:
+        event.remove(engine, "do_execute", reject_long_name)
+        event.remove(engine, "do_executemany", reject_long_name)
+    
+    imported = db_session.query(Skill).filter(Skill.name.in_(names))
+    try:
+        assert (report.inserted, report.failed) == (2, 1)
+        assert [(e.line, e.error) for e in report.errors] == [(2, "Row rejected by the database")]
+        assert imported.count() == 2
+    finally:
+        #El rollback del reintento fila a fila cierra la transacción del test: se limpia a mano
+        imported.delete()
+        db_session.commit()
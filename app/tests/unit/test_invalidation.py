@@ -0,0 +1,102 @@
+from app.tests.factories.category_factory import CategoryFactory
+
+
+def test_invalidation_bus_applies_events_from_other_workers(db_session, tmp_path):
+    """Test el sondeo aplica las invalidaciones de otro worker e ignora las propias"""
+    import json
+    from datetime import datetime
+    from sqlalchemy import create_engine
+    from app.controllers.category_controller import get_category_cached
+    from app.models.cache_invalidation_model import cache_invalidations
+    from app.utils.entity_cache import get_entity_cache
+    from app.utils.invalidation import DatabaseTransport
+    from app.utils.versions import table_version
+    
+    bus_engine = create_engine(f"sqlite:///{tmp_path / 'bus.sqlite3'}")
+    cache_invalidations.create(bus_engine)
+    transport = DatabaseTransport(bus_engine, max_staleness=2, retention=3600)
+    
+    category = CategoryFactory.create(name="Original")
+    get_category_cached(db_session, category.id)
+    before = table_version("categories")
+    
+    transport.send("entity", ("category",))
+    assert transport.flush() == 1
+    with bus_engine.begin() as conn:
+        conn.execute(cache_invalidations.insert(), [
+            {"origin": "other", "namespace": "entity", "keys": json.dumps([f"category:{category.id}"]), "created_at": datetime.utcnow()},
+            {"origin": "other", "namespace": "tables", "keys": json.dumps(["categories"]), "created_at": datetime.utcnow()},
+        ])
+    
+    assert transport.poll() == 2
+    assert transport.poll() == 0
+    assert transport.floor == 3
+    assert table_version("categories") == before + 1
+    assert get_entity_cache().stats()["entries"] == 0
+
+
+def test_invalidation_bus_waits_for_out_of_order_ids():
+    """Test un id que se hace visible después de uno mayor se sigue buscando"""
+    from app.utils.invalidation import DatabaseTransport
+    
+    transport = DatabaseTransport(None, max_staleness=2, retention=3600)
+    transport._track_gaps({1, 3}, 3)
+    assert transport.floor == 3
+    assert set(transport._gaps) == {2}
+    
+    transport._track_gaps({4}, 4)
+    assert transport.floor == 4
+    assert set(transport._gaps) == {2}
+
+
+def test_invalidation_bus_applies_late_commits_below_floor(tmp_path):
+    """Test un evento con id menor que se hace visible tarde (commit lento) no se pierde"""
+    import json
+    from datetime import datetime
+    from sqlalchemy import create_engine
+    from app.models.cache_invalidation_model import cache_invalidations
+    from app.utils.invalidation import DatabaseTransport, subscribe
+    
+    bus_engine = create_engine(f"sqlite:///{tmp_path / 'bus.sqlite3'}")
+    cache_invalidations.create(bus_engine)
+    transport = DatabaseTransport(bus_engine, max_staleness=0.01, retention=3600)
+    received = []
+    subscribe("test-late", lambda keys: received.extend(keys))
+    
+    def event(id, key):
+        return {"id": id, "origin": "other", "namespace": "test-late", "keys": json.dumps([key]), "created_at": datetime.utcnow()}
+    
+    with bus_engine.begin() as conn:
+        conn.execute(cache_invalidations.insert(), [event(1, "a"), event(3, "c")])
+    transport.poll()
+    with bus_engine.begin() as conn:
+        conn.execute(cache_invalidations.insert(), [event(2, "b")])
+    transport.poll()
+    transport.poll()
+    
+    assert received == ["a", "c", "b"]
+    assert transport.floor == 3
+
+
+def test_invalidation_bus_retries_events_after_failed_flush(tmp_path):
+    """Test si escribir los eventos falla, se quedan en la cola y salen en orden en el siguiente intento"""
+    import json
+    from sqlalchemy import create_engine, select
+    from app.models.cache_invalidation_model import cache_invalidations
+    from app.utils.invalidation import DatabaseTransport
+    
+    #Sin la tabla creada el INSERT falla, como con la BD caída
+    bus_engine = create_engine(f"sqlite:///{tmp_path / 'bus.sqlite3'}")
+    transport = DatabaseTransport(bus_engine, max_staleness=2, retention=3600)
+    transport.send("entity", ("category",))
+    transport.send("tables", ("categories",))
+    
+    assert transport.flush() == 0
+    transport.send("entity", ("skill",))
+    
+    cache_invalidations.create(bus_engine)
+    assert transport.flush() == 3
+    assert transport.flush() == 0
+    with bus_engine.connect() as conn:
+        rows = conn.execute(select(cache_invalidations.c["keys"]).order_by(cache_invalidations.c.id)).scalars().all()
+    assert [json.loads(keys) for keys in rows] == [["category"], ["categories"], ["skill"]]
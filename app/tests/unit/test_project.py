@@ -8,6 +8,8 @@ from fastapi_pagination import Params
 from fastapi_pagination.api import set_params
 from fastapi import HTTPException
 from app.tests.factories.skill_factory import SkillFactory
+from app.models.project_skill_model import project_skills
+from sqlalchemy import event, insert
 import pytest
 
 
@@ -352,3 +354,443 @@ async def test_remove_skill_not_assigned(db_session):
 
 
 
+
+
+@pytest.mark.asyncio
+async def test_search_projects_filters_and_cursor(db_session):
+    """Test búsqueda sin texto: filtros indexados y paginación por cursor"""
+    
+    category = CategoryFactory.create()
+    ProjectFactory.create_batch(5, priority=Project_priority.high)
+    ProjectFactory.create_batch(2, priority=Project_priority.low)
+    
+    first = await ProjectController.search_projects(db_session, priority=Project_priority.high, size=3)
+    
+    assert len(first.items) == 3
+    assert first.next_cursor is not None
+    
+    second = await ProjectController.search_projects(
+        db_session, priority=Project_priority.high, cursor=first.next_cursor, size=3
+    )
+    
+    assert len(second.items) == 2
+    assert second.next_cursor is None
+    ids = [p.id for p in first.items + second.items]
+    assert len(set(ids)) == 5
+    assert ids == sorted(ids, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_search_projects_invalid_cursor(db_session):
+    """Test cursor corrupto devuelve 400"""
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await ProjectController.search_projects(db_session, cursor="no-es-un-cursor")
+    
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("q, values", [
+    ("website", ["a", "b"]),
+    ("website", [1.5, "b"]),
+    ("website", [True, 1]),
+    (None, ["a"]),
+])
+async def test_search_projects_cursor_with_wrong_types(db_session, q, values):
+    """Test cursor bien formado pero con valores no numéricos devuelve 400"""
+    from app.utils.cursor import encode_cursor
+    
+    category = CategoryFactory.create()
+    ProjectFactory.create(name="Website ONG")
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await ProjectController.search_projects(db_session, q=q, cursor=encode_cursor(values))
+    
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_search_projects_index_follows_committed_writes(db_session):
+    """Test el índice en memoria se invalida solo con los commits: alta, renombrado y borrado"""
+    
+    category = CategoryFactory.create()
+    project = ProjectFactory.create(name="Huerto urbano", description=None)
+    db_session.commit()
+    assert [p.id for p in (await ProjectController.search_projects(db_session, q="huerto")).items] == [project.id]
+    
+    created = await ProjectController.create_project(db_session, project_schema.ProjectCreate(
+        name="Huerto escolar", deadline=datetime.now(timezone.utc) + timedelta(days=30),
+        status=Project_status.not_assigned, priority=Project_priority.low, category_id=category.id
+    ))
+    assert {p.id for p in (await ProjectController.search_projects(db_session, q="huerto")).items} == {project.id, created.id}
+    
+    await ProjectController.update_project(db_session, created.id, project_schema.ProjectUpdate(name="Biblioteca escolar"))
+    await ProjectController.delete_project(db_session, project.id)
+    
+    assert (await ProjectController.search_projects(db_session, q="huerto")).items == []
+    assert [p.id for p in (await ProjectController.search_projects(db_session, q="biblioteca")).items] == [created.id]
+
+
+def test_inverted_index_ranks_by_relevance():
+    """Test del índice invertido usado como alternativa a FULLTEXT"""
+    from app.utils.search import InvertedIndex
+    
+    index = InvertedIndex()
+    index.rebuild([
+        (1, "Website ONG", "Diseño web para la protección animal"),
+        (2, "Huerto urbano", "Plantación de árboles"),
+        (3, "Website escolar", "Website y formación en diseño"),
+    ])
+    
+    scores = index.search("website diseño")
+    
+    assert set(scores) == {1, 3}
+    assert scores[3] > scores[1]
+    assert index.search("inexistente") == {}
+
+
+def test_inverted_index_stays_stale_after_invalidation_during_rebuild():
+    """Test una escritura durante la reconstrucción deja el índice obsoleto"""
+    from app.utils.search import InvertedIndex
+    
+    index = InvertedIndex()
+    generation = index.generation
+    
+    def documents():
+        yield (1, "Website ONG", None)
+        #Escritura concurrente mientras se leen los documentos
+        index.invalidate()
+        yield (2, "Huerto urbano", None)
+    
+    index.rebuild(documents(), generation)
+    
+    assert index.stale
+    assert set(index.search("website huerto")) == {1, 2}
+    
+    index.rebuild([(1, "Website ONG", None)], index.generation)
+    assert not index.stale
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [5, 50])
+async def test_get_projects_include_fixed_query_count(db_session, page_size):
+    """Test include=skills,category cuesta como máximo 3 consultas por página"""
+    
+    category = CategoryFactory.create()
+    skills = SkillFactory.create_batch(3)
+    projects = ProjectFactory.create_batch(page_size)
+    for project in projects:
+        for skill in skills:
+            db_session.execute(insert(project_skills).values(project_id=project.id, skill_id=skill.id))
+    # Una relación eliminada no debe aparecer
+    db_session.execute(
+        project_skills.update()
+        .where(project_skills.c.project_id == projects[0].id, project_skills.c.skill_id == skills[0].id)
+        .values(deleted_at=datetime.now(timezone.utc))
+    )
+    db_session.flush()
+    db_session.expire_all()
+    set_params(Params(page=1, size=page_size))
+    
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db_session.bind, "before_cursor_execute", count_statement)
+    try:
+        result = await ProjectController.get_projects(db_session, include=frozenset({"skills", "category"}))
+        skills_per_project = {p.id: len(p.skills) for p in result.items}
+        categories = [p.category for p in result.items]
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", count_statement)
+    
+    assert len(result.items) == page_size
+    assert len(statements) <= 3
+    assert skills_per_project[projects[0].id] == 2
+    assert all(count == 3 for pid, count in skills_per_project.items() if pid != projects[0].id)
+    assert all(c is not None for c in categories)
+
+
+@pytest.mark.asyncio
+async def test_get_projects_invalid_include(db_session):
+    """Test include con relación desconocida devuelve 400"""
+    
+    with pytest.raises(HTTPException) as exc_info:
+        ProjectController.parse_include("skills,assignments")
+    
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_set_project_skills_replaces_set(db_session):
+    """Test PUT de skills: inserta nuevas, reactiva eliminadas y elimina las ausentes"""
+    
+    project = ProjectFactory.create()
+    skills = SkillFactory.create_batch(3)
+    ids = [s.id for s in skills]
+    
+    await ProjectController.set_project_skills(db_session, project.id, ids[:2])
+    await ProjectController.set_project_skills(db_session, project.id, ids[1:])
+    result = await ProjectController.set_project_skills(db_session, project.id, ids[:2])
+    
+    assert sorted(s.id for s in result.skills) == sorted(ids[:2])
+    rows = db_session.execute(project_skills.select().where(project_skills.c.project_id == project.id)).all()
+    assert len(rows) == 3
+    assert [r.skill_id for r in rows if r.deleted_at is not None] == [ids[2]]
+
+
+@pytest.mark.asyncio
+async def test_set_project_skills_unknown_skill(db_session):
+    """Test PUT de skills con una skill inexistente devuelve 404"""
+    
+    project = ProjectFactory.create()
+    
+    with pytest.raises(HTTPException) as exc_info:
+        await ProjectController.set_project_skills(db_session, project.id, [999999])
+    
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_upcoming_projects_window_and_order(db_session):
+    """Test próximos vencimientos: solo dentro de la ventana, por deadline y luego prioridad"""
+    
+    deadline = (datetime.now(timezone.utc) + timedelta(days=2)).replace(microsecond=0)
+    low = ProjectFactory.create(deadline=deadline, priority=Project_priority.low)
+    high = ProjectFactory.create(deadline=deadline, priority=Project_priority.high)
+    sooner = ProjectFactory.create(deadline=deadline - timedelta(days=1), priority=Project_priority.low)
+    ProjectFactory.create(deadline=deadline + timedelta(days=30))
+    ProjectFactory.create(deadline=deadline, status=Project_status.completed)
+    
+    result = await ProjectController.get_upcoming_projects(
+        db_session, 7, (Project_status.not_assigned, Project_status.assigned)
+    )
+    
+    assert [p.id for p in result.items] == [sooner.id, high.id, low.id]
+
+
+@pytest.mark.asyncio
+async def test_count_upcoming_projects_cached_until_write(db_session):
+    """Test contador cacheado: se reutiliza hasta que una escritura de proyectos lo invalida"""
+    
+    category = CategoryFactory.create()
+    ProjectFactory.create(deadline=datetime.now(timezone.utc) + timedelta(days=3))
+    
+    first = await ProjectController.count_upcoming_projects(db_session, 7)
+    ProjectFactory.create(deadline=datetime.now(timezone.utc) + timedelta(days=3))
+    cached = await ProjectController.count_upcoming_projects(db_session, 7)
+    
+    await ProjectController.create_project(db_session, project_schema.ProjectCreate(
+        name="Vence pronto",
+        deadline=datetime.now(timezone.utc) + timedelta(days=1),
+        category_id=category.id
+    ))
+    refreshed = await ProjectController.count_upcoming_projects(db_session, 7)
+    
+    assert first.count == 1
+    assert cached.count == 1
+    assert refreshed.count == 3
+
+
+def _pending_assignment(db_session, project):
+    """Asignación pendiente de un voluntario nuevo a una skill nueva del proyecto"""
+    from app.models.assignment_model import Assignment
+    from app.models.volunteer_skill_model import volunteer_skills
+    from app.tests.factories.volunteer_factory import VolunteerFactory
+    
+    skill = SkillFactory.create()
+    volunteer = VolunteerFactory.create()
+    ps_id = db_session.execute(insert(project_skills).values(project_id=project.id, skill_id=skill.id)).inserted_primary_key[0]
+    vs_id = db_session.execute(insert(volunteer_skills).values(volunteer_id=volunteer.id, skill_id=skill.id)).inserted_primary_key[0]
+    assignment = Assignment(project_skill_id=ps_id, volunteer_skill_id=vs_id)
+    db_session.add(assignment)
+    db_session.flush()
+    return assignment
+
+
+@pytest.mark.asyncio
+async def test_upcoming_count_and_stats_refresh_after_assignment_status_change(db_session):
+    """Test contador y estadísticas: un cambio de estado hecho desde una asignación los invalida"""
+    from app.controllers.assignment_controller import AssignmentController
+    from app.domain.assignment_enum import AssignmentStatus
+    
+    project = ProjectFactory.create(deadline=datetime.now(timezone.utc) + timedelta(days=3), status=Project_status.not_assigned)
+    assignment = _pending_assignment(db_session, project)
+    not_assigned = (Project_status.not_assigned,)
+    
+    before = await ProjectController.count_upcoming_projects(db_session, 7, not_assigned)
+    stats_before = await ProjectController.get_project_stats(db_session)
+    AssignmentController.update_status(db_session, assignment.id, AssignmentStatus.ACCEPTED)
+    after = await ProjectController.count_upcoming_projects(db_session, 7, not_assigned)
+    stats_after = await ProjectController.get_project_stats(db_session)
+    
+    assert before.count == 1
+    assert after.count == 0
+    assert stats_before.by_status["not assigned"] == 1
+    assert stats_after.by_status["assigned"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_project_refreshed_after_assignment_status_change(db_session):
+    """Test caché de entidades: el estado que cambia una asignación se ve en GET /projects/{id}"""
+    from app.controllers.assignment_controller import AssignmentController
+    from app.domain.assignment_enum import AssignmentStatus
+    
+    project = ProjectFactory.create(status=Project_status.not_assigned)
+    assignment = _pending_assignment(db_session, project)
+    
+    before = await ProjectController.get_project(db_session, project.id)
+    AssignmentController.update_status(db_session, assignment.id, AssignmentStatus.ACCEPTED)
+    after = await ProjectController.get_project(db_session, project.id)
+    
+    assert before.status == Project_status.not_assigned
+    assert after.status == Project_status.assigned
+
+
+@pytest.mark.asyncio
+async def test_get_project_stats_counts_and_coverage(db_session):
+    """Test estadísticas: conteos agrupados, vencidos y cobertura de skills"""
+    
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    overdue = ProjectFactory.create(deadline=past, status=Project_status.assigned, priority=Project_priority.high)
+    ProjectFactory.create(deadline=past, status=Project_status.completed)
+    ProjectFactory.create()
+    skill = SkillFactory.create()
+    db_session.execute(insert(project_skills).values(project_id=overdue.id, skill_id=skill.id))
+    db_session.flush()
+    
+    stats = await ProjectController.get_project_stats(db_session)
+    
+    assert stats.total == 3
+    assert stats.overdue == 1
+    assert stats.by_status == {"not assigned": 1, "assigned": 1, "completed": 1}
+    assert stats.by_priority["high"] == 1
+    assert sum(c.count for c in stats.by_category) == 3
+    assert stats.skill_coverage.projects_with_requirements == 1
+    assert stats.skill_coverage.covered_skills == 0
+
+
+@pytest.mark.asyncio
+async def test_admin_dashboard_aggregates_beyond_first_page(db_session):
+    """Test panel de admin: KPIs agregados sobre todas las filas, no solo las 100 primeras"""
+    from app.controllers.dashboard_controller import DashboardController
+    from app.tests.factories.volunteer_factory import VolunteerFactory
+    from app.domain.volunteer_enum import VolunteerStatus
+    
+    ProjectFactory.create_batch(101, status=Project_status.completed)
+    soon = ProjectFactory.create(deadline=datetime.now(timezone.utc) + timedelta(days=2), status=Project_status.assigned)
+    ProjectFactory.create(deadline=datetime.now(timezone.utc) - timedelta(days=1))
+    VolunteerFactory.create_batch(2)
+    VolunteerFactory.create(status=VolunteerStatus.suspended)
+    popular, other = SkillFactory.create(), SkillFactory.create()
+    db_session.execute(insert(project_skills).values([
+        {"project_id": soon.id, "skill_id": popular.id},
+        {"project_id": soon.id + 1, "skill_id": popular.id},
+        {"project_id": soon.id, "skill_id": other.id},
+    ]))
+    db_session.flush()
+    
+    summary = await DashboardController.get_admin_summary(db_session, 7)
+    
+    assert summary.projects.total == 103
+    assert summary.projects.active == 2
+    assert summary.projects.upcoming == 1
+    assert summary.projects.overdue == 1
+    assert summary.projects.by_status["completed"] == 101
+    assert (summary.volunteers.total, summary.volunteers.active) == (3, 2)
+    assert summary.skills.total == 2
+    assert [(s.id, s.projects) for s in summary.skills.most_used] == [(popular.id, 2), (other.id, 1)]
+    assert len(summary.recent_projects) == 5
+
+
+@pytest.mark.asyncio
+async def test_cached_count_with_joined_category(db_session, monkeypatch):
+    """Test conteo cacheado de listados que cargan la categoría con un join"""
+    from app.config.config_variables import settings
+    monkeypatch.setattr(settings, "COUNT_STRATEGIES", {"projects": "cached", "projects_upcoming": "cached"})
+    
+    ProjectFactory.create_batch(2, deadline=datetime.now(timezone.utc) + timedelta(days=2))
+    
+    listed = await ProjectController.get_projects(db_session, frozenset({"category"}))
+    upcoming = await ProjectController.get_upcoming_projects(db_session, 7)
+    
+    assert (listed.total, listed.count_strategy) == (2, "cached")
+    assert (upcoming.total, upcoming.count_strategy) == (2, "cached")
+
+
+def test_invalid_count_strategy_rejected_at_load():
+    """Test una estrategia de conteo mal escrita falla al cargar la configuración"""
+    from app.config.config_variables import _count_strategy
+    
+    assert _count_strategy(" cached ", "COUNT_STRATEGY") == "cached"
+    with pytest.raises(ValueError):
+        _count_strategy("cahced", "COUNT_STRATEGIES")
+
+
+@pytest.mark.asyncio
+async def test_get_projects_cursor_with_skills(db_session):
+    """Test paginación por cursor de proyectos con include=skills"""
+    
+    category = CategoryFactory.create()
+    first, second = ProjectFactory.create_batch(2)
+    ProjectFactory.create(deleted_at=datetime.now(timezone.utc))
+    
+    page = await ProjectController.get_projects_cursor(db_session, None, size=1, include=frozenset({"skills"}))
+    rest = await ProjectController.get_projects_cursor(db_session, page.next_cursor, size=10, include=frozenset({"skills"}))
+    
+    assert [p.id for p in page.items + rest.items] == [first.id, second.id]
+    assert rest.next_cursor is None
+    assert rest.items[0].skills == []
+
+
+@pytest.mark.asyncio
+async def test_get_projects_sparse_fields_selects_only_requested_columns(db_session):
+    """Test ?fields=: el SELECT solo trae las columnas pedidas y la respuesta solo esos campos"""
+    
+    category = CategoryFactory.create()
+    ProjectFactory.create_batch(2, category_id=category.id, description="x" * 1000)
+    db_session.expire_all()
+    
+    statements = []
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db_session.bind, "before_cursor_execute", count_statement)
+    try:
+        result = await ProjectController.get_projects(db_session, fields=("name", "category"))
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", count_statement)
+    
+    page_query = next(s for s in statements if "LIMIT" in s)
+    assert "projects.description" not in page_query
+    assert all(set(item.model_dump()) == {"name", "category"} for item in result.items)
+    assert all(item.category.id == category.id for item in result.items)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("native_upsert", [True, False])
+async def test_set_project_skills_adds_reactivates_and_removes(db_session, monkeypatch, native_upsert):
+    """Test sincronizar skills: con upsert nativo y con la vía portable de motores sin upsert"""
+    from app.utils import skill_links
+    
+    if not native_upsert:
+        monkeypatch.setattr(skill_links, "upsert_statement", lambda *args: None)
+    category = CategoryFactory.create()
+    project = ProjectFactory.create()
+    a, b, c = SkillFactory.create_batch(3)
+    
+    await ProjectController.set_project_skills(db_session, project.id, [a.id, b.id])
+    await ProjectController.set_project_skills(db_session, project.id, [b.id, c.id])
+    result = await ProjectController.set_project_skills(db_session, project.id, [a.id, c.id, c.id])
+    
+    assert sorted(s.id for s in result.skills) == sorted([a.id, c.id])
+    rows = db_session.execute(
+        project_skills.select().where(project_skills.c.project_id == project.id)
+    ).all()
+    #Una fila por skill: la reactivación no duplica
+    assert sorted((r.skill_id, r.deleted_at is None) for r in rows) == sorted(
+        [(a.id, True), (b.id, False), (c.id, True)]
+    )
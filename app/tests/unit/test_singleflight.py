@@ -0,0 +1,89 @@
+from app.controllers.project_controller import ProjectController
+from app.tests.factories.project_factory import ProjectFactory
+from app.tests.factories.category_factory import CategoryFactory
+
+
+def test_matching_volunteers_concurrent_requests_share_one_query(db_session):
+    """Test las peticiones de matching simultáneas esperan a la primera y comparten su resultado"""
+    import threading
+    import time
+    from app.utils.singleflight import SingleFlight
+    
+    category = CategoryFactory.create()
+    project = ProjectFactory.create(category_id=category.id)
+    group = SingleFlight("matching-test")
+    started, release = threading.Event(), threading.Event()
+    
+    def matching():
+        started.set()
+        release.wait(5)
+        return ProjectController.get_matching_volunteers(db_session, project.id)
+    
+    leader_result = []
+    leader = threading.Thread(target=lambda: leader_result.append(group.do(("matching", project.id), matching)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: group.do(("matching", project.id), matching)) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    while group.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for thread in (leader, *followers):
+        thread.join(5)
+    
+    stats = group.stats()
+    assert leader_result == [[]]
+    assert (stats["requests"], stats["executions"], stats["coalesced"]) == (4, 1, 3)
+    assert stats["coalescing_ratio"] == 0.75
+    assert stats["in_flight"] == 0
+
+
+def test_singleflight_result_ttl_dropped_on_commit(db_session):
+    """Test el resultado guardado se descarta en cuanto se escribe en la BD"""
+    from app.utils.singleflight import flight_group
+    
+    group = flight_group("projects-ttl-test", ttl=60)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    
+    assert group.do("key", compute) == 1
+    assert group.do("key", compute) == 1
+    CategoryFactory.create()
+    db_session.commit()
+    assert group.do("key", compute) == 2
+    assert group.stats()["cached"] == 1
+
+
+def test_singleflight_follower_timeout_after_release_returns_503(monkeypatch):
+    """Test quien esperaba tras liberar su sesión no calcula por su cuenta al vencer la espera: 503"""
+    import threading
+    import pytest
+    from fastapi import HTTPException
+    from app.config.config_variables import settings
+    from app.utils.singleflight import SingleFlight
+    
+    monkeypatch.setattr(settings, "SINGLEFLIGHT_WAIT_SECONDS", 0.05)
+    group = SingleFlight("timeout-test")
+    started, finish = threading.Event(), threading.Event()
+    calls, released = [], []
+    
+    def slow():
+        calls.append(1)
+        started.set()
+        finish.wait(5)
+        return "lento"
+    
+    leader = threading.Thread(target=lambda: group.do("key", slow))
+    leader.start()
+    started.wait(5)
+    
+    with pytest.raises(HTTPException) as exc:
+        group.do("key", slow, release=lambda: released.append(1))
+    finish.set()
+    leader.join(5)
+    
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+    assert released == [1]
+    assert calls == [1]
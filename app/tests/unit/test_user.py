@@ -86,6 +86,24 @@ def test_get_one_user_success(db_session):
     assert result.name == user.name
 
 
+def test_get_one_user_cache_does_not_store_password(db_session):
+    """Test la caché de entidades guarda el usuario sin el hash de la contraseña"""
+    from app.utils.entity_cache import get_entity_cache
+    
+    role = RoleFactory.default()
+    user = UserFactory.create()
+    
+    first = UserController.get_one_user(db_session, user.id)
+    second = UserController.get_one_user(db_session, user.id)
+    stored = get_entity_cache().backend.get(f"user:{user.id}:")
+    
+    assert not hasattr(first, "password")
+    assert second == first
+    assert stored is not None
+    assert b"password" not in stored
+    assert user.password.encode() not in stored
+
+
 def test_get_one_user_not_found(db_session):
     """Test cuando el usuario no existe"""
     
@@ -235,4 +253,126 @@ def test_delete_user_and_verify_not_in_list(db_session):
     
     result = UserController.get_users(db_session)
     assert len(result.items) == 1
-    assert result.items[0].id == user2.id
\ No newline at end of file
+    assert result.items[0].id == user2.id
+
+def test_get_users_cursor_walks_all_pages(db_session):
+    """Test paginación por cursor: recorre todos los usuarios activos sin repetir ni saltar"""
+    
+    role = RoleFactory.default()
+    users = UserFactory.create_batch(5)
+    users[2].deleted_at = datetime.now(timezone.utc)
+    db_session.flush()
+    
+    seen, cursor = [], None
+    while True:
+        page = UserController.get_users_cursor(db_session, cursor, size=2)
+        seen += [u.id for u in page.items]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    
+    expected = [u.id for u in users if u.deleted_at is None]
+    assert [i for i in seen if i in {u.id for u in users}] == expected
+    assert len(seen) == len(set(seen))
+    assert page.total is None
+
+
+def test_get_users_cursor_include_total(db_session):
+    """Test el total solo se calcula si se pide"""
+    
+    role = RoleFactory.default()
+    UserFactory.create_batch(3)
+    
+    page = UserController.get_users_cursor(db_session, None, size=1, include_total=True)
+    
+    assert len(page.items) == 1
+    assert page.total >= 3
+    assert page.next_cursor is not None
+
+
+@pytest.mark.parametrize("values", [[{"a": 1}], ["x"], [1.5], [None], [True]])
+def test_get_users_cursor_tampered_returns_400(db_session, values):
+    """Test un cursor manipulado con un valor que no es un id entero devuelve 400"""
+    from app.utils.cursor import encode_cursor
+    
+    with pytest.raises(HTTPException) as exc:
+        UserController.get_users_cursor(db_session, encode_cursor(values), size=2)
+    
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid cursor"
+
+
+def test_get_users_count_strategy_exact_by_default(db_session):
+    """Test sin configuración el total es exacto y la página lo indica"""
+    
+    role = RoleFactory.default()
+    UserFactory.create_batch(3)
+    
+    result = UserController.get_users(db_session)
+    
+    assert result.total == 3
+    assert result.count_strategy == "exact"
+
+
+def test_get_users_cached_count_invalidated_on_commit(db_session, monkeypatch):
+    """Test el total cacheado se invalida al confirmar cambios en la tabla"""
+    from app.config.config_variables import settings
+    monkeypatch.setattr(settings, "COUNT_STRATEGIES", {"users": "cached"})
+    
+    role = RoleFactory.default()
+    UserFactory.create_batch(2)
+    db_session.commit()
+    
+    first = UserController.get_users(db_session)
+    UserFactory.create_batch(1)
+    db_session.flush()
+    stale = UserController.get_users(db_session)
+    db_session.commit()
+    fresh = UserController.get_users(db_session)
+    
+    assert first.count_strategy == "cached"
+    assert first.total == 2
+    assert stale.total == 2
+    assert fresh.total == 3
+
+
+def test_get_users_estimated_count_falls_back_to_exact(db_session, monkeypatch):
+    """Test fuera de MySQL no hay estimación: el total es exacto"""
+    from app.config.config_variables import settings
+    monkeypatch.setattr(settings, "COUNT_STRATEGIES", {"users": "estimated"})
+    
+    role = RoleFactory.default()
+    UserFactory.create_batch(2)
+    
+    result = UserController.get_users(db_session)
+    
+    if db_session.get_bind().dialect.name == "mysql":
+        assert result.count_strategy == "estimated"
+    else:
+        assert result.count_strategy == "exact"
+        assert result.total == 2
+
+
+def test_get_users_sparse_fields(db_session):
+    """Test ?fields=: solo se devuelven los campos pedidos (sin la contraseña)"""
+    from app.utils.fieldsets import parse_fields
+    
+    role = RoleFactory.default()
+    UserFactory.create_batch(2)
+    fields = parse_fields("email, name", users_schema.UserOut)
+    
+    result = UserController.get_users(db_session, fields)
+    
+    assert fields == ("name", "email")
+    assert len(result.items) == 2
+    assert all(set(u.model_dump()) == {"name", "email"} for u in result.items)
+
+
+def test_get_users_sparse_fields_invalid():
+    """Test un campo que no existe en el esquema devuelve 400"""
+    from app.utils.fieldsets import parse_fields
+    
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("name,secret", users_schema.UserOut)
+    
+    assert exc.value.status_code == 400
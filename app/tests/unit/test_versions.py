@@ -0,0 +1,37 @@
+from app.controllers.category_controller import create_category
+from app.schemas.category_schemas import CategoryCreate
+
+
+def test_create_category_bumps_table_version(db_session):
+    """Test el commit de una escritura cambia la versión de la tabla y el ETag del listado"""
+    from starlette.requests import Request
+    from app.utils.versions import table_version, versioned_etag
+    
+    request = Request({"type": "http", "method": "GET", "path": "/categories/", "query_string": b"page=1&size=100", "headers": []})
+    before, etag = table_version("categories"), versioned_etag(("categories",), request)
+    
+    create_category(db_session, CategoryCreate(name="Versionada", description="d"))
+    
+    assert table_version("categories") > before
+    assert versioned_etag(("categories",), request) != etag
+
+
+def test_catalog_etag_sees_writes_from_other_workers_without_bus(db_session):
+    """Test sin bus el ETag sale de la BD: cambia aunque la escritura no pase por este proceso"""
+    from sqlalchemy import insert
+    from starlette.requests import Request
+    from app.models.category_model import Category
+    from app.utils.versions import versioned_etag
+    
+    request = Request({"type": "http", "method": "GET", "path": "/categories/", "query_string": b"", "headers": []})
+    local, shared = versioned_etag(("categories",), request), versioned_etag(("categories",), request, db_session)
+    
+    #Escritura de "otro worker": por la conexión, sin commit de la sesión ni aviso a los listeners
+    db_session.connection().execute(insert(Category.__table__).values(name="Remota", description="d"))
+    
+    assert versioned_etag(("categories",), request) == local
+    assert versioned_etag(("categories",), request, db_session) != shared
+    assert versioned_etag(("categories",), request, db_session) == versioned_etag(("categories",), request, db_session)
+    #Firma con resolución de segundos: ETag débil; los contadores del proceso son exactos
+    assert shared.startswith('W/"')
+    assert local.startswith('"')
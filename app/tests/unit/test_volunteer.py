@@ -6,7 +6,8 @@ from app.controllers.volunteer_controller import (
     delete_volunteer,
     get_volunteer_with_skills,
     add_skill_to_volunteer,
-    remove_skill_from_volunteer
+    remove_skill_from_volunteer,
+    set_volunteer_skills
 )
 from app.schemas.volunteer_schema import VolunteerCreate, VolunteerUpdate
 from datetime import datetime, timezone
@@ -226,6 +227,30 @@ def test_add_skill_volunteer_not_found(db_session):
     assert exc_info.value.status_code == 404
 
 
+def test_set_volunteer_skills_replaces_set(db_session):
+    """Test PUT de skills: el voluntario queda exactamente con las skills indicadas"""
+    
+    role = RoleFactory.default()
+    volunteer = VolunteerFactory.create()
+    skills = SkillFactory.create_batch(3)
+    
+    set_volunteer_skills(db_session, volunteer.id, [skills[0].id, skills[1].id])
+    result = set_volunteer_skills(db_session, volunteer.id, [skills[1].id, skills[2].id, skills[2].id])
+    
+    assert sorted(s.name for s in result.skills) == sorted([skills[1].name, skills[2].name])
+
+
+def test_set_volunteer_skills_volunteer_not_found(db_session):
+    """Test PUT de skills a voluntario inexistente"""
+    
+    role = RoleFactory.default()
+    
+    with pytest.raises(HTTPException) as exc_info:
+        set_volunteer_skills(db_session, 999, [])
+    
+    assert exc_info.value.status_code == 404
+
+
 # def test_add_skill_duplicate(db_session):
 #     """Test agregar skill duplicada"""
    
@@ -239,4 +264,40 @@ def test_add_skill_volunteer_not_found(db_session):
 #     with pytest.raises(HTTPException) as exc_info:
 #         add_skill_to_volunteer(db_session, volunteer.id, skill.id)
     
-#     assert exc_info.value.status_code == 409
\ No newline at end of file
+#     assert exc_info.value.status_code == 409
+
+@pytest.mark.asyncio
+async def test_volunteer_dashboard_counts_and_active_projects(db_session):
+    """Test panel del voluntario: conteos por estado, tasa de finalización y proyectos activos"""
+    from sqlalchemy import insert
+    from app.controllers.dashboard_controller import DashboardController
+    from app.domain.assignment_enum import AssignmentStatus
+    from app.domain.projects_enums import Project_status
+    from app.models.assignment_model import Assignment
+    from app.models.project_skill_model import project_skills
+    from app.models.volunteer_skill_model import volunteer_skills
+    from app.tests.factories.project_factory import ProjectFactory
+    
+    volunteer = VolunteerFactory.create()
+    used, unused = SkillFactory.create(), SkillFactory.create()
+    open_project = ProjectFactory.create(status=Project_status.assigned)
+    done_project = ProjectFactory.create(status=Project_status.completed)
+    vs_id = db_session.execute(insert(volunteer_skills).values(volunteer_id=volunteer.id, skill_id=used.id)).inserted_primary_key[0]
+    db_session.execute(insert(volunteer_skills).values(volunteer_id=volunteer.id, skill_id=unused.id))
+    ps_open = db_session.execute(insert(project_skills).values(project_id=open_project.id, skill_id=used.id)).inserted_primary_key[0]
+    ps_done = db_session.execute(insert(project_skills).values(project_id=done_project.id, skill_id=used.id)).inserted_primary_key[0]
+    db_session.add_all([
+        Assignment(project_skill_id=ps_open, volunteer_skill_id=vs_id, status=AssignmentStatus.ACCEPTED),
+        Assignment(project_skill_id=ps_done, volunteer_skill_id=vs_id, status=AssignmentStatus.COMPLETED),
+        Assignment(project_skill_id=ps_done, volunteer_skill_id=vs_id, status=AssignmentStatus.REJECTED),
+    ])
+    db_session.flush()
+    
+    summary = await DashboardController.get_volunteer_summary(db_session, volunteer.id, volunteer.status.value)
+    
+    assert summary.total_assignments == 3
+    assert summary.assignments_by_status == {"PENDING": 0, "ACCEPTED": 1, "REJECTED": 1, "COMPLETED": 1}
+    assert summary.completion_rate == 0.5
+    assert [p.id for p in summary.active_projects] == [open_project.id]
+    assert [(s.id, s.assignments) for s in summary.skills] == [(used.id, 3), (unused.id, 0)]
+    assert len(summary.recent_activity) == 3
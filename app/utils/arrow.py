@@ -0,0 +1,102 @@
+from typing import Iterable, Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import types as sa_types
+from sqlalchemy.sql.elements import ColumnElement
+
+ENUM_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def arrow_type(sa_type: sa_types.TypeEngine) -> pa.DataType:
+    '''Tipo Arrow equivalente a un tipo de columna SQLAlchemy'''
+    # Enum hereda de String: se comprueba antes
+    if isinstance(sa_type, sa_types.Enum):
+        return ENUM_TYPE
+    if isinstance(sa_type, sa_types.BigInteger):
+        return pa.int64()
+    if isinstance(sa_type, sa_types.SmallInteger):
+        return pa.int16()
+    if isinstance(sa_type, sa_types.Integer):
+        return pa.int64()
+    if isinstance(sa_type, sa_types.Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, sa_types.Numeric):
+        return pa.float64()
+    if isinstance(sa_type, sa_types.DateTime):
+        return pa.timestamp("us")
+    if isinstance(sa_type, sa_types.Date):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(columns: Iterable[ColumnElement]) -> pa.Schema:
+    '''Esquema tipado a partir de las columnas de una tabla o consulta'''
+    return pa.schema([
+        pa.field(column.name, arrow_type(column.type), nullable=getattr(column, "nullable", True))
+        for column in columns
+    ])
+
+
+def record_batch(schema: pa.Schema, rows: Sequence[tuple]) -> pa.RecordBatch:
+    '''Convierte un lote de tuplas (filas) en un RecordBatch columnar'''
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_string(field.type):
+            values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    '''Destino de escritura en memoria que se vacía tras cada lote (escritura en streaming)'''
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_arrow(schema: pa.Schema, batches: Iterable[pa.RecordBatch], fmt: str) -> Iterator[bytes]:
+    '''
+    Escribe los RecordBatch en formato Arrow IPC (stream) o Parquet y va
+    devolviendo los bytes producidos tras cada lote.
+    '''
+    sink = _ChunkSink()
+    stream = pa.PythonFile(sink, mode="w")
+
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(stream, schema, compression="snappy")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(stream, schema)
+        write = writer.write_batch
+
+    try:
+        for batch in batches:
+            write(batch)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+        stream.close()
+
+    data = sink.drain()
+    if data:
+        yield data
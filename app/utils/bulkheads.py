@@ -0,0 +1,162 @@
+import functools
+import inspect
+import threading
+import time
+from typing import AsyncIterator, Callable, Iterator
+
+import anyio
+from anyio.to_thread import run_sync
+from fastapi import HTTPException, status
+from fastapi.routing import APIRoute
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+
+logger = get_logger("Bulkheads") #logging
+
+# Compartimentos (bulkheads): cada grupo de endpoints síncronos corre en su propio
+# cupo de hilos en lugar del threadpool compartido de anyio. Un export lento solo
+# ocupa los hilos de "export"; login y los GET sencillos siguen teniendo los suyos.
+# Cupos en BULKHEADS="nombre=hilos/cola"; con la cola llena se responde 503.
+#
+# Qué cubre exactamente: el cuerpo de los endpoints síncronos del router y los
+# cuerpos de StreamingResponse que pasan por iterate(). Lo que NO cubre:
+#   - las dependencias síncronas (get_db esperando turno en el control de admisión,
+#     get_current_user...): FastAPI las resuelve antes de llamar al endpoint, en el
+#     threadpool compartido de anyio. Esas esperas las acota la admisión
+#     (ADMISSION_MAX_QUEUE / ADMISSION_MAX_WAIT_SECONDS), no el compartimento;
+#   - los endpoints async (p. ej. /projects, /dashboard, /batch): corren en el bucle
+#     de eventos y su trabajo bloqueante no pasa por ningún compartimento. Para
+#     aislarlos hay que hacerlos síncronos o usar get_bulkhead(nombre).run(...).
+# No se envuelven las dependencias porque FastAPI las identifica por la función
+# (caché por petición, dependency_overrides) y get_db es un generador.
+
+
+class Bulkhead:
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name, self.max_concurrent, self.max_queue = name, max_concurrent, max_queue
+        self.limiter = anyio.CapacityLimiter(max_concurrent)
+        self.queued = self.completed = self.rejected = 0
+        self.queue_time_total = self.queue_time_max = self.busy_time = 0.0
+        self._created = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _admit(self) -> float:
+        with self._lock:
+            if self.limiter.borrowed_tokens >= self.max_concurrent and self.queued >= self.max_queue:
+                self.rejected += 1
+                logger.warning(f"Bulkhead {self.name} full, rejecting request")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server busy, retry later",
+                    headers={"Retry-After": "1"}
+                )   #Service unavailable
+            self.queued += 1
+        return time.perf_counter()
+
+    def _timed(self, fn: Callable, submitted: float) -> Callable:
+        def run():
+            run.started = True
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                waited = started - submitted
+                self.queue_time_total += waited
+                self.queue_time_max = max(self.queue_time_max, waited)
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self.completed += 1
+                    self.busy_time += time.perf_counter() - started
+        run.started = False
+        return run
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        '''Ejecuta fn en un hilo de este compartimento'''
+        job = self._timed(functools.partial(fn, *args, **kwargs), self._admit())
+        try:
+            return await run_sync(job, limiter=self.limiter)
+        except anyio.get_cancelled_exc_class():
+            # Cancelada mientras esperaba hilo (cliente desconectado): sale de la cola
+            if not job.started:
+                with self._lock:
+                    self.queued -= 1
+            raise
+
+    async def iterate(self, iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+        '''Recorre un iterador síncrono (cuerpo de un StreamingResponse) en hilos de este compartimento'''
+        iterator = iter(iterator)
+        sentinel = object()
+        try:
+            while True:
+                chunk = await run_sync(next, iterator, sentinel, limiter=self.limiter)
+                if chunk is sentinel:
+                    break
+                yield chunk
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                await run_sync(close, limiter=self.limiter)
+
+    def wrap(self, endpoint: Callable) -> Callable:
+        '''Convierte un endpoint síncrono en uno async que se ejecuta en este compartimento'''
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return await self.run(endpoint, *args, **kwargs)
+        return wrapper
+
+    def stats(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self._created
+            started = self.completed + self.limiter.borrowed_tokens
+            return {
+                "name": self.name,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "active": self.limiter.borrowed_tokens,
+                "queued": self.queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_time_avg_ms": round(self.queue_time_total / started * 1000, 2) if started else 0.0,
+                "queue_time_max_ms": round(self.queue_time_max * 1000, 2),
+                "utilization": round(self.limiter.borrowed_tokens / self.max_concurrent, 4),
+                "busy_ratio": round(self.busy_time / (elapsed * self.max_concurrent), 4) if elapsed else 0.0,
+            }
+
+
+_bulkheads: dict[str, Bulkhead] = {}
+
+
+def get_bulkhead(name: str) -> Bulkhead:
+    '''Compartimento con nombre; los que no están en BULKHEADS usan los cupos de "default"'''
+    if name not in _bulkheads:
+        default = settings.BULKHEADS.get("default", (32, 64))
+        max_concurrent, max_queue = settings.BULKHEADS.get(name, default)
+        _bulkheads[name] = Bulkhead(name, max_concurrent, max_queue)
+    return _bulkheads[name]
+
+
+def bulkheads() -> list[Bulkhead]:
+    return list(_bulkheads.values())
+
+
+def bulkhead(name: str) -> Callable[[Callable], Callable]:
+    '''Decorador para asignar un endpoint concreto a un compartimento (debajo de @router.get)'''
+    return lambda endpoint: get_bulkhead(name).wrap(endpoint)
+
+
+def bulkhead_route(name: str) -> type[APIRoute]:
+    '''
+    route_class para APIRouter: el cuerpo de todos los endpoints síncronos del router
+    va al compartimento `name`. Los async (y los ya asignados con @bulkhead) no se
+    tocan, y las dependencias siguen en el threadpool compartido (ver arriba).
+    '''
+    class BulkheadRoute(APIRoute):
+        def __init__(self, path: str, endpoint: Callable, **kwargs):
+            if not inspect.iscoroutinefunction(endpoint):
+                endpoint = get_bulkhead(name).wrap(endpoint)
+            super().__init__(path, endpoint, **kwargs)
+
+    BulkheadRoute.__name__ = f"BulkheadRoute[{name}]"
+    return BulkheadRoute
@@ -0,0 +1,123 @@
+import functools
+import inspect
+import threading
+from collections import defaultdict
+
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+from app.utils.invalidation import publish, subscribe
+
+_lock = threading.RLock()
+_caches: dict[str, list[TTLCache]] = defaultdict(list)
+_generations: dict[str, int] = defaultdict(int)
+_named_caches: dict[str, TTLCache] = {}
+_MISSING = object()
+
+
+def _freeze(value):
+    '''Convierte listas/sets/dicts en valores hashables para usarlos como clave'''
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+def _make_key(args: tuple, kwargs: dict) -> tuple:
+    # La sesión de BD cambia en cada petición: no forma parte de la clave
+    return (
+        tuple(_freeze(a) for a in args if not isinstance(a, Session)),
+        tuple(sorted((k, _freeze(v)) for k, v in kwargs.items() if not isinstance(v, Session))),
+    )
+
+
+def ttl_cache(namespace: str, ttl: float, maxsize: int = 256):
+    '''
+    Memoiza el resultado de una función (síncrona o async) durante `ttl` segundos.
+    Las escrituras llaman a invalidate(namespace) para vaciar todas las cachés del espacio.
+    '''
+    def decorator(func):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        with _lock:
+            _caches[namespace].append(cache)
+
+        def lookup(key):
+            with _lock:
+                return cache.get(key, _MISSING), _generations[namespace]
+
+        def store(key, value, generation):
+            # Si hubo una invalidación mientras se calculaba, el valor ya es viejo
+            with _lock:
+                if _generations[namespace] == generation:
+                    cache[key] = value
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = _make_key(args, kwargs)
+                value, generation = lookup(key)
+                if value is _MISSING:
+                    value = await func(*args, **kwargs)
+                    store(key, value, generation)
+                return value
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = _make_key(args, kwargs)
+                value, generation = lookup(key)
+                if value is _MISSING:
+                    value = func(*args, **kwargs)
+                    store(key, value, generation)
+                return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def get_or_compute(namespace: str, key, compute, ttl: float, maxsize: int = 256):
+    '''
+    Igual que ttl_cache pero con la clave explícita, para valores que no dependen
+    solo de los argumentos de una función (por ejemplo, el SQL de una consulta).
+    '''
+    with _lock:
+        cache = _named_caches.get(namespace)
+        if cache is None:
+            cache = _named_caches[namespace] = TTLCache(maxsize=maxsize, ttl=ttl)
+            _caches[namespace].append(cache)
+        value, generation = cache.get(key, _MISSING), _generations[namespace]
+    if value is _MISSING:
+        value = compute()
+        with _lock:
+            if _generations[namespace] == generation:
+                cache[key] = value
+    return value
+
+
+def _clear(namespaces) -> None:
+    with _lock:
+        for namespace in namespaces:
+            _generations[namespace] += 1
+            for cache in _caches.get(namespace, ()):
+                cache.clear()
+
+
+def _on_invalidate(namespaces: tuple[str, ...]) -> None:
+    _clear(namespaces or list(_caches))
+
+
+subscribe("cache", _on_invalidate)
+
+
+def invalidate(*namespaces: str, broadcast: bool = True) -> None:
+    '''Vacía las cachés de los espacios indicados en todos los workers (llamar después del commit)'''
+    publish("cache", *namespaces, broadcast=broadcast)
+
+
+def clear_all() -> None:
+    '''Vacía todas las cachés registradas de este proceso (tests)'''
+    _clear(list(_caches))
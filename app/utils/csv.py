@@ -1,18 +1,38 @@
-import csv 
+import csv
 from io import StringIO
+from typing import Iterable, Iterator, Sequence
 
-def generate_csv(rows: list[dict]) -> str:
+BOM = "\ufeff"   # Excel reconoce UTF-8 con BOM
+
+
+def iter_csv(header: Sequence[str], batches: Iterable[Sequence[tuple]], chunk_size: int = 64 * 1024) -> Iterator[bytes]:
     """
-    Genera un archivo CSV a partir de una lista de diccionarios.
+    Genera un CSV en trozos de chunk_size caracteres a partir de lotes de tuplas.
+    La memoria no depende del tamaño de la tabla: como mucho un lote de entrada
+    convertido a texto (más la copia al partirlo) y el resto de menos de un trozo.
+    Con lotes grandes, la cota la marca el tamaño de lote de quien llama
+    (EXPORT_BATCH_SIZE en los exports), no chunk_size.
     """
-    if not rows:
-        return ""
-    
     buffer = StringIO()
     writer = csv.writer(buffer)
+    buffer.write(BOM)
     #encabezados
-    writer.writerow(rows[0].keys())
+    writer.writerow(header)
+
     #filas
-    for row in rows:
-        writer.writerow(row.values())
-    return buffer.getvalue()
\ No newline at end of file
+    for batch in batches:
+        writer.writerows(batch)
+        if buffer.tell() < chunk_size:
+            continue
+
+        # Trozos de tamaño fijo; el resto se queda para el siguiente lote
+        data = buffer.getvalue()
+        cut = len(data) - len(data) % chunk_size
+        for start in range(0, cut, chunk_size):
+            yield data[start:start + chunk_size].encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        buffer.write(data[cut:])
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_cursor(values: list) -> str:
+    '''Codifica la clave de la última fila devuelta en un cursor opaco'''
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+NUMBER = (int, float)
+
+
+def decode_cursor(cursor: str, size: int, types: tuple | None = None) -> list:
+    '''
+    Decodifica un cursor opaco; devuelve 400 si está corrupto. Con types (un tipo o
+    tupla de tipos por posición) comprueba también el tipo de cada valor, para que un
+    cursor fabricado a mano no llegue a comparaciones o consultas y acabe en un 500.
+    '''
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")     #Bad request
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")     #Bad request
+
+    # bool es subclase de int en Python, pero en JSON no es un número
+    if types is not None and any(
+        isinstance(value, bool) or not isinstance(value, expected)
+        for value, expected in zip(values, types)
+    ):
+        raise HTTPException(status_code=400, detail="Invalid cursor")     #Bad request
+    return values
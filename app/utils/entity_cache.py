@@ -0,0 +1,315 @@
+import functools
+import inspect
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Optional, Protocol
+
+from cachetools import TTLCache
+from pydantic import BaseModel
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.database.change_tracking import on_tables_changed
+from app.utils.invalidation import subscribe
+
+logger = get_logger("EntityCache") #logging
+
+# Caché de lectura (read-through) de entidades sueltas: skill, categoría, rol, usuario,
+# proyecto y voluntario por id. Se guarda el esquema de salida serializado (JSON), nunca
+# objetos ORM: sirve igual para un backend en memoria que para uno compartido entre
+# workers. Claves "entidad:id:variante"; cada commit vacía las entidades que dependen
+# de las tablas escritas (ENTITY_TABLES), sin llamadas a mano en los controladores.
+
+
+class CacheBackend(Protocol):
+    name: str
+
+    def get(self, key: str) -> Optional[bytes]: ...
+    def set(self, key: str, value: bytes) -> int: ...       # devuelve las entradas desalojadas
+    def delete_prefix(self, prefix: str) -> None: ...
+    def clear(self) -> None: ...
+    def size(self) -> tuple[int, int]: ...                  # (entradas, bytes)
+
+
+class _EvictionCountingCache(TTLCache):
+    # TTLCache es LRU + TTL: popitem solo se llama al desalojar por tamaño
+    evictions = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class MemoryBackend:
+    '''LRU con TTL en memoria del proceso (cada worker de uvicorn tiene la suya)'''
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = _EvictionCountingCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key: str, value: bytes) -> int:
+        with self._lock:
+            before = self._cache.evictions
+            self._cache[key] = value
+            return self._cache.evictions - before
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._cache.keys() if k.startswith(prefix)]:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def size(self) -> tuple[int, int]:
+        with self._lock:
+            self._cache.expire()
+            return len(self._cache), sum(len(v) for v in self._cache.values())
+
+
+class SqliteBackend:
+    '''
+    Almacén local compartido por todos los workers de la máquina: un fichero SQLite
+    en modo WAL (lecturas concurrentes). LRU por la columna used_at y TTL por expires_at.
+    '''
+    name = "sqlite"
+
+    def __init__(self, path: str, maxsize: int, ttl: float):
+        self.path, self.maxsize, self.ttl = path, maxsize, ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_used_at ON entries (used_at)")
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+        if row is None:
+            return None
+        conn.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes) -> int:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)", (key, value, now + self.ttl, now))
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        # Por encima de maxsize se borran las menos usadas recientemente
+        evicted = conn.execute(
+            "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,)
+        ).rowcount
+        return max(evicted, 0)
+
+    def delete_prefix(self, prefix: str) -> None:
+        # Rango sobre la clave primaria: prefix <= key < prefix con el último carácter + 1
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        self._conn().execute("DELETE FROM entries WHERE key >= ? AND key < ?", (prefix, upper))
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM entries")
+
+    def size(self) -> tuple[int, int]:
+        entries, size = self._conn().execute(
+            "SELECT count(*), coalesce(sum(length(value)), 0) FROM entries WHERE expires_at > ?", (time.time(),)
+        ).fetchone()
+        return entries, size
+
+
+class EntityCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        # Generación por entidad: un valor leído antes de una invalidación no se guarda
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def lookup(self, entity: str, key: str) -> tuple[Optional[bytes], int]:
+        with self._lock:
+            generation = self._generations[entity]
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value, generation
+
+    def store(self, entity: str, key: str, value: bytes, generation: int) -> None:
+        with self._lock:
+            if self._generations[entity] != generation:
+                return
+        evicted = self.backend.set(key, value)
+        with self._lock:
+            self.evictions += evicted
+            stale = self._generations[entity] != generation
+        # Una invalidación entre la comprobación y el set pudo borrar antes de que se
+        # escribiera: se vuelve a mirar la generación y se quita lo recién guardado
+        if stale:
+            self.backend.delete_prefix(key)
+
+    def invalidate(self, entity: str, ident=None) -> None:
+        with self._lock:
+            self._generations[entity] += 1
+            self.invalidations += 1
+        self.backend.delete_prefix(f"{entity}:" if ident is None else f"{entity}:{ident}:")
+
+    def clear(self) -> None:
+        with self._lock:
+            for entity in self._generations:
+                self._generations[entity] += 1
+            self.invalidations += 1
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        entries, size = self.backend.size()
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_cache: Optional[EntityCache] = None
+_cache_lock = threading.Lock()
+
+
+def _build_backend() -> Optional[CacheBackend]:
+    backend = settings.ENTITY_CACHE_BACKEND
+    if backend == "memory":
+        return MemoryBackend(settings.ENTITY_CACHE_MAXSIZE, settings.ENTITY_CACHE_TTL_SECONDS)
+    if backend == "sqlite":
+        return SqliteBackend(settings.ENTITY_CACHE_PATH, settings.ENTITY_CACHE_MAXSIZE, settings.ENTITY_CACHE_TTL_SECONDS)
+    if backend != "off":
+        logger.warning(f"Unknown ENTITY_CACHE_BACKEND {backend!r}, entity cache disabled")
+    return None
+
+
+def get_entity_cache() -> Optional[EntityCache]:
+    '''Caché configurada en ENTITY_CACHE_BACKEND (memory | sqlite | off); None si está desactivada'''
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                backend = _build_backend()
+                if backend is None:
+                    return None
+                _cache = EntityCache(backend)
+    return _cache
+
+
+def reset_entity_cache() -> None:
+    '''Vacía la caché y la vuelve a crear según la configuración (tests, cambio de backend)'''
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.backend.clear()
+        _cache = None
+
+
+def _on_invalidate(keys: tuple[str, ...]) -> None:
+    # Claves del bus: "entidad" o "entidad:id"; sin claves, toda la caché
+    cache = get_entity_cache()
+    if cache is None:
+        return
+    if not keys:
+        cache.clear()
+    for key in keys:
+        entity, _, ident = key.partition(":")
+        cache.invalidate(entity, ident or None)
+
+
+subscribe("entity", _on_invalidate)
+
+
+# Tabla escrita -> entidades cacheadas que se construyen a partir de ella
+ENTITY_TABLES: dict[str, tuple[str, ...]] = {
+    "projects": ("project",),
+    "project_skills": ("project",),         # ProjectWithRelationsOut incluye las skills
+    "categories": ("category", "project"),  # ... y la categoría
+    "skills": ("skill", "project"),
+    "role": ("role",),
+    "users": ("user",),
+    "volunteers": ("volunteer",),
+}
+
+
+@on_tables_changed
+def _invalidate_written_tables(tables: set[str]) -> None:
+    # También llega con las tablas escritas por otros workers (bus "tables")
+    cache = _cache
+    if cache is None:
+        return
+    for entity in {entity for table in tables for entity in ENTITY_TABLES.get(table, ())}:
+        cache.invalidate(entity)
+
+
+def cached_entity(entity: str, schema: type[BaseModel], key: Callable[..., Optional[tuple]]):
+    '''
+    Read-through para lecturas por id: en caso de acierto devuelve el esquema sin
+    consultar la BD; si no, llama a la función, valida el resultado con `schema`
+    y lo guarda. `key` recibe los mismos argumentos que la función y devuelve
+    (id, variante) o None para no usar la caché (p. ej. con ?fields=).
+    Los 404 no se cachean.
+    '''
+    def cache_key(args, kwargs) -> Optional[str]:
+        parts = key(*args, **kwargs)
+        return None if parts is None else f"{entity}:{parts[0]}:{parts[1]}"
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                cache, k = get_entity_cache(), cache_key(args, kwargs)
+                if cache is None or k is None:
+                    return await func(*args, **kwargs)
+                value, generation = cache.lookup(entity, k)
+                if value is not None:
+                    return schema.model_validate_json(value)
+                result = schema.model_validate(await func(*args, **kwargs))
+                cache.store(entity, k, result.model_dump_json().encode(), generation)
+                return result
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                cache, k = get_entity_cache(), cache_key(args, kwargs)
+                if cache is None or k is None:
+                    return func(*args, **kwargs)
+                value, generation = cache.lookup(entity, k)
+                if value is not None:
+                    return schema.model_validate_json(value)
+                result = schema.model_validate(func(*args, **kwargs))
+                cache.store(entity, k, result.model_dump_json().encode(), generation)
+                return result
+
+        return wrapper
+
+    return decorator
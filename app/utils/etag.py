@@ -0,0 +1,22 @@
+from typing import Optional
+
+
+def make_etag(version: str, weak: bool = False) -> str:
+    '''
+    ETag fuerte: mismo valor solo si los bytes son idénticos. Débil (W/): mismo
+    valor si el contenido es equivalente aunque los bytes puedan cambiar.
+    '''
+    return f'W/"{version}"' if weak else f'"{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    '''
+    Compara la cabecera If-None-Match con el ETag actual. Admite "*" y listas
+    separadas por comas; para If-None-Match la comparación es débil (se ignora W/).
+    '''
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
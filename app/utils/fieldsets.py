@@ -0,0 +1,53 @@
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import load_only
+
+from app.config.logging_config import get_logger
+
+logger = get_logger("Fieldsets") #logging
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[tuple[str, ...]]:
+    '''
+    Campos pedidos con ?fields=name,email. Se devuelven en el orden del esquema
+    (la misma selección escrita de otra forma reutiliza el mismo modelo recortado).
+    Sin parámetro devuelve None: respuesta completa.
+    '''
+    requested = {part.strip() for part in (fields or "").split(",") if part.strip()}
+    if not requested:
+        return None
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        logger.warning(f"Unknown fields for {schema.__name__}: {sorted(unknown)}")
+        raise HTTPException(status_code=400, detail=f"Invalid fields: {', '.join(sorted(unknown))}")    #Bad request
+    return tuple(name for name in schema.model_fields if name in requested)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    '''Copia del esquema con solo los campos pedidos; uno por combinación de campos'''
+    return create_model(
+        f"{schema.__name__}[{','.join(fields)}]",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields}
+    )
+
+
+def load_fields(entity, fields: tuple[str, ...]):
+    '''
+    load_only con las columnas pedidas: el SELECT solo trae esas columnas (la clave
+    primaria siempre se carga). Los campos que no son columnas (relaciones) se ignoran.
+    '''
+    columns = entity.__mapper__.column_attrs.keys()
+    return load_only(*(getattr(entity, name) for name in fields if name in columns), raiseload=True)
+
+
+def sparse_response(content: BaseModel) -> Response:
+    '''
+    Serializa la respuesta con el modelo recortado. Se salta response_model del
+    endpoint, que exigiría los campos que no se han pedido.
+    '''
+    return Response(content=content.model_dump_json(), media_type="application/json")
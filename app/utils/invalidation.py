@@ -0,0 +1,236 @@
+import json
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import or_
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.database.change_tracking import on_tables_changed, notify_tables_changed
+
+logger = get_logger("InvalidationBus") #logging
+
+# Bus de invalidación. Las cachés se suscriben a un espacio de nombres y reciben las
+# claves a borrar (tupla vacía = todo el espacio):
+#   tables -> tablas escritas (versiones de ETag, conteos, índice de búsqueda...)
+#   cache  -> espacios de ttl_cache / get_or_compute
+#   entity -> "entidad" o "entidad:id" de la caché de entidades
+# publish() reparte en el proceso y, si hay transporte, lo manda al resto de workers.
+
+Handler = Callable[[tuple[str, ...]], None]
+
+_handlers: defaultdict[str, list[Handler]] = defaultdict(list)
+_origin = secrets.token_hex(8)
+_remote = threading.local()     # True mientras se aplican eventos de otro worker
+
+
+def subscribe(namespace: str, handler: Handler) -> Handler:
+    _handlers[namespace].append(handler)
+    return handler
+
+
+def _deliver(namespace: str, keys: tuple[str, ...]) -> None:
+    for handler in _handlers.get(namespace, ()):
+        try:
+            handler(keys)
+        except Exception:
+            logger.exception(f"Invalidation handler failed for {namespace} {keys}")
+
+
+def publish(namespace: str, *keys: str, broadcast: bool = True) -> None:
+    '''
+    Invalida en este proceso y lo anuncia a los demás workers. Llamar después del commit.
+    broadcast=False para lo que ya se deriva de las tablas (los demás lo recalculan al recibirlas).
+    '''
+    _deliver(namespace, keys)
+    if broadcast:
+        _send(namespace, keys)
+
+
+def flush_all() -> None:
+    '''Vacía todas las cachés suscritas (sin anunciarlo): se usa cuando no se puede saber qué se perdió'''
+    for namespace in list(_handlers):
+        _deliver(namespace, ())
+
+
+@on_tables_changed
+def _broadcast_tables(tables: set[str]) -> None:
+    # Los listeners locales ya se han ejecutado en change_tracking
+    _send("tables", tuple(sorted(tables)))
+
+
+def _apply_tables(keys: tuple[str, ...]) -> None:
+    if not keys:
+        from app.database.database import Base
+        keys = tuple(Base.metadata.tables)
+    notify_tables_changed(set(keys))
+
+
+subscribe("tables", _apply_tables)
+
+
+class DatabaseTransport:
+    '''
+    Transporte sin broker: una fila por evento en cache_invalidations y un hilo por
+    worker que las escribe y sondea id > último visto cada `interval` segundos. Si un
+    sondeo falla se vacía todo, así ninguna lectura obsoleta dura más de
+    INVALIDATION_MAX_STALENESS_SECONDS.
+    '''
+
+    def __init__(self, engine, max_staleness: float, retention: float):
+        from app.models.cache_invalidation_model import cache_invalidations
+        self.engine, self.table = engine, cache_invalidations
+        self.max_staleness, self.retention = max_staleness, retention
+        self.interval = max_staleness / 2
+        self.floor = 0                          # id más alto leído
+        self._gaps: dict[int, float] = {}       # ids por debajo de floor aún no vistos -> cuándo se detectaron
+        self._outbox: deque[dict] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def send(self, namespace: str, keys: tuple[str, ...]) -> None:
+        # Se llama desde after_commit con la conexión de la sesión aún ocupada: pedir otra
+        # al pool aquí puede bloquear con el pool lleno. La fila la escribe el hilo del bus.
+        self._outbox.append({
+            "origin": _origin, "namespace": namespace, "keys": json.dumps(keys), "created_at": datetime.utcnow()
+        })
+        self._wake.set()
+
+    def flush(self) -> int:
+        '''Escribe los eventos pendientes en una sola transacción; devuelve cuántos'''
+        events = []
+        while self._outbox:
+            events.append(self._outbox.popleft())
+        if not events:
+            return 0
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), events)
+        except Exception:
+            # Los demás workers solo se enteran por estas filas (sus versiones de tabla no
+            # caducan): se devuelven al principio de la cola, en orden, y se reintentan
+            # en la siguiente vuelta del hilo
+            logger.exception(f"Could not publish {len(events)} invalidations, retrying")
+            self._outbox.extendleft(reversed(events))
+            return 0
+        return len(events)
+
+    def poll(self) -> int:
+        '''Aplica los eventos nuevos de otros workers (y los que llenan huecos); devuelve cuántos'''
+        table = self.table
+        condition = table.c.id > self.floor
+        if self._gaps:
+            condition = or_(condition, table.c.id.in_(list(self._gaps)))
+        with self.engine.connect() as conn:
+            rows = conn.execute(table.select().where(condition).order_by(table.c.id)).all()
+
+        applied = 0
+        top = self.floor
+        _remote.active = True
+        try:
+            for row in rows:
+                if row.id <= self.floor and self._gaps.pop(row.id, None) is None:
+                    continue
+                top = max(top, row.id)
+                if row.origin != _origin:
+                    _deliver(row.namespace, tuple(json.loads(row.keys)))
+                    applied += 1
+        finally:
+            _remote.active = False
+        self._track_gaps({row.id for row in rows if row.id > self.floor}, top)
+        return applied
+
+    def _track_gaps(self, seen: set[int], top: int) -> None:
+        # Con AUTO_INCREMENT un id menor puede hacerse visible después que uno mayor (el
+        # que lo reservó tarda en hacer commit): los ids que faltan se siguen buscando hasta
+        # que vencería su retención; pasado ese plazo se dan por transacción deshecha
+        now = time.monotonic()
+        for missing in range(self.floor + 1, top):
+            if missing not in seen:
+                self._gaps[missing] = now
+        self.floor = top
+        for missing, detected in list(self._gaps.items()):
+            if now - detected > self.retention:
+                del self._gaps[missing]
+
+    def prune(self) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.retention)
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.created_at < cutoff))
+
+    def start(self) -> None:
+        from sqlalchemy import func, select
+        with self.engine.connect() as conn:
+            self.floor = conn.execute(select(func.coalesce(func.max(self.table.c.id), 0))).scalar_one()
+        self._thread = threading.Thread(target=self._run, name="invalidation-bus", daemon=True)
+        self._thread.start()
+        logger.info(f"Invalidation bus started (origin {_origin}, poll every {self.interval}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        prune_every = max(int(self.retention / self.interval / 10), 1)
+        polls = 0
+        next_poll = time.monotonic() + self.interval
+        while not self._stop.is_set():
+            # Despierta al llegar eventos propios (se escriben al momento) o al tocar sondeo
+            self._wake.wait(max(next_poll - time.monotonic(), 0))
+            self._wake.clear()
+            self.flush()
+            if time.monotonic() < next_poll or self._stop.is_set():
+                continue
+            next_poll = time.monotonic() + self.interval
+            try:
+                self.poll()
+                polls += 1
+                if polls % prune_every == 0:
+                    self.prune()
+            except Exception:
+                logger.exception("Invalidation poll failed, flushing local caches")
+                flush_all()
+        self.flush()
+
+
+_transport: Optional[DatabaseTransport] = None
+
+
+def _send(namespace: str, keys: tuple[str, ...]) -> None:
+    if _transport is not None and not getattr(_remote, "active", False):
+        _transport.send(namespace, keys)
+
+
+def bus_running() -> bool:
+    '''True si las escrituras de otros workers llegan a este proceso'''
+    return _transport is not None
+
+
+def start_bus() -> None:
+    '''Arranca el transporte configurado en INVALIDATION_TRANSPORT (db | none); en el lifespan de la app'''
+    global _transport
+    if settings.INVALIDATION_TRANSPORT == "none" or _transport is not None:
+        return
+    if settings.INVALIDATION_TRANSPORT != "db":
+        logger.warning(f"Unknown INVALIDATION_TRANSPORT {settings.INVALIDATION_TRANSPORT!r}, bus is local only")
+        return
+    from app.database.database import engine
+    transport = DatabaseTransport(
+        engine, settings.INVALIDATION_MAX_STALENESS_SECONDS, settings.INVALIDATION_RETENTION_SECONDS
+    )
+    transport.start()
+    _transport = transport
+
+
+def stop_bus() -> None:
+    global _transport
+    if _transport is not None:
+        _transport.stop()
+        _transport = None
@@ -0,0 +1,43 @@
+from typing import Callable, Optional
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Query, Session
+
+from app.schemas.page_schema import CursorPage
+from app.utils.counting import count_total, fetch_all
+from app.utils.cursor import encode_cursor, decode_cursor
+
+
+def keyset_paginate(
+    db: Session,
+    query: Query | Select,
+    key,
+    cursor: Optional[str],
+    size: int,
+    transformer: Optional[Callable[[list], list]],
+    include_total: bool = False,
+    endpoint: Optional[str] = None,
+) -> CursorPage:
+    '''
+    Paginación por clave (keyset) sobre una columna entera, indexada y única (el id).
+    Cada página es un rango del índice (key > último visto, LIMIT size + 1): el coste
+    no depende de lo lejos que esté la página. El total solo si se pide, con la
+    estrategia de conteo del endpoint (COUNT_STRATEGIES). Acepta también un SELECT
+    Core: sin transformer los items son las filas tal cual.
+    '''
+    page_query = query.order_by(key)
+    if cursor:
+        (last,) = decode_cursor(cursor, 1, (int,))
+        page_query = page_query.filter(key > last)
+    rows = fetch_all(db, page_query.limit(size + 1))
+
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor([getattr(rows[-1], key.key)])
+
+    total = strategy = None
+    if include_total:
+        total, strategy = count_total(db, query, endpoint)
+
+    return CursorPage(items=transformer(rows) if transformer else rows, size=size, next_cursor=next_cursor, total=total, count_strategy=strategy)
@@ -0,0 +1,94 @@
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Iterable
+
+from app.database.change_tracking import on_tables_changed
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str | None) -> list[str]:
+    '''Normaliza (minúsculas, sin acentos) y separa el texto en palabras'''
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text.lower())
+    normalized = "".join(c for c in normalized if not unicodedata.combining(c))
+    return _TOKEN_RE.findall(normalized)
+
+
+class InvertedIndex:
+    """
+    Índice invertido en memoria para búsqueda de texto.
+    Se usa como alternativa a FULLTEXT cuando el motor no es MySQL (p. ej. SQLite en tests).
+    Se marca como obsoleto en cada escritura y se reconstruye en la siguiente búsqueda.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: dict[str, dict[int, int]] = {}
+        self._doc_count = 0
+        self._stale = True
+        self._generation = 0
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._stale = True
+
+    def rebuild(self, documents: Iterable[tuple[int, str | None, str | None]], generation: int | None = None):
+        '''
+        Reconstruye el índice a partir de tuplas (id, nombre, descripción).
+        generation es la que había antes de leer los documentos: si desde entonces
+        hubo una invalidación, el índice nuevo se usa pero sigue obsoleto.
+        '''
+        if generation is None:
+            generation = self._generation
+        postings: dict[str, dict[int, int]] = defaultdict(dict)
+        doc_count = 0
+
+        for doc_id, *fields in documents:
+            doc_count += 1
+            for token in tokenize(" ".join(f for f in fields if f)):
+                postings[token][doc_id] = postings[token].get(doc_id, 0) + 1
+
+        with self._lock:
+            self._postings = dict(postings)
+            self._doc_count = doc_count
+            if self._generation == generation:
+                self._stale = False
+
+    def search(self, query: str) -> dict[int, float]:
+        '''Devuelve {doc_id: puntuación tf-idf} para los documentos que contienen algún término'''
+        scores: dict[int, float] = defaultdict(float)
+
+        with self._lock:
+            for token in set(tokenize(query)):
+                docs = self._postings.get(token)
+                if not docs:
+                    continue
+                idf = math.log(1 + self._doc_count / len(docs))
+                for doc_id, tf in docs.items():
+                    scores[doc_id] += (1 + math.log(tf)) * idf
+
+        return dict(scores)
+
+
+project_search_index = InvertedIndex()
+
+
+@on_tables_changed
+def _invalidate_project_index(tables: set[str]) -> None:
+    # También llega por el bus cuando escribe otro worker
+    if "projects" in tables:
+        project_search_index.invalidate()
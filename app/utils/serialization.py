@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row, Select, select
+from typing_extensions import TypedDict
+
+
+@lru_cache(maxsize=64)
+def row_adapter(schema: type[BaseModel]) -> TypeAdapter:
+    '''
+    TypeAdapter de list[TypedDict] con los campos del esquema. Serializa las filas
+    de la BD (ya validadas al escribirse) directamente a JSON en pydantic-core, con
+    el mismo formato que el esquema pero sin construir un modelo por fila.
+    '''
+    row_type = TypedDict(f"{schema.__name__}Row", {name: field.annotation for name, field in schema.model_fields.items()})
+    return TypeAdapter(list[row_type])
+
+
+def schema_select(entity, schema: type[BaseModel]) -> Select:
+    '''SELECT Core con exactamente las columnas del esquema de salida (sin objetos ORM)'''
+    table = entity.__table__
+    return select(*(table.c[name] for name in schema.model_fields))
+
+
+def dump_rows(schema: type[BaseModel], rows: list[Row]) -> bytes:
+    return row_adapter(schema).dump_json([row._asdict() for row in rows])
+
+
+def rows_page_response(page: BaseModel, schema: type[BaseModel], headers: Optional[dict] = None) -> ORJSONResponse:
+    '''
+    Respuesta de una página cuyos items son filas Core. Los items se serializan con
+    row_adapter y se insertan tal cual (orjson.Fragment) en el JSON de la página;
+    se salta la validación de response_model, que volvería a recorrer cada fila.
+    '''
+    items = orjson.Fragment(dump_rows(schema, page.items))
+    return ORJSONResponse({"items": items, **page.model_dump(mode="json", exclude={"items"})}, headers=headers)
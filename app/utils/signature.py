@@ -0,0 +1,26 @@
+import hashlib
+from typing import Iterable
+
+from sqlalchemy import Table, func, select
+from sqlalchemy.orm import Session
+
+
+def tables_signature(db: Session, tables: Iterable[Table]) -> str:
+    '''
+    Firma barata del contenido de unas tablas: por cada una, número de filas, id máximo,
+    updated_at máximo y filas borradas (soft delete). Cambia con cualquier alta, baja o
+    modificación y es la misma en todos los workers, porque sale de la BD.
+    updated_at tiene resolución de segundos: dos ediciones en el mismo segundo que
+    no cambian el número de filas se ven hasta la siguiente modificación.
+    '''
+    parts = []
+    for table in tables:
+        columns = [func.count(), func.max(table.c.id)]
+        if "updated_at" in table.c:
+            columns.append(func.max(table.c.updated_at))
+        if "deleted_at" in table.c:
+            # Las tablas de relación no tienen updated_at: el soft delete se ve aquí
+            columns.append(func.count(table.c.deleted_at))
+        values = db.execute(select(*columns).select_from(table)).one()
+        parts.append(f"{table.name}:" + ",".join(str(v) for v in values))
+    return hashlib.sha256(";".join(parts).encode()).hexdigest()
@@ -0,0 +1,179 @@
+import threading
+from typing import Any, Callable, Optional
+
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.config.logging_config import get_logger
+from app.controllers.auth_controller import get_current_user
+from app.database.change_tracking import on_tables_changed
+from app.database.database import get_db, release_db
+from app.models.users_model import User
+
+logger = get_logger("SingleFlight") #logging
+
+# Coalescencia de lecturas caras: las peticiones idénticas que llegan mientras otra
+# igual está en curso esperan a esa y comparten su resultado (o su excepción) en
+# lugar de lanzar la misma consulta N veces. Opcionalmente el resultado se guarda
+# unos segundos (SINGLEFLIGHT_TTL_SECONDS); cualquier commit lo descarta.
+
+
+def retry_later() -> HTTPException:
+    # Quien esperaba ya devolvió su sesión y su plaza de admisión: no puede calcularlo
+    # por su cuenta sin ellas, así que se le pide que vuelva a intentarlo
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, retry later",
+        headers={"Retry-After": "1"}
+    )   #Service unavailable
+
+
+class Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        if not self.done.wait(timeout):
+            raise TimeoutError("In-flight computation did not finish in time")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    def __init__(self, name: str, ttl: float = 0, maxsize: int = 256):
+        self.name = name
+        self._flights: dict[Any, Flight] = {}
+        self._results: Optional[TTLCache] = TTLCache(maxsize=maxsize, ttl=ttl) if ttl > 0 else None
+        self._lock = threading.Lock()
+        self.requests = self.executions = self.coalesced = self.cached = 0
+
+    def begin(self, key) -> tuple[Flight, bool]:
+        '''Devuelve el vuelo en curso para la clave y si quien llama es el líder (debe llamar a finish)'''
+        with self._lock:
+            self.requests += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = Flight()
+            self.executions += 1
+            return flight, True
+
+    def finish(self, key, flight: Flight, result: Any = None, error: Optional[BaseException] = None) -> None:
+        flight.result, flight.error = result, error
+        with self._lock:
+            # Tras un commit el vuelo ya se soltó: su resultado no se guarda
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+                if error is None and self._results is not None:
+                    self._results[key] = result
+        flight.done.set()
+
+    def do(self, key, fn: Callable[[], Any], release: Optional[Callable[[], None]] = None) -> Any:
+        '''
+        Ejecuta fn una sola vez por clave entre las llamadas simultáneas. `release` se
+        llama antes de esperar (p. ej. devolver la sesión de la BD y su plaza de admisión).
+        Si el vuelo no termina en SINGLEFLIGHT_WAIT_SECONDS se suelta; quien esperaba
+        lo calcula por su cuenta, salvo que haya liberado la sesión: entonces 503.
+        '''
+        if self._results is not None:
+            with self._lock:
+                if key in self._results:
+                    self.requests += 1
+                    self.cached += 1
+                    return self._results[key]
+
+        flight, leader = self.begin(key)
+        if not leader:
+            if release is not None:
+                release()
+            try:
+                return flight.wait(settings.SINGLEFLIGHT_WAIT_SECONDS)
+            except TimeoutError:
+                self.abandon(key, flight)
+                if release is not None:
+                    logger.warning(f"{self.name}: in-flight request {key} is too slow, asking to retry")
+                    raise retry_later()
+                logger.warning(f"{self.name}: in-flight request {key} is too slow, computing it again")
+                return fn()
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(key, flight, error=e)
+            raise
+        self.finish(key, flight, result)
+        return result
+
+    def abandon(self, key, flight: Flight) -> None:
+        '''Suelta un vuelo que no termina (el líder murió o no llegó a empezar) para no bloquear a los siguientes'''
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def forget(self) -> None:
+        '''Suelta los vuelos en curso y los resultados guardados: las nuevas peticiones vuelven a la BD'''
+        with self._lock:
+            self._flights.clear()
+            if self._results is not None:
+                self._results.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            shared = self.coalesced + self.cached
+            return {
+                "name": self.name,
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "cached": self.cached,
+                "in_flight": len(self._flights),
+                "coalescing_ratio": round(shared / self.requests, 4) if self.requests else 0.0,
+            }
+
+
+_groups: dict[str, SingleFlight] = {}
+
+
+def flight_group(name: str, ttl: Optional[float] = None) -> SingleFlight:
+    '''Grupo con nombre (uno por endpoint); sus métricas salen en GET /metrics/coalescing'''
+    if name not in _groups:
+        _groups[name] = SingleFlight(name, settings.SINGLEFLIGHT_TTL_SECONDS if ttl is None else ttl)
+    return _groups[name]
+
+
+def flight_groups() -> list[SingleFlight]:
+    return list(_groups.values())
+
+
+@on_tables_changed
+def _forget_flights(tables: set[str]) -> None:
+    # Quien escribe no debe recibir un resultado calculado antes de su commit
+    for group in _groups.values():
+        group.forget()
+
+
+def request_key(request: Request, scope: Any = None) -> tuple:
+    '''Ruta + parámetros de la query normalizados (orden indiferente) + ámbito de autorización'''
+    return request.url.path, tuple(sorted(request.query_params.multi_items())), scope
+
+
+def coalesced(group: SingleFlight) -> Callable[..., Callable[[Callable[[], Any]], Any]]:
+    '''
+    Dependencia para endpoints síncronos: devuelve `run(fn)` que coalesce fn con las
+    peticiones idénticas del mismo rol. La respuesta no debe depender del usuario
+    concreto, solo de su rol.
+    '''
+    def dependency(
+        request: Request,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ) -> Callable[[Callable[[], Any]], Any]:
+        key = request_key(request, ("role", current_user.role_id))
+        return lambda fn: group.do(key, fn, release=lambda: release_db(db))
+
+    return dependency
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import Table, insert, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def upsert_statement(db: Session, table: Table, rows: list[dict], conflict_columns: list[str], values: dict):
+    '''
+    Construye un único INSERT multi-fila que actualiza `values` si la fila ya existe.
+    MySQL: ON DUPLICATE KEY UPDATE. SQLite/PostgreSQL: ON CONFLICT DO UPDATE.
+    Devuelve None si el motor no tiene upsert: quien llama usa la vía portable.
+    '''
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        return mysql_insert(table).values(rows).on_duplicate_key_update(**values)
+    if dialect == "sqlite":
+        return sqlite_insert(table).values(rows).on_conflict_do_update(index_elements=conflict_columns, set_=values)
+    if dialect == "postgresql":
+        return postgresql_insert(table).values(rows).on_conflict_do_update(index_elements=conflict_columns, set_=values)
+
+    return None
+
+
+def _upsert_portable(db: Session, table: Table, owner_column: str, owner_id: int, skill_ids: list[int]) -> None:
+    # Sin upsert nativo: reactiva las existentes, lee cuáles hay e inserta el resto.
+    # Dos sincronizaciones simultáneas del mismo propietario pueden chocar en la
+    # restricción única (IntegrityError, 409 en los controladores) en lugar de fundirse.
+    owner = table.c[owner_column]
+    linked = (owner == owner_id, table.c.skill_id.in_(skill_ids))
+    db.execute(update(table).where(*linked).values(deleted_at=None))
+    existing = set(db.execute(select(table.c.skill_id).where(*linked)).scalars())
+    missing = [skill_id for skill_id in skill_ids if skill_id not in existing]
+    if missing:
+        db.execute(insert(table), [{owner_column: owner_id, "skill_id": skill_id} for skill_id in missing])
+
+
+def sync_skill_links(db: Session, table: Table, owner_column: str, owner_id: int, skill_ids: list[int]) -> None:
+    '''
+    Deja en `table` exactamente las skills indicadas como activas para el propietario.
+    Dos sentencias: un upsert que inserta las nuevas y reactiva las eliminadas,
+    y un UPDATE que hace soft-delete del resto (en motores sin upsert, tres para
+    la primera parte). No hace commit.
+    '''
+    desired = sorted(set(skill_ids))
+    owner = table.c[owner_column]
+
+    if desired:
+        rows = [{owner_column: owner_id, "skill_id": skill_id, "deleted_at": None} for skill_id in desired]
+        stmt = upsert_statement(db, table, rows, [owner_column, "skill_id"], {"deleted_at": None})
+        if stmt is not None:
+            db.execute(stmt)
+        else:
+            _upsert_portable(db, table, owner_column, owner_id, desired)
+
+    remove = update(table).where(owner == owner_id, table.c.deleted_at.is_(None))
+    if desired:
+        remove = remove.where(table.c.skill_id.not_in(desired))
+    db.execute(remove.values(deleted_at=datetime.utcnow()))
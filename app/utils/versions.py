@@ -0,0 +1,84 @@
+import hashlib
+import secrets
+import threading
+from collections import defaultdict
+from typing import Callable
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.orm import Session
+
+from app.config.config_variables import settings
+from app.database.change_tracking import on_tables_changed
+from app.database.database import Base, get_db
+from app.utils.etag import make_etag, etag_matches
+from app.utils.invalidation import bus_running
+from app.utils.signature import tables_signature
+from app.utils.security import decode_access_token
+from app.controllers.auth_controller import security
+
+# Contador de versión por tabla: sube con cada commit que escribe en ella (sea desde
+# los controladores, la importación o un script). Vive en memoria del proceso; la
+# época aleatoria hace que un ETag emitido antes de reiniciar no coincida nunca.
+# Solo sirve para el ETag cuando el bus de invalidación trae las escrituras de los
+# demás workers; sin bus el ETag sale de la firma de las tablas en la BD.
+_epoch = secrets.token_hex(4)
+_versions: defaultdict[str, int] = defaultdict(int)
+_lock = threading.Lock()
+
+
+def table_version(table: str) -> int:
+    return _versions[table]
+
+
+def bump(*tables: str) -> None:
+    with _lock:
+        for table in tables:
+            _versions[table] += 1
+
+
+@on_tables_changed
+def _bump_versions(tables: set[str]) -> None:
+    bump(*tables)
+
+
+def versioned_etag(tables: tuple[str, ...], request: Request, db: Session | None = None) -> str:
+    '''
+    ETag a partir del estado de las tablas y la URL (ruta + query: página, tamaño...).
+    Con el bus en marcha usa los contadores del proceso (sin consultas). Sin bus otro
+    worker puede haber escrito sin que este se entere, así que usa la firma de las
+    tablas en la BD (una agregación por tabla); es la misma en todos los workers.
+    Esa firma ve updated_at al segundo, así que ese ETag es débil (W/), como el de
+    los exports: dos ediciones en el mismo segundo pueden compartirlo.
+    '''
+    from_db = db is not None and not bus_running()
+    if from_db:
+        state = tables_signature(db, [Base.metadata.tables[table] for table in tables])
+    else:
+        state = _epoch + ":" + ",".join(f"{table}={table_version(table)}" for table in tables)
+    digest = hashlib.sha256(f"{state}:{request.url.path}?{request.url.query}".encode()).hexdigest()
+    return make_etag(digest[:24], weak=from_db)
+
+
+def versioned(*tables: str, admin_only: bool = False) -> Callable[..., dict]:
+    '''
+    Dependencia para GETs de catálogos (skills, categorías, roles). Debe ir la primera
+    en la firma del endpoint: si If-None-Match coincide con la versión actual responde
+    304 solo con el token JWT, antes de que get_current_user consulte la BD.
+    Devuelve las cabeceras ETag / Cache-Control para la respuesta 200.
+    '''
+    def dependency(
+        request: Request,
+        credentials: HTTPAuthorizationCredentials = Depends(security),
+        db: Session = Depends(get_db)
+    ) -> dict:
+        etag = versioned_etag(tables, request, db)
+        headers = {"ETag": etag, "Cache-Control": f"private, max-age={settings.CATALOG_MAX_AGE_SECONDS}"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            payload = decode_access_token(credentials.credentials)
+            # Con token inválido o sin permisos se sigue el camino normal (401/403)
+            if payload and (not admin_only or payload.get("role_id") == 1):
+                raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)    #Not modified
+        return headers
+
+    return dependency
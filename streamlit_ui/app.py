@@ -146,26 +146,21 @@ def show_dashboard_admin():
         return show_create_skill_form()
     
     try:
-        # Obtener datos
-        volunteers_response = api_client.get_volunteers(size=100)
-        projects_response = api_client.get_projects(size=100)
-        skills_response = api_client.get_skills(size=100)
-        
-        volunteers = volunteers_response.get('items', [])
-        projects = projects_response.get('items', [])
-        skills = skills_response.get('items', [])
+        # Obtener KPIs (agregados en el servidor)
+        summary = api_client.get_admin_dashboard()
+        projects = summary.get('recent_projects', [])
         
         # KPIs
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("👤 Voluntarios", len(volunteers))
+            st.metric("👤 Voluntarios", summary.get('volunteers', {}).get('total', 0))
         with col2:
-            st.metric("📋 Proyectos", len(projects))
+            st.metric("📋 Proyectos", summary.get('projects', {}).get('total', 0))
         with col3:
-            st.metric("🛠️ Skills", len(skills))
+            st.metric("🛠️ Skills", summary.get('skills', {}).get('total', 0))
         with col4:
-            st.metric("🔄 Activos", len([p for p in projects if p.get('status') in ['not_assigned', 'assigned', 'in_progress']]))
+            st.metric("🔄 Activos", summary.get('projects', {}).get('active', 0))
         
         # ACCIONES RÁPIDAS - BOTONES FUNCIONALES
         st.markdown("---")
@@ -201,11 +196,11 @@ def show_dashboard_admin():
                 with st.expander(f"📋 {project.get('name', 'N/A')}"):
                     col1, col2 = st.columns(2)
                     with col1:
-                        st.write(f"📝 {project.get('description', 'N/A')[:100]}...")
-                        st.write(f"📅 Inicio: {format_date(project.get('start_date'))}")
+                        st.write(f"📅 Creado: {format_date(project.get('created_at'))}")
+                        st.write(f"🔥 Prioridad: {status_badge(project.get('priority'))}")
                     with col2:
                         st.write(f"🎯 Estado: {status_badge(project.get('status'))}")
-                        st.write(f"📅 Fin: {format_date(project.get('end_date'))}")
+                        st.write(f"📅 Fin: {format_date(project.get('deadline'))}")
         else:
             st.info("No hay proyectos para mostrar")
     
@@ -37,6 +37,44 @@ class APIClient:
         response.raise_for_status() 
         return response.json()
     
+    def _get_revalidated(self, endpoint: str) -> Dict:
+        """GET condicional para catálogos: reenvía el ETag guardado y, si la API
+        responde 304, reutiliza la respuesta anterior (la API no consulta la BD)"""
+        cache = st.session_state.setdefault("etag_cache", {})
+        cached = cache.get(endpoint)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        
+        response = requests.get(f"{self.base_url}{endpoint}", headers={**headers, **self._get_headers()})
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if response.status_code == 401:
+            st.session_state.clear()
+            return {"error": "unauthorized"}
+        
+        response.raise_for_status()
+        data = response.json()
+        if response.headers.get("ETag"):
+            cache[endpoint] = (response.headers["ETag"], data)
+        return data
+    
+    def batch(self, requests_by_id: Dict[str, str]) -> Dict[str, Any]:
+        """Varias lecturas en una sola llamada (POST /batch): {id: ruta} -> {id: cuerpo}.
+        Las sub-peticiones que fallan devuelven {"error": estado, "detail": ...}"""
+        payload = {"requests": [{"id": key, "path": path} for key, path in requests_by_id.items()]}
+        data = self._make_request("POST", "/batch", json=payload)
+        if "responses" not in data:
+            return {key: data for key in requests_by_id}
+        
+        results = {}
+        for item in data["responses"]:
+            body = item.get("body")
+            if item["status"] >= 400:
+                detail = body.get("detail") if isinstance(body, dict) else body
+                results[item["id"]] = {"error": item["status"], "detail": detail}
+            else:
+                results[item["id"]] = body
+        return results
+    
     # Autenticación
     def login(self, email: str, password: str) -> Dict:
         return self._make_request("POST", "/auth/login", json={"email": email, "password": password})
@@ -59,8 +97,10 @@ class APIClient:
             return {}
     
     # Users
-    def get_users(self, page: int = 1, size: int = 50) -> Dict:
-        return self._make_request("GET", f"/users/?page={page}&size={size}")
+    def get_users(self, page: int = 1, size: int = 50, fields: Optional[str] = None) -> Dict:
+        """fields: campos a devolver separados por comas (p. ej. "id,name,email")"""
+        params = {"page": page, "size": size, **({"fields": fields} if fields else {})}
+        return self._make_request("GET", "/users/", params=params)
     
     def get_user(self, user_id: int) -> Dict:
         return self._make_request("GET", f"/users/{user_id}")
@@ -72,8 +112,10 @@ class APIClient:
         return self._make_request("GET", f"/users/email/{email}")
     
     # Volunteers
-    def get_volunteers(self, page: int = 1, size: int = 50) -> Dict:
-        return self._make_request("GET", f"/volunteers/?page={page}&size={size}")
+    def get_volunteers(self, page: int = 1, size: int = 50, fields: Optional[str] = None) -> Dict:
+        """fields: campos a devolver separados por comas (p. ej. "id,user_id,status")"""
+        params = {"page": page, "size": size, **({"fields": fields} if fields else {})}
+        return self._make_request("GET", "/volunteers/", params=params)
     
     def get_volunteer(self, user_id: int) -> Dict:
         return self._make_request("GET", f"/volunteers/{user_id}")
@@ -97,8 +139,36 @@ class APIClient:
     def update_project(self, project_id: int, data: Dict) -> Dict:
         return self._make_request("PUT", f"/projects/{project_id}", json=data)
     
-    def get_projects(self, page: int = 1, size: int = 50) -> Dict:
-        return self._make_request("GET", f"/projects/?page={page}&size={size}")
+    def get_projects(self, page: int = 1, size: int = 50, fields: Optional[str] = None) -> Dict:
+        """fields: campos a devolver separados por comas (p. ej. "id,name,status")"""
+        params = {"page": page, "size": size, **({"fields": fields} if fields else {})}
+        return self._make_request("GET", "/projects/", params=params)
+    
+    def search_projects(self, params: Dict) -> Dict:
+        """Búsqueda de proyectos en el servidor (texto + filtros, paginada por cursor)"""
+        return self._make_request("GET", "/projects/search", params=params)
+    
+    def get_project_stats(self) -> Dict:
+        """Conteos por estado/prioridad/categoría, vencidos y cobertura de skills"""
+        return self._make_request("GET", "/projects/stats")
+    
+    def get_admin_dashboard(self, within_days: int = 7) -> Dict:
+        """KPIs del panel de administración agregados (y cacheados) en el servidor"""
+        return self._make_request("GET", "/dashboard/admin", params={"within_days": within_days})
+    
+    def get_my_dashboard(self) -> Dict:
+        """Resumen del voluntario del token: skills, asignaciones por estado, proyectos activos y actividad reciente"""
+        return self._make_request("GET", "/dashboard/me")
+    
+    def get_upcoming_projects(self, within_days: int = 7, status: Optional[List[str]] = None, page: int = 1, size: int = 50) -> Dict:
+        """Proyectos que vencen en los próximos días, ordenados por fecha límite y prioridad"""
+        params = {"within_days": within_days, "status": status or [], "page": page, "size": size}
+        return self._make_request("GET", "/projects/upcoming", params=params)
+    
+    def get_upcoming_projects_count(self, within_days: int = 7, status: Optional[List[str]] = None) -> Dict:
+        """Contador cacheado de próximos vencimientos (para KPIs)"""
+        params = {"within_days": within_days, "status": status or []}
+        return self._make_request("GET", "/projects/upcoming/count", params=params)
     
     def create_project(self, project_data: Dict) -> Dict:
         return self._make_request("POST", "/projects/", json=project_data)
@@ -111,7 +181,7 @@ class APIClient:
     
     # Skills
     def get_skills(self, page: int = 1, size: int = 50) -> Dict:
-        return self._make_request("GET", f"/skills/?page={page}&size={size}")
+        return self._get_revalidated(f"/skills/?page={page}&size={size}")
     
     def create_skill(self, skill_data: Dict) -> Dict:
         return self._make_request("POST", "/skills/", json=skill_data)
@@ -121,7 +191,7 @@ class APIClient:
     
     # Categories
     def get_categories(self, page: int = 1, size: int = 50) -> Dict:
-        return self._make_request("GET", f"/categories/?page={page}&size={size}")
+        return self._get_revalidated(f"/categories/?page={page}&size={size}")
     
     def create_category(self, category_data: Dict) -> Dict:
         return self._make_request("POST", "/categories/", json=category_data)
@@ -143,7 +213,7 @@ class APIClient:
     #Roles
     def get_roles(self, page: int = 1, size: int = 50) -> Dict:
         """Obtener todos los roles disponibles"""
-        return self._make_request("GET", f"/roles/?page={page}&size={size}")
+        return self._get_revalidated(f"/roles/?page={page}&size={size}")
     
     # Añadir método para obtener todas las asignaciones (solo admin)
     def get_all_assignments(self, page: int = 1, size: int = 50) -> Dict:
@@ -87,7 +87,7 @@ def volunteer_form(volunteer_data: Optional[Dict] = None) -> Dict:
         
         # User selection (si es creación)
         if not volunteer_data:
-            users_response = api_client.get_users()
+            users_response = api_client.get_users(fields="id,name,email")
             users = users_response.get('items', []) if isinstance(users_response, dict) else []
             
             # Filtrar usuarios que no son voluntarios aún
@@ -112,20 +112,18 @@ def show_admin_assignments():
 def show_volunteer_assignments(user: Dict):
     """Vista de voluntario para sus asignaciones"""
     
-    # Obtener voluntario actual
+    # Resumen del voluntario actual (la API lo resuelve a partir del token)
     try:
-        volunteers_response = api_client.get_volunteers(size=100)
-        volunteers = volunteers_response.get('items', [])
-        
-        my_volunteer = None
-        for volunteer in volunteers:
-            if volunteer.get('user_id') == user['id']:
-                my_volunteer = volunteer
-                break
-        
-        if not my_volunteer:
+        try:
+            summary = api_client.get_my_dashboard()
+        except Exception:
+            summary = {}   # 404: el usuario no tiene perfil de voluntario
+
+        if not summary.get('volunteer_id'):
             st.warning("No se encontró tu perfil de voluntario")
             return
+
+        my_volunteer = {'id': summary['volunteer_id'], 'status': summary.get('status'), 'skills': summary.get('skills', [])}
         
         # Pestañas funcionales
         tab1, tab2, tab3 = st.tabs(["📋 Mis Asignaciones", "📊 Mi Progreso", "🎯 Disponibles"])
@@ -134,7 +132,7 @@ def show_volunteer_assignments(user: Dict):
             show_my_assignments(my_volunteer)
         
         with tab2:
-            show_volunteer_progress(my_volunteer)
+            show_volunteer_progress(summary)
         
         with tab3:
             show_available_projects(my_volunteer)
@@ -187,13 +185,12 @@ def show_my_assignments(volunteer: Dict):
     except Exception as e:
         st.error(f"Error al cargar tus asignaciones: {e}")
 
-def show_volunteer_progress(volunteer: Dict):
-    """Muestra estadísticas reales del voluntario"""
+def show_volunteer_progress(summary: Dict):
+    """Muestra estadísticas reales del voluntario (conteos calculados en la API)"""
     try:
-        assignments_response = api_client.get_volunteer_assignments(volunteer['id'])
-        assignments = assignments_response
+        by_status = summary.get('assignments_by_status', {})
         
-        if not assignments:
+        if not summary.get('total_assignments'):
             st.info("No hay asignaciones para mostrar estadísticas")
             return
         
@@ -201,32 +198,19 @@ def show_volunteer_progress(volunteer: Dict):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("📋 Total Asignaciones", len(assignments))
+            st.metric("📋 Total Asignaciones", summary.get('total_assignments', 0))
         
         with col2:
-            completed = len([a for a in assignments if a.get('status') == 'COMPLETED'])
-            st.metric("✅ Completadas", completed)
+            st.metric("✅ Completadas", by_status.get('COMPLETED', 0))
         
         with col3:
-            pending = len([a for a in assignments if a.get('status') == 'PENDING'])
-            st.metric("⏳ Pendientes", pending)
+            st.metric("⏳ Pendientes", by_status.get('PENDING', 0))
         
         with col4:
-            active = len([a for a in assignments if a.get('status') == 'ACCEPTED'])
-            st.metric("🔄 Activas", active)
-        
-        # Gráfico real de distribución
-        status_counts = {}
-        skill_counts = {}
+            st.metric("🔄 Activas", by_status.get('ACCEPTED', 0))
         
-        for assignment in assignments:
-            # Contar por estado
-            status = assignment.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
-            
-            # Contar por skill
-            skill_name = assignment.get('matched_skill', {}).get('name', 'Unknown')
-            skill_counts[skill_name] = skill_counts.get(skill_name, 0) + 1
+        status_counts = {k: v for k, v in by_status.items() if v}
+        skill_counts = {s['name']: s['assignments'] for s in summary.get('skills', []) if s.get('assignments')}
         
         # Gráfico de estados
         if status_counts:
@@ -382,9 +366,13 @@ def show_manual_assignment_creation():
         st.rerun()
     
     try:
-        # Obtener datos necesarios
-        volunteers_response = api_client.get_volunteers(size=100)
-        projects_response = api_client.get_projects(size=100)
+        # Obtener datos necesarios (una sola llamada a la API)
+        data = api_client.batch({
+            "volunteers": "/volunteers/?page=1&size=100",
+            "projects": "/projects/?page=1&size=100&include=skills",
+        })
+        volunteers_response = data["volunteers"]
+        projects_response = data["projects"]
         
         volunteers = volunteers_response.get('items', [])
         projects = projects_response.get('items', [])
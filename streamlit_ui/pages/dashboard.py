@@ -4,7 +4,6 @@ from components.auth import auth, require_auth
 from components.tables import status_badge, format_date
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 
 def show():
     """Dashboard principal adaptado según rol"""
@@ -23,55 +22,35 @@ def show_admin_dashboard():
     
     # Obtener datos principales
     try:
-        volunteers_response = api_client.get_volunteers(size=100)
-        projects_response = api_client.get_projects(size=100)
-        skills_response = api_client.get_skills(size=100)
+        # KPIs agregados en el servidor sobre todas las filas (no solo las 100 primeras)
+        summary = api_client.get_admin_dashboard(within_days=7)
         
-        volunteers = volunteers_response.get('items', [])
-        projects = projects_response.get('items', [])
-        skills = skills_response.get('items', [])
+        volunteers = summary.get('volunteers', {})
+        projects = summary.get('projects', {})
+        skills = summary.get('skills', {})
         
         # KPIs principales
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("👤 Total Voluntarios", len(volunteers))
-            
-            # Activos
-            active_volunteers = len([v for v in volunteers if v.get('status') == 'active'])
-            st.metric("✅ Voluntarios Activos", active_volunteers)
+            st.metric("👤 Total Voluntarios", volunteers.get('total', 0))
+            st.metric("✅ Voluntarios Activos", volunteers.get('active', 0))
         
         with col2:
-            st.metric("📋 Total Proyectos", len(projects))
-            
-            # Activos
-            active_projects = len([p for p in projects if p.get('status') in ['not_assigned', 'assigned']])
-            st.metric("🔄 Proyectos Activos", active_projects)
+            st.metric("📋 Total Proyectos", projects.get('total', 0))
+            st.metric("🔄 Proyectos Activos", projects.get('active', 0))
         
         with col3:
-            st.metric("🛠️ Total Skills", len(skills))
+            st.metric("🛠️ Total Skills", skills.get('total', 0))
             
             # Skills más usadas
-            skill_usage = {}
-            for project in projects:
-                for skill in project.get('skills', []):
-                    skill_name = skill.get('name', 'Unknown')
-                    skill_usage[skill_name] = skill_usage.get(skill_name, 0) + 1
-            
-            if skill_usage:
-                most_used_skill = max(skill_usage, key=skill_usage.get)
-                st.metric("🔥 Skill Más Popular", most_used_skill)
+            most_used = skills.get('most_used', [])
+            if most_used:
+                st.metric("🔥 Skill Más Popular", most_used[0].get('name', 'Unknown'))
         
         with col4:
-            # Proyectos por vencer
-            today = datetime.now()
-            upcoming_deadlines = [
-            p for p in projects 
-            if p.get('end_date') and
-            datetime.fromisoformat(p.get('end_date').replace('Z', '+00:00')) > today and
-               datetime.fromisoformat(p.get('end_date').replace('Z', '+00:00')) <= today + timedelta(days=7)
-        ]
-        st.metric("⏰ Próximos vencimientos", len(upcoming_deadlines))
+            st.metric("⏰ Próximos vencimientos", projects.get('upcoming', 0))
+            st.metric("⚠️ Vencidos", projects.get('overdue', 0))
         
         st.markdown("---")
         
@@ -81,10 +60,7 @@ def show_admin_dashboard():
         with col1:
             st.subheader("📊 Estado de Proyectos")
             
-            project_status = {}
-            for project in projects:
-                status = project.get('status', 'unknown')
-                project_status[status] = project_status.get(status, 0) + 1
+            project_status = {k: v for k, v in projects.get('by_status', {}).items() if v}
             
             if project_status:
                 fig = px.pie(
@@ -97,10 +73,7 @@ def show_admin_dashboard():
         with col2:
             st.subheader("📈 Voluntarios por Estado")
             
-            volunteer_status = {}
-            for volunteer in volunteers:
-                status = volunteer.get('status', 'unknown')
-                volunteer_status[status] = volunteer_status.get(status, 0) + 1
+            volunteer_status = {k: v for k, v in volunteers.get('by_status', {}).items() if v}
             
             if volunteer_status:
                 fig = px.bar(
@@ -118,35 +91,23 @@ def show_admin_dashboard():
         
         with col1:
             st.write("**Proyectos Recientes**")
-            recent_projects = sorted(
-                projects, 
-                key=lambda x: x.get('created_at', ''), 
-                reverse=True
-            )[:5]
             
-            for project in recent_projects:
+            for project in summary.get('recent_projects', []):
                 with st.expander(f"📋 {project.get('name', 'N/A')}"):
-                    st.write(f"📝 {project.get('description', 'N/A')[:100]}...")
                     st.write(f"📅 Creado: {format_date(project.get('created_at'))}")
+                    st.write(f"⏰ Límite: {format_date(project.get('deadline'))}")
                     st.write(f"🎯 Estado: {status_badge(project.get('status'))}")
                     st.write(f"🔥 Prioridad: {status_badge(project.get('priority'))}")
         
         with col2:
-            st.write("**Voluntarios Activos Recientes**")
-            active_volunteers = [
-                v for v in volunteers if v.get('status') == 'active'
-            ]
+            st.write("**Asignaciones por Estado**")
             
-            for volunteer in active_volunteers[:5]:
-                with st.expander(f"👤 {volunteer.get('name', 'N/A')}"):
-                    st.write(f"📧 {volunteer.get('email', 'N/A')}")
-                    st.write(f"📱 {volunteer.get('phone', 'N/A')}")
-                    
-                    # Skills
-                    skills = volunteer.get('skills', [])
-                    if skills:
-                        skill_names = [s.get('name', '') for s in skills[:3]]
-                        st.write(f"🛠️ Skills: {', '.join(skill_names)}")
+            for status, count in summary.get('assignments_by_status', {}).items():
+                st.write(f"{status_badge(status.lower())}: {count}")
+            
+            st.write("**Skills Más Requeridas**")
+            for skill in most_used:
+                st.write(f"🛠️ {skill.get('name', 'N/A')}: {skill.get('projects', 0)} proyectos")
         
         # Quick Actions
         st.markdown("---")
@@ -84,9 +84,11 @@ def show_admin_projects():
         )
         
         # Obtener categorías
+        category_ids = {}
         try:
             categories_response = api_client.get_categories(size=100)
             categories = categories_response.get('items', [])
+            category_ids = {c.get('name', ''): c.get('id') for c in categories}
             category_names = ["Todas"] + [c.get('name', '') for c in categories]
             category_filter = st.selectbox(
                 "Categoría",
@@ -133,26 +135,22 @@ def show_admin_projects():
         return
     
     # Listado principal de proyectos
-    show_project_list(status_filter, priority_filter, category_filter, search_term)
+    show_project_list(status_filter, priority_filter, category_ids.get(category_filter), search_term)
 
 def show_volunteer_projects():
     """Vista de voluntario para proyectos"""
-    user = auth.get_current_user()
-    
-    # Obtener voluntario actual
-    volunteers_response = api_client.get_volunteers(size=100)
-    volunteers = volunteers_response.get('items', [])
-    
-    my_volunteer = None
-    for volunteer in volunteers:
-        if volunteer.get('user_id') == user['id']:
-            my_volunteer = volunteer
-            break
+    # Resumen del voluntario actual (la API lo resuelve a partir del token)
+    try:
+        summary = api_client.get_my_dashboard()
+    except Exception:
+        summary = {}
     
-    if not my_volunteer:
+    if not summary.get('volunteer_id'):
         st.warning("No se encontró tu perfil de voluntario")
         return
     
+    my_volunteer = {'id': summary['volunteer_id'], 'status': summary.get('status'), 'skills': summary.get('skills', [])}
+    
     # Pestañas
     tab1, tab2, tab3 = st.tabs(["📋 Mis Proyectos", "🎯 Proyectos Recomendados", "📊 Mi Progreso"])
     
@@ -163,7 +161,7 @@ def show_volunteer_projects():
         show_recommended_projects(my_volunteer)
     
     with tab3:
-        show_my_progress(my_volunteer)
+        show_my_progress(summary)
 
 def show_my_projects(volunteer: Dict):
     """Muestra proyectos asignados al voluntario"""
@@ -272,15 +270,14 @@ def show_recommended_projects(volunteer: Dict):
     except Exception as e:
         st.error(f"Error al cargar proyectos recomendados: {e}")
 
-def show_my_progress(volunteer: Dict):
-    """Muestra progreso y estadísticas del voluntario"""
+def show_my_progress(summary: Dict):
+    """Muestra progreso y estadísticas del voluntario (conteos calculados en la API)"""
     st.markdown("### 📊 Mi Progreso y Estadísticas")
     
     try:
-        assignments_response = api_client.get_volunteer_assignments(volunteer['id'])
-        assignments = assignments_response.get('items', [])
+        by_status = summary.get('assignments_by_status', {})
         
-        if not assignments:
+        if not summary.get('total_assignments'):
             st.info("No tienes asignaciones para mostrar estadísticas")
             return
         
@@ -288,28 +285,23 @@ def show_my_progress(volunteer: Dict):
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_assignments = len(assignments)
-            st.metric("📋 Total Asignaciones", total_assignments)
+            st.metric("📋 Total Asignaciones", summary.get('total_assignments', 0))
         
         with col2:
-            completed = len([a for a in assignments if a.get('status') == 'completed'])
-            st.metric("✅ Completadas", completed)
+            st.metric("✅ Completadas", by_status.get('COMPLETED', 0))
         
         with col3:
-            pending = len([a for a in assignments if a.get('status') == 'pending'])
-            st.metric("⏳ Pendientes", pending)
+            st.metric("⏳ Pendientes", by_status.get('PENDING', 0))
         
         with col4:
-            active = len([a for a in assignments if a.get('status') == 'accepted'])
-            st.metric("🔄 Activas", active)
+            st.metric("🔄 Activas", by_status.get('ACCEPTED', 0))
+        
+        st.metric("🎯 Tasa de finalización", f"{summary.get('completion_rate', 0):.0%}")
         
         # Gráfico de progreso
         st.subheader("📈 Distribución de Asignaciones")
         
-        status_counts = {}
-        for assignment in assignments:
-            status = assignment.get('status', 'unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = {k: v for k, v in by_status.items() if v}
         
         if status_counts:
             fig = px.pie(
@@ -320,19 +312,16 @@ def show_my_progress(volunteer: Dict):
             st.plotly_chart(fig, use_container_width=True)
         
         # Tabla detallada
-        st.subheader("📋 Detalle de Asignaciones")
+        st.subheader("📋 Actividad Reciente")
         
         assignment_details = []
-        for assignment in assignments:
-            project = assignment.get('project', {})
-            skill = assignment.get('skill', {})
-            
+        for assignment in summary.get('recent_activity', []):
             assignment_details.append({
-                'Proyecto': project.get('name', 'N/A'),
-                'Skill': skill.get('name', 'N/A'),
+                'Proyecto': assignment.get('project_name', 'N/A'),
+                'Skill': assignment.get('skill_name', 'N/A'),
                 'Estado': status_badge(assignment.get('status')),
                 'Asignado': format_date(assignment.get('created_at')),
-                'Límite': format_date(project.get('deadline'))
+                'Límite': format_date(assignment.get('deadline'))
             })
         
         st.dataframe(assignment_details, use_container_width=True)
@@ -697,41 +686,39 @@ def show_skill_matching():
         st.rerun()
 
 def show_project_statistics():
-    """Muestra estadísticas de proyectos"""
+    """Muestra estadísticas de proyectos (agregadas en el servidor)"""
     st.markdown("## 📊 Estadísticas de Proyectos")
     
     try:
-        projects_response = api_client.get_projects(size=100)
-        projects = projects_response.get('items', [])
+        stats = api_client.get_project_stats()
         
-        if not projects:
+        if not stats.get('total'):
             st.info("No hay datos de proyectos para mostrar")
             return
         
+        by_status = stats.get('by_status', {})
+        by_priority = stats.get('by_priority', {})
+        coverage = stats.get('skill_coverage', {})
+        
         # KPIs generales
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            total_projects = len(projects)
-            st.metric("📋 Total Proyectos", total_projects)
+            st.metric("📋 Total Proyectos", stats.get('total', 0))
         
         with col2:
-            active_projects = len([p for p in projects if p.get('status') in ['not_assigned', 'assigned']])
+            active_projects = by_status.get('not assigned', 0) + by_status.get('assigned', 0)
             st.metric("🔄 Proyectos Activos", active_projects)
         
         with col3:
-            completed_projects = len([p for p in projects if p.get('status') == 'completed'])
-            st.metric("✅ Completados", completed_projects)
+            st.metric("✅ Completados", by_status.get('completed', 0))
         
         with col4:
-            from datetime import datetime, timedelta
-            today = datetime.now()
-            upcoming_deadlines = [
-                p for p in projects 
-                if datetime.fromisoformat(p.get('deadline').replace('Z', '+00:00')) > today and
-                   datetime.fromisoformat(p.get('deadline').replace('Z', '+00:00')) <= today + timedelta(days=7)
-            ]
-            st.metric("⏰ Vencen esta semana", len(upcoming_deadlines))
+            upcoming = api_client.get_upcoming_projects_count(
+                within_days=7, status=['not assigned', 'assigned']
+            )
+            st.metric("⏰ Vencen esta semana", upcoming.get('count', 0))
+            st.metric("🚨 Vencidos", stats.get('overdue', 0))
         
         # Gráficos
         col1, col2 = st.columns(2)
@@ -739,11 +726,7 @@ def show_project_statistics():
         with col1:
             st.subheader("📈 Proyectos por Estado")
             
-            status_counts = {}
-            for project in projects:
-                status = project.get('status', 'unknown')
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
+            status_counts = {k: v for k, v in by_status.items() if v}
             if status_counts:
                 fig = px.pie(
                     values=list(status_counts.values()),
@@ -755,35 +738,38 @@ def show_project_statistics():
         with col2:
             st.subheader("🔥 Proyectos por Prioridad")
             
-            priority_counts = {}
-            for project in projects:
-                priority = project.get('priority', 'unknown')
-                priority_counts[priority] = priority_counts.get(priority, 0) + 1
-            
-            if priority_counts:
+            if by_priority:
                 fig = px.bar(
-                    x=list(priority_counts.keys()),
-                    y=list(priority_counts.values()),
+                    x=list(by_priority.keys()),
+                    y=list(by_priority.values()),
                     title="Distribución de Prioridades"
                 )
                 st.plotly_chart(fig, use_container_width=True)
         
-        # Tabla detallada
-        st.subheader("📋 Detalles de Proyectos")
+        # Categorías y cobertura de skills
+        col1, col2 = st.columns(2)
         
-        project_details = []
-        for project in projects:
-            skills = project.get('skills', [])
-            project_details.append({
-                'Nombre': project.get('name', 'N/A'),
-                'Estado': status_badge(project.get('status')),
-                'Prioridad': status_badge(project.get('priority')),
-                'Skills': len(skills),
-                'Categoría': project.get('category', {}).get('name', 'N/A'),
-                'Límite': format_date(project.get('deadline'))
-            })
+        with col1:
+            st.subheader("🏷️ Proyectos por Categoría")
+            
+            st.dataframe(
+                [{'Categoría': c.get('name'), 'Proyectos': c.get('count')} for c in stats.get('by_category', [])],
+                use_container_width=True
+            )
         
-        st.dataframe(project_details, use_container_width=True)
+        with col2:
+            st.subheader("🛠️ Cobertura de Skills")
+            
+            st.metric(
+                "Skills requeridas cubiertas",
+                f"{coverage.get('covered_skills_ratio', 0):.0%}",
+                help=f"{coverage.get('covered_skills', 0)} de {coverage.get('required_skills', 0)}"
+            )
+            st.metric(
+                "Proyectos totalmente cubiertos",
+                f"{coverage.get('fully_covered_ratio', 0):.0%}",
+                help=f"{coverage.get('fully_covered_projects', 0)} de {coverage.get('projects_with_requirements', 0)}"
+            )
     
     except Exception as e:
         st.error(f"Error al cargar estadísticas: {e}")
@@ -792,48 +778,41 @@ def show_project_statistics():
         st.session_state.show_project_stats = None
         st.rerun()
 
-def show_project_list(status_filter: str, priority_filter: str, category_filter: str, search_term: str):
-    """Muestra listado filtrado de proyectos"""
+def show_project_list(status_filter: str, priority_filter: str, category_id: int | None, search_term: str):
+    """Muestra listado filtrado de proyectos (filtros y búsqueda resueltos en el servidor)"""
     try:
-        projects_response = api_client.get_projects(size=100)
-        projects = projects_response.get('items', [])
-        
-        # Aplicar filtros
-        filtered_projects = projects
-        
-        # Filtro por estado
+        params = {"size": 100}
         if status_filter != "Todos":
-            filtered_projects = [
-                p for p in filtered_projects 
-                if p.get('status') == status_filter
-            ]
-        
-        # Filtro por prioridad
+            params["status"] = status_filter.replace("_", " ")
         if priority_filter != "Todas":
-            filtered_projects = [
-                p for p in filtered_projects 
-                if p.get('priority') == priority_filter
-            ]
-        
-        # Filtro por categoría
-        if category_filter != "Todas":
-            filtered_projects = [
-                p for p in filtered_projects 
-                if p.get('category', {}).get('name') == category_filter
-            ]
-        
-        # Filtro por búsqueda
+            params["priority"] = priority_filter
+        if category_id is not None:
+            params["category_id"] = category_id
         if search_term:
-            filtered_projects = [
-                p for p in filtered_projects 
-                if search_term.lower() in p.get('name', '').lower() or
-                   search_term.lower() in p.get('description', '').lower()
-            ]
+            params["q"] = search_term
+        
+        # Paginación por cursor
+        cursor = st.session_state.get('project_search_cursor')
+        if cursor:
+            params["cursor"] = cursor
+        
+        search_response = api_client.search_projects(params)
+        filtered_projects = search_response.get('items', [])
         
         # Mostrar resultados
         if filtered_projects:
             st.write(f"**Resultados encontrados:** {len(filtered_projects)}")
             project_table(filtered_projects, show_actions=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if cursor and st.button("⬅️ Primera página"):
+                    st.session_state.project_search_cursor = None
+                    st.rerun()
+            with col2:
+                if search_response.get('next_cursor') and st.button("Siguiente página ➡️"):
+                    st.session_state.project_search_cursor = search_response['next_cursor']
+                    st.rerun()
         else:
             st.info("No se encontraron proyectos con los filtros seleccionados")
     
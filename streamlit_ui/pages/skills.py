@@ -248,10 +248,15 @@ def show_skill_statistics():
     st.markdown("## 📊 Estadísticas de Skills")
     
     try:
-        # Obtener todos los datos
-        skills_response = api_client.get_skills(size=100)
-        volunteers_response = api_client.get_volunteers(size=100)
-        projects_response = api_client.get_projects(size=100)
+        # Obtener todos los datos (una sola llamada a la API)
+        data = api_client.batch({
+            "skills": "/skills/?page=1&size=100",
+            "volunteers": "/volunteers/?page=1&size=100",
+            "projects": "/projects/?page=1&size=100&include=skills",
+        })
+        skills_response = data["skills"]
+        volunteers_response = data["volunteers"]
+        projects_response = data["projects"]
         
         skills = skills_response.get('items', [])
         volunteers = volunteers_response.get('items', [])